@@ -9,11 +9,13 @@ whether they are spatial or not.
 
 import numpy as np
 import matplotlib
+import matplotlib.dates as mdates
 from matplotlib.backend_bases import RendererBase
 import math
 from scipy import stats
 import pandas as pd
 import numbers
+from collections import deque
 import geopandas as gpd
 
 
@@ -21,6 +23,446 @@ class InvalidPlotError(Exception):
     pass
 
 
+def _readonly(arr):
+    """Returns a read-only view of `arr` that shares its memory.
+
+    The extraction helpers below hand out views of the arrays stored on
+    matplotlib artists rather than copies. Marking the views read-only makes
+    sure a tester can never change the plot it is checking.
+    """
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+def _line_xydata(line):
+    """Returns the x and y data of a Line2D as a read-only (n, 2) float64
+    array, without copying when the line already stores float64 data."""
+    return _readonly(np.asarray(line.get_xydata(), dtype=np.float64))
+
+
+def _collection_offsets(collection):
+    """Returns the offsets of a Collection as a read-only (n, 2) float64
+    array. Masked offsets are filled with NaN, which is the only case where
+    the data is copied."""
+    offsets = collection.get_offsets()
+    if np.ma.is_masked(offsets):
+        offsets = np.ma.filled(offsets.astype(np.float64), np.nan)
+    return _readonly(
+        np.asarray(np.ma.getdata(offsets), dtype=np.float64).reshape(-1, 2)
+    )
+
+
+def _path_vertices(path):
+    """Returns the vertices of a Path as a read-only (n, 2) array view."""
+    return _readonly(np.asarray(path.vertices).reshape(-1, 2))
+
+
+def _image_array(image):
+    """Returns the data array of an AxesImage as a read-only view, keeping
+    its mask if it is a masked array. Returns ``None`` if the image has no
+    data."""
+    arr = image.get_array()
+    if arr is None:
+        return None
+    return _readonly(arr)
+
+
+def _xy_checksum(xy):
+    """Returns an order independent checksum of the rows of `xy`.
+
+    Each row is hashed from the bits of its two float64 values and the hashes
+    are summed with wraparound, so equal sets of points give equal checksums
+    no matter how they are ordered or split into blocks.
+
+    Parameters
+    ----------
+    xy : numpy.ndarray
+        Array of shape (n, 2).
+
+    Returns
+    -------
+    checksum : int
+    """
+    # Adding 0.0 turns -0.0 into 0.0 so both hash alike
+    bits = (np.asarray(xy, dtype=np.float64).reshape(-1, 2) + 0.0).view(
+        np.uint64
+    )
+    hashed = (bits[:, 0] * np.uint64(0x9E3779B97F4A7C15)) ^ (
+        bits[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)
+    )
+    hashed ^= hashed >> np.uint64(31)
+    return int(hashed.sum(dtype=np.uint64))
+
+
+def _summarize_xy(xy):
+    """Returns the count, bounds and checksum of the rows of `xy`.
+    See ``PlotTester.get_xy_summary()``."""
+    if not len(xy):
+        return {
+            "count": 0,
+            "xmin": np.inf,
+            "xmax": -np.inf,
+            "ymin": np.inf,
+            "ymax": -np.inf,
+            "checksum": 0,
+        }
+    xmin, ymin = xy.min(axis=0)
+    xmax, ymax = xy.max(axis=0)
+    return {
+        "count": len(xy),
+        "xmin": xmin,
+        "xmax": xmax,
+        "ymin": ymin,
+        "ymax": ymax,
+        "checksum": _xy_checksum(xy),
+    }
+
+
+def _merge_xy_summary(a, b):
+    """Combines two summaries returned by ``_summarize_xy()``."""
+    return {
+        "count": a["count"] + b["count"],
+        "xmin": min(a["xmin"], b["xmin"]),
+        "xmax": max(a["xmax"], b["xmax"]),
+        "ymin": min(a["ymin"], b["ymin"]),
+        "ymax": max(a["ymax"], b["ymax"]),
+        "checksum": (a["checksum"] + b["checksum"]) % 2**64,
+    }
+
+
+def _normalize_text(text):
+    """Lowercases `text` and removes its spaces, which is how all text is
+    compared in text assertions."""
+    return text.lower().replace(" ", "")
+
+
+def _normalize_strings(strings_expected):
+    """Applies ``_normalize_text()`` to every string in `strings_expected`,
+    keeping the structure accepted by ``PlotTester.assert_string_contains()``
+    (a string, or a list of strings and lists of strings)."""
+    if strings_expected is None:
+        return None
+    if isinstance(strings_expected, str):
+        return _normalize_text(strings_expected)
+    return [_normalize_strings(check) for check in strings_expected]
+
+
+def _scan_values(values, nodata, valid_range=None, range_cols=None):
+    """Counts the nodata, NaN, infinite and out of range values in one
+    plotted array. See ``PlotTester.find_nodata()``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The plotted array, may be masked. Masked values are not plotted and
+        are skipped.
+    nodata : numpy.ndarray
+        1d array of sentinel values.
+    valid_range : tuple of (min, max) (Optional)
+        Values outside of this range are counted as ``'out_of_range'``.
+    range_cols : int (Optional)
+        Only test this column of a 2d `values` against `valid_range`.
+
+    Returns
+    -------
+    counts : dict
+        Maps each sentinel value found and ``'nan'``, ``'inf'`` and
+        ``'out_of_range'`` to the number of values found. Values that are not
+        found are left out.
+    bad : numpy.ndarray of bools
+        Same shape as `values`, ``True`` where a value was counted.
+    """
+    data = np.ma.getdata(values)
+    shown = ~np.ma.getmaskarray(values)
+    counts = {}
+    bad = np.zeros(data.shape, dtype=bool)
+    if data.dtype.kind not in "iuf":
+        return counts, bad
+
+    if data.dtype.kind == "f":
+        # Compare in the precision of the data, so a float32 image still
+        # matches a sentinel like 999.99
+        nan = np.isnan(data) & shown
+        inf = np.isinf(data) & shown
+        for name, found in [("nan", nan), ("inf", inf)]:
+            if found.any():
+                counts[name] = int(found.sum())
+                bad |= found
+        sentinels = nodata[np.isfinite(nodata)].astype(data.dtype)
+    else:
+        sentinels = nodata[nodata == np.round(nodata)]
+    if len(sentinels):
+        found = np.isin(data, sentinels) & shown
+        if found.any():
+            hits, hit_counts = np.unique(data[found], return_counts=True)
+            counts.update(
+                (hit.item(), int(n)) for hit, n in zip(hits, hit_counts)
+            )
+            bad |= found
+
+    if valid_range is not None:
+        check = np.zeros(data.shape, dtype=bool)
+        if range_cols is None:
+            check[...] = shown
+        else:
+            check[:, range_cols] = shown[:, range_cols]
+        with np.errstate(invalid="ignore"):
+            outside = check & (
+                (data < valid_range[0]) | (data > valid_range[1])
+            )
+        if outside.any():
+            counts["out_of_range"] = int(outside.sum())
+            bad |= outside
+    return counts, bad
+
+
+def _artist_index_key(ax):
+    """Returns a key that changes when artists are added to or removed from
+    `ax` or its Figure, used to tell whether the index built by
+    ``PlotTester.get_artist_index()`` is still up to date.
+
+    Artists are appended to the lists they are kept in, so the length and
+    last artist of each list change with every addition or removal. This
+    keeps the key cheap to build and compare, however many artists there
+    are.
+    """
+    fig = ax.get_figure()
+    # Matplotlib 3.5+ keeps the artists of an Axes in a single list
+    children = getattr(ax, "_children", None)
+    if children is not None:
+        artist_lists = [children]
+    else:
+        artist_lists = [
+            ax.lines,
+            ax.collections,
+            ax.patches,
+            ax.images,
+            ax.texts,
+            ax.artists,
+            ax.tables,
+        ]
+    artist_lists += [ax.containers, fig.texts, fig.legends, fig.axes]
+    return tuple(
+        (len(artists), artists[-1] if len(artists) else None)
+        for artists in artist_lists
+    ) + (ax.legend_,)
+
+
+def _caption_texts(texts, axes):
+    """Returns a list with, for each Axes in `axes`, the texts in `texts`
+    that lie in the caption area of that Axes, just below its right side.
+
+    All texts are checked against all Axes at once, so a figure with many
+    panels and captions is only walked once.
+    """
+    if not texts or not axes:
+        return [[] for _ in axes]
+    x, y = np.array([t.get_position() for t in texts], dtype=np.float64).T
+    x, y = x[:, np.newaxis], y[:, np.newaxis]
+    bounds = np.array([ax.get_position().extents for ax in axes])
+    xmax, ymin = bounds[:, 2], bounds[:, 1]
+    in_area = (ymin - 0.1 < y) & (y < ymin) & (xmax - 0.5 < x) & (x < xmax)
+    return [[texts[i] for i in np.flatnonzero(col)] for col in in_area.T]
+
+
+def _build_artist_index(ax, captions=None):
+    """Builds the dict returned by ``PlotTester.get_artist_index()``.
+
+    `captions` can be passed in when the caption texts of many Axes have
+    already been found with ``_caption_texts()``.
+    """
+    fig = ax.get_figure()
+    index = {
+        "lines": list(ax.lines),
+        "collections": list(ax.collections),
+        "patches": list(ax.patches),
+        "images": list(ax.images),
+        "texts": list(ax.texts),
+        "legends": [
+            child
+            for child in ax.get_children()
+            if isinstance(child, matplotlib.legend.Legend)
+        ],
+        "containers": list(ax.containers),
+        "collections_by_type": {},
+        "figure_texts": list(fig.texts),
+        "figure_legends": list(fig.legends),
+    }
+    for c in index["collections"]:
+        index["collections_by_type"].setdefault(type(c), []).append(c)
+    index["colorbars"] = [
+        mappable.colorbar
+        for mappable in index["images"] + index["collections"]
+        if getattr(mappable, "colorbar", None) is not None
+    ]
+    if captions is None:
+        captions = _caption_texts(index["figure_texts"], [ax])[0]
+    index["captions"] = captions
+    return index
+
+
+class _KeywordMatcher(object):
+    """Finds which of a set of keywords occur in a text.
+
+    This is an Aho-Corasick automaton: the keywords are built into a trie
+    with failure links once, after which all of them are searched for in a
+    single pass over the text instead of one ``in`` test per keyword.
+
+    Parameters
+    ----------
+    keywords : iterable of strings
+        The keywords to search for.
+    """
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for keyword in keywords:
+            node = 0
+            for char in keyword:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = nxt
+            self._out[node].add(keyword)
+
+        # Breadth first, so the failure link of a node's parent is always
+        # set before the node itself
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """Returns the set of keywords that occur in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(out[0])
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+class PlotExpectation(object):
+    """Expected data and text for a basic 2d plot, prepared once so that many
+    plots can be checked against it.
+
+    Sorting, casting and cleaning the expected data, normalizing the expected
+    strings and fitting the regression line all happen when the object is
+    created. The object only holds numpy arrays, strings and a small
+    DataFrame, so it can be pickled and sent to other grading processes.
+
+    Parameters
+    ----------
+    data_exp : pandas or geopandas dataframe
+        DataFrame containing data expected to be on the plot.
+    xcol : string
+        Title of column in `data_exp` containing x data. If `data_exp` is a
+        GeoDataFrame with the data in 'geometry', set to ``None``.
+    ycol : string
+        Title of column in `data_exp` containing y data. If `data_exp` is a
+        GeoDataFrame with the data in 'geometry', set to ``None``.
+    title_contains : list
+        Strings expected in the title, as accepted by
+        ``PlotTester.assert_string_contains()``.
+    xlabel_contains : list
+        Strings expected in the x-axis label.
+    ylabel_contains : list
+        Strings expected in the y-axis label.
+    caption_strings : list
+        Strings expected in the caption.
+    legend_labels : list of strings
+        Expected legend entry labels.
+
+    Attributes
+    ----------
+    x, y : numpy.ndarray
+        float64 arrays of the expected data with missing values dropped,
+        sorted by x then y. Datetimes are converted to Matplotlib date
+        numbers. ``None`` if the x data is not numeric (e.g. text labels).
+    data : pandas.DataFrame
+        The expected x and y columns in their original order and type. Used
+        when the x data is compared to x tick labels.
+    regression : tuple
+        Slope and intercept of the least squares line through the expected
+        data, or ``None`` if it can not be fit.
+    """
+
+    def __init__(
+        self,
+        data_exp,
+        xcol=None,
+        ycol=None,
+        title_contains=[],
+        xlabel_contains=[],
+        ylabel_contains=[],
+        caption_strings=[],
+        legend_labels=None,
+    ):
+        """Initialize PlotExpectation object"""
+        if isinstance(data_exp, gpd.geodataframe.GeoDataFrame) and not xcol:
+            data_exp = pd.DataFrame(
+                data={"x": data_exp.geometry.x, "y": data_exp.geometry.y}
+            )
+            xcol, ycol = "x", "y"
+        self.xcol, self.ycol = xcol, ycol
+        self.data = data_exp[[xcol, ycol]].reset_index(drop=True)
+
+        self.x, self.y, self.regression = None, None, None
+        try:
+            xy = np.column_stack(
+                (
+                    self._to_float(self.data[xcol]),
+                    self._to_float(self.data[ycol]),
+                )
+            )
+        except (TypeError, ValueError):
+            pass
+        else:
+            xy = xy[~np.isnan(xy).any(axis=1)]
+            xy = xy[np.lexsort((xy[:, 1], xy[:, 0]))]
+            self.x, self.y = xy[:, 0].copy(), xy[:, 1].copy()
+            if len(np.unique(self.x)) > 1:
+                slope, intercept, _, _, _ = stats.linregress(self.x, self.y)
+                self.regression = (slope, intercept)
+
+        self.title_contains = _normalize_strings(title_contains)
+        self.xlabel_contains = _normalize_strings(xlabel_contains)
+        self.ylabel_contains = _normalize_strings(ylabel_contains)
+        self.caption_strings = _normalize_strings(caption_strings)
+        self.legend_labels = (
+            None
+            if legend_labels is None
+            else [label.lower() for label in legend_labels]
+        )
+
+    @staticmethod
+    def _to_float(values):
+        """Returns a pandas Series as a float64 array, converting datetimes
+        to Matplotlib date numbers the way they are stored on the plot."""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            if values.dt.tz is not None:
+                values = values.dt.tz_convert(None)
+            return mdates.date2num(values.to_numpy())
+        return values.to_numpy(dtype=np.float64)
+
+
 class PlotTester(object):
     """
     Object to grab elements from Matplotlib plots
@@ -35,6 +477,36 @@ class PlotTester(object):
     def __init__(self, ax):
         """Initialize TestPlot object"""
         self.ax = ax
+        self._text_index = None
+        self._artist_index = None
+        self._tick_cache = {}
+
+    def get_artist_index(self):
+        """Returns the artists on `ax` and its Figure grouped by type.
+
+        The groups are collected in one pass and kept on the tester, so
+        testers look artists up here instead of searching the artist tree
+        with ``findobj()`` every time. The index is rebuilt if artists are
+        added to or removed from `ax` or its Figure.
+
+        Returns
+        -------
+        index : dict
+            ``'lines'``, ``'collections'``, ``'patches'``, ``'images'``,
+            ``'texts'`` and ``'legends'`` map to lists of the artists of that
+            type on `ax`, in the order they were added. ``'containers'`` maps
+            to the containers on `ax` (e.g. from ``.bar()``),
+            ``'collections_by_type'`` maps each Collection subclass on `ax` to
+            a list of its instances and ``'colorbars'`` maps to the colorbars
+            drawn for images and collections on `ax`. ``'figure_texts'`` and
+            ``'figure_legends'`` map to the texts and legends placed directly
+            on the Figure, and ``'captions'`` to the Figure texts placed in
+            the caption area below `ax` (see ``get_caption()``).
+        """
+        key = _artist_index_key(self.ax)
+        if self._artist_index is None or self._artist_index[0] != key:
+            self._artist_index = (key, _build_artist_index(self.ax))
+        return self._artist_index[1]
 
     def _is_line(self):
         """Boolean expressing if ax contains scatter points.
@@ -46,8 +518,9 @@ class PlotTester(object):
             True if Axes ax is a line plot, False if not
         """
 
-        if self.ax.lines:
-            for line in self.ax.lines:
+        lines = self.get_artist_index()["lines"]
+        if lines:
+            for line in lines:
                 if (
                     not line.get_linestyle()
                     or not line.get_linewidth()
@@ -65,10 +538,11 @@ class PlotTester(object):
         is_scatter : boolean
             True if Axes ax is a scatter plot, False if not
         """
-        if self.ax.collections:
+        index = self.get_artist_index()
+        if index["collections"]:
             return True
-        elif self.ax.lines:
-            for line in self.ax.lines:
+        elif index["lines"]:
+            for line in index["lines"]:
                 if (
                     line.get_linestyle() == "None"
                     or line.get_linewidth() == "None"
@@ -121,19 +595,39 @@ class PlotTester(object):
         if not strings_expected:
             return
 
-        string = string.lower().replace(" ", "")
+        self._assert_normalized_contains(
+            _normalize_text(string),
+            strings_expected,
+            message_default=message_default,
+            message_or=message_or,
+        )
+
+    def _assert_normalized_contains(
+        self, string, strings_expected, message_default, message_or
+    ):
+        """Same as ``assert_string_contains()`` for a `string` that has
+        already been through ``_normalize_text()``."""
+        if not strings_expected:
+            return
 
         if isinstance(strings_expected, str):
             strings_expected = [strings_expected]
 
+        # Search for every expected string in one pass over `string`
+        keywords = set()
+        for check in strings_expected:
+            if isinstance(check, str):
+                keywords.add(_normalize_text(check))
+            elif isinstance(check, list):
+                keywords.update(_normalize_text(c) for c in check)
+        found = _KeywordMatcher(keywords).find(string)
+
         for check in strings_expected:
             if isinstance(check, str):
-                if not check.lower().replace(" ", "") in string:
+                if _normalize_text(check) not in found:
                     raise AssertionError(message_default.format(check))
             elif isinstance(check, list):
-                if not any(
-                    [c.lower().replace(" ", "") in string for c in check]
-                ):
+                if not any(_normalize_text(c) in found for c in check):
                     if len(check) == 1:
                         raise AssertionError(message_default.format(check[0]))
                     else:
@@ -143,6 +637,70 @@ class PlotTester(object):
                     "str_lst must be a list of: lists or strings."
                 )
 
+    def get_text_index(self):
+        """Returns the text on `ax` and its Figure prepared for the text
+        assertions.
+
+        Titles, caption and axis labels are lowercased with spaces removed,
+        legend titles and entry labels are lowercased. The index is built
+        once and only rebuilt if the artist index (see
+        ``get_artist_index()``) is rebuilt or any of the text read from the
+        plot changes.
+
+        Returns
+        -------
+        index : dict
+            ``'title'``, ``'suptitle'``, ``'caption'``, ``'xlabel'`` and
+            ``'ylabel'`` map to the normalized strings (an empty string if
+            there is no such text). ``'legend_titles'`` maps to a list with
+            the title of each legend and ``'legend_labels'`` to a list with
+            the list of entry labels of each legend.
+        """
+        artists = self.get_artist_index()
+        if self._text_index is not None:
+            built_from, texts, index = self._text_index
+            if built_from is artists and all(
+                text.get_text() == string for text, string in texts
+            ):
+                return index
+
+        fig, captions = self.ax.get_figure(), artists["captions"]
+        texts = [
+            self.ax.title,
+            fig._suptitle,
+            captions[0] if captions else None,
+            self.ax.xaxis.label,
+            self.ax.yaxis.label,
+        ]
+        index = dict(
+            zip(
+                ["title", "suptitle", "caption", "xlabel", "ylabel"],
+                [
+                    _normalize_text(text.get_text() if text else "")
+                    for text in texts
+                ],
+            )
+        )
+        legends = artists["legends"]
+        index["legend_titles"] = [
+            leg.get_title().get_text().lower() for leg in legends
+        ]
+        index["legend_labels"] = [
+            [text.get_text().lower() for text in leg.get_texts()]
+            for leg in legends
+        ]
+
+        # Keep the text artists read along with their strings, so the index
+        # can be checked cheaply against changes made with set_text()
+        texts += [leg.get_title() for leg in legends]
+        texts += [text for leg in legends for text in leg.get_texts()]
+        self._text_index = (
+            artists,
+            [(text, text.get_text()) for text in texts if text],
+            index,
+        )
+        return index
+
     def assert_plot_type(
         self, plot_type=None, message="Plot is not of type {0}"
     ):
@@ -168,7 +726,9 @@ class PlotTester(object):
             if plot_type == "scatter":
                 assert self._is_scatter(), message.format(plot_type)
             elif plot_type == "bar":
-                assert self.ax.patches, message.format(plot_type)
+                assert self.get_artist_index()["patches"], message.format(
+                    plot_type
+                )
             elif plot_type == "line":
                 assert self._is_line(), message.format(plot_type)
             else:
@@ -244,13 +804,13 @@ class PlotTester(object):
         AssertionError
             if title does not contain expected strings
         """
-        suptitle, axtitle = self.get_titles()
+        index = self.get_text_index()
         if title_type == "either":
-            title = axtitle + suptitle
+            title = index["title"] + index["suptitle"]
         elif title_type == "figure":
-            title = suptitle
+            title = index["suptitle"]
         elif title_type == "axes":
-            title = axtitle
+            title = index["title"]
         else:
             raise ValueError(
                 "title_type must be one of the following "
@@ -259,7 +819,7 @@ class PlotTester(object):
 
         assert title, message_no_title
 
-        self.assert_string_contains(
+        self._assert_normalized_contains(
             title,
             strings_expected,
             message_default=message_default,
@@ -279,19 +839,8 @@ class PlotTester(object):
             the text that is found in bottom right, ``None`` if no text is
             found
         """
-        caption = None
-        ax_position = self.ax.get_position()
-        for tex in self.ax.get_figure().texts:
-            tex_position = tex.get_position()
-            if (
-                ax_position.ymin - 0.1 < tex_position[1] < ax_position.ymin
-            ) and (
-                ax_position.xmax - 0.5 < tex_position[0] < ax_position.xmax
-            ):
-                caption = tex
-                break
-        if isinstance(caption, matplotlib.text.Text):
-            caption = caption.get_text()
+        captions = self.get_artist_index()["captions"]
+        caption = captions[0].get_text() if captions else None
         return caption
 
     def assert_caption_contains(
@@ -336,13 +885,13 @@ class PlotTester(object):
         AssertionError
             if caption does not contain strings matching `strings_expected`
         """
-        caption = self.get_caption()
         if strings_expected is None:
             return
+        caption = self.get_text_index()["caption"]
 
         assert caption, message_no_caption
 
-        self.assert_string_contains(
+        self._assert_normalized_contains(
             caption,
             strings_expected,
             message_default=message_default,
@@ -433,21 +982,18 @@ class PlotTester(object):
             if axis label does not contain expected strings
         """
         # Retrieve appropriate axis label, error if axis param is not x or y
-        if axis == "x":
-            label = self.ax.get_xlabel()
-        elif axis == "y":
-            label = self.ax.get_ylabel()
-        else:
+        if axis not in ["x", "y"]:
             raise ValueError('axis must be one of the following ["x", "y"]')
 
         # Check that axis label contains the expected strings in lst
         if strings_expected is None:
             return
+        label = self.get_text_index()[axis + "label"]
         assert label, "Expected {0} axis label is not displayed".format(axis)
 
         message_default = message_default.replace("{1}", axis)
         message_or = message_or.replace("{1}", axis)
-        self.assert_string_contains(
+        self._assert_normalized_contains(
             label,
             strings_expected,
             message_default=message_default,
@@ -565,6 +1111,74 @@ class PlotTester(object):
         ylims = self.ax.get_ylim()
         assert np.array_equal(xlims, ylims), message
 
+    def get_ticks(self, axis="x", which="major"):
+        """Returns the tick locations and labels of an axis, computed from its
+        tick locator and formatter for the current axis limits.
+
+        Unlike the tick label artists, whose text is only set once the figure
+        has been drawn, this never needs a draw of the figure. Results are
+        kept on the tester until the limits, locator or formatter of the axis
+        change.
+
+        Parameters
+        ----------
+        axis : string
+            One of the following ['x','y'] stating which axis to use.
+        which : string
+            One of the following ['major','minor'] stating which ticks to
+            return.
+
+        Returns
+        -------
+        locs : numpy.ndarray
+            Locations of the ticks within the axis limits, in data units.
+        labels : list of strings
+            The tick labels, in the same order as `locs`.
+        """
+        if axis == "x":
+            ax_axis = self.ax.xaxis
+        elif axis == "y":
+            ax_axis = self.ax.yaxis
+        else:
+            raise ValueError('axis must be one of the following ["x", "y"]')
+        if which == "major":
+            locator = ax_axis.get_major_locator()
+            formatter = ax_axis.get_major_formatter()
+        elif which == "minor":
+            locator = ax_axis.get_minor_locator()
+            formatter = ax_axis.get_minor_formatter()
+        else:
+            raise ValueError(
+                'which must be one of the following ["major", "minor"]'
+            )
+
+        lims = tuple(ax_axis.get_view_interval())
+        key = (locator, formatter, lims)
+        cached = self._tick_cache.get((axis, which))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        if which == "major":
+            locs = np.asarray(ax_axis.get_majorticklocs(), dtype=np.float64)
+        else:
+            locs = np.asarray(ax_axis.get_minorticklocs(), dtype=np.float64)
+        # Labels are formatted for all locations before dropping the ones
+        # outside the limits, as Matplotlib does when drawing. Formatters
+        # such as FixedFormatter pick labels by tick position.
+        labels = np.array(formatter.format_ticks(locs), dtype=object)
+
+        # Keep ticks within the limits, with a small tolerance in display
+        # space for ticks placed exactly on a limit
+        transform = ax_axis.get_transform()
+        lo, hi = sorted(transform.transform(np.array(lims)))
+        locs_t = transform.transform(locs)
+        tol = 1e-10 * (hi - lo)
+        keep = (locs_t >= lo - tol) & (locs_t <= hi + tol)
+
+        ticks = (_readonly(locs[keep]), list(labels[keep]))
+        self._tick_cache[(axis, which)] = (key, ticks)
+        return ticks
+
     """ LEGEND TESTS """
 
     def get_legends(self):
@@ -575,7 +1189,7 @@ class PlotTester(object):
         legends : list
             List of matplotlib.legend.Legend objects
         """
-        return self.ax.findobj(match=matplotlib.legend.Legend)
+        return list(self.get_artist_index()["legends"])
 
     def assert_legend_titles(
         self,
@@ -608,12 +1222,12 @@ class PlotTester(object):
         AssertionError
             if legend titles do not contain expected text
         """
-        legends = self.get_legends()
+        titles = self.get_text_index()["legend_titles"]
 
         # Test number of legends - edge case when a student might have two
         # legends rather than 2
 
-        num_legends = len(legends)
+        num_legends = len(titles)
         num_exp_legends = len(titles_exp)
 
         assert num_legends == num_exp_legends, message_num_titles.format(
@@ -621,8 +1235,6 @@ class PlotTester(object):
         )
 
         # Check that each expected legend title is in a legend title in ax
-        titles = [leg.get_title().get_text().lower() for leg in legends]
-
         for title_exp in titles_exp:
             assert any(title_exp.lower() in s for s in titles), message.format(
                 title_exp
@@ -666,13 +1278,11 @@ class PlotTester(object):
         If there are multiple legends, it combines all the legend labels into
         one set and checks that set against the list labels_exp
         """
-        legends = self.get_legends()
-        assert legends, message_no_legend
+        legend_labels = self.get_text_index()["legend_labels"]
+        assert legend_labels, message_no_legend
 
         # Lowercase both the expected and actual legend labels
-        legend_texts = [
-            t.get_text().lower() for leg in legends for t in leg.get_texts()
-        ]
+        legend_texts = [text for labels in legend_labels for text in labels]
         labels_exp = [label.lower() for label in labels_exp]
 
         num_exp_labs = len(labels_exp)
@@ -765,6 +1375,89 @@ class PlotTester(object):
 
     """ BASIC PLOT DATA FUNCTIONS """
 
+    def _get_xy_blocks(self, points_only=False):
+        """Helper function for iter_xy.
+        Yields the raw x and y coords of each artist on Axes `ax` as an array
+        of shape (n, 2), before missing values and limits are handled.
+
+        Parameters
+        ----------
+        points_only : boolean
+            Set ``True`` to only yield points, set ``False`` to yield all data
+            on plot.
+        """
+        index = self.get_artist_index()
+        for line in index["lines"]:
+            if not points_only or (
+                line.get_linestyle() == "None"
+                or line.get_linewidth() == "None"
+            ):
+                # .plot()
+                yield _line_xydata(line)
+        for c in index["collections"]:
+            if not points_only or (
+                type(c) != matplotlib.collections.PolyCollection
+            ):
+                # .scatter()
+                yield _collection_offsets(c)
+        if not points_only and index["patches"]:
+            # .bar()
+            yield np.array(
+                [
+                    [(p.get_x() + (p.get_width() / 2)), p.get_height()]
+                    for p in index["patches"]
+                ],
+                dtype=np.float64,
+            )
+
+    def iter_xy(self, points_only=False, chunksize=None):
+        """Yields the x and y coords on Axes `ax` one artist at a time, so that
+        large plots can be checked without building a table of every point.
+
+        Parameters
+        ----------
+        points_only : boolean
+            Set ``True`` to check only points, set ``False`` to check all data
+            on plot.
+        chunksize : int (Optional)
+            Maximum number of rows in each block. Artists with more points than
+            this are split into several blocks. If ``None``, each artist is
+            yielded as one block.
+
+        Yields
+        ------
+        xy : numpy.ndarray
+            Array of shape (n, 2) with the x and y coords of one artist (or one
+            chunk of an artist). Rows with missing values and rows outside the
+            x limits of `ax` are dropped, as in ``get_xy()``.
+        """
+        for chunk, keep in self._iter_xy_masked(points_only, chunksize):
+            # Blocks with nothing to drop are passed on as read-only views
+            yield chunk if keep.all() else chunk[keep]
+
+    def _iter_xy_masked(self, points_only=False, chunksize=None):
+        """Helper function for iter_xy and get_xy.
+        Yields each block of data from ``_get_xy_blocks()`` (split into
+        chunks of at most `chunksize` rows) with a boolean array marking the
+        rows to keep. Blocks without any rows to keep are skipped.
+        """
+        lims = self.ax.get_xlim()
+        for block in self._get_xy_blocks(points_only=points_only):
+            # Empty artists, e.g. legend proxies, have nothing to yield
+            if not len(block):
+                continue
+            step = chunksize or len(block)
+            for start in range(0, len(block), step):
+                stop = start + step
+                chunk = block[start:stop]
+                keep = (
+                    ~np.isnan(chunk).any(axis=1)
+                    & (chunk[:, 0] >= lims[0])
+                    & (chunk[:, 0] <= lims[1])
+                )
+                if keep.any():
+                    yield chunk, keep
+
     def get_xy(self, points_only=False):
         """Returns a pandas dataframe with columns "x" and "y" holding the x
         and y coords on Axes `ax`
@@ -783,43 +1476,199 @@ class PlotTester(object):
             Pandas dataframe with columns "x" and "y" containing the x and y
             coords of each point on Axes `ax`
         """
-        if points_only:
-            xy_coords = [
-                val
-                for line in self.ax.lines
-                if (
-                    line.get_linestyle() == "None"
-                    or line.get_linewidth() == "None"
-                )
-                for val in line.get_xydata()
-            ]  # .plot()
-            xy_coords += [
-                val
-                for c in self.ax.collections
-                if type(c) != matplotlib.collections.PolyCollection
-                for val in c.get_offsets()
-            ]  # .scatter()
+        blocks = list(self._iter_xy_masked(points_only=points_only))
+        # Kept rows are written straight into one array, so the data is
+        # copied once no matter how many rows are dropped
+        xy_coords = np.empty((sum(keep.sum() for _, keep in blocks), 2))
+        row = 0
+        for chunk, keep in blocks:
+            end = row + keep.sum()
+            np.compress(keep, chunk, axis=0, out=xy_coords[row:end])
+            row = end
+        return pd.DataFrame(data=xy_coords, columns=["x", "y"], copy=False)
+
+    def get_xy_summary(self, points_only=False, chunksize=None):
+        """Returns the number of points, the bounds and a checksum of the x and
+        y coords on Axes `ax`. These are running reductions over
+        ``iter_xy()``, so only one block of data is held at a time.
+
+        Parameters
+        ----------
+        points_only : boolean
+            Set ``True`` to check only points, set ``False`` to check all data
+            on plot.
+        chunksize : int (Optional)
+            Maximum number of rows reduced at once. See ``iter_xy()``.
+
+        Returns
+        -------
+        summary : dict
+            Dictionary with keys "count", "xmin", "xmax", "ymin", "ymax" and
+            "checksum". Bounds are NaN if there is no data. The checksum does
+            not depend on the order of the points.
+        """
+        summary = _summarize_xy(np.empty((0, 2)))
+        for xy in self.iter_xy(points_only=points_only, chunksize=chunksize):
+            summary = _merge_xy_summary(summary, _summarize_xy(xy))
+        if not summary["count"]:
+            for key in ["xmin", "xmax", "ymin", "ymax"]:
+                summary[key] = np.nan
+        return summary
+
+    def assert_xy_summary(
+        self,
+        xy_expected,
+        xcol=None,
+        ycol=None,
+        points_only=False,
+        tolerance=0,
+        message="Incorrect data values",
+        message_count="Expected {0} data points, but found {1}",
+    ):
+        """Asserts that the number of points and the bounds of the x and y
+        data on Axes `ax` match `xy_expected`. If `tolerance` is 0, the points
+        must also have the same checksum. Unlike ``assert_xydata()``, this
+        never holds more than one block of plot data in memory, which makes it
+        useful as a first check on very large plots.
 
+        Parameters
+        ----------
+        xy_expected : pandas or geopandas dataframe
+            DataFrame contains data expected to be on the plot (axis object)
+        xcol : string
+            (Required for non geopandas objects) Title of column in
+            `xy_expected` containing values along `x_axis`.
+        ycol : String
+            (Required for non geopandas objects) Title of column in
+            `xy_expected` containing values along `y_axis`.
+        points_only : boolean
+            Set ``True`` to check only points, set ``False`` to check all data
+            on plot.
+        tolerance : float
+            Absolute tolerance allowed on the bounds of the data. If non-zero,
+            the checksum is not tested.
+        message : string
+            The error message to be displayed if the bounds or checksum of the
+            data do not match `xy_expected`.
+        message_count : string
+            The error message to be displayed if the number of points does not
+            match. If `message_count` contains ``'{0}'`` it will be replaced
+            with the expected number of points. If `message_count` contains
+            ``'{1}'`` it will be replaced with the number of points found.
+
+        Raises
+        -------
+        AssertionError
+            if the summary of the data on Axes `ax` does not match
+            `xy_expected`
+        """
+        if xy_expected is None:
+            return
+        if isinstance(xy_expected, gpd.geodataframe.GeoDataFrame) and not xcol:
+            xy = np.column_stack(
+                (xy_expected.geometry.x, xy_expected.geometry.y)
+            )
         else:
-            xy_coords = [
-                val for line in self.ax.lines for val in line.get_xydata()
-            ]  # .plot()
-            xy_coords += [
-                val for c in self.ax.collections for val in c.get_offsets()
-            ]  # .scatter()
-            xy_coords += [
-                [(p.get_x() + (p.get_width() / 2)), p.get_height()]
-                for p in self.ax.patches
-            ]  # .bar()
-
-        xy_data = pd.DataFrame(data=xy_coords, columns=["x", "y"]).dropna()
-
-        # crop to limits
-        lims = self.ax.get_xlim()
-        xy_data = xy_data[xy_data["x"] >= lims[0]]
-        xy_data = xy_data[xy_data["x"] <= lims[1]].reset_index(drop=True)
+            xy = xy_expected[[xcol, ycol]].to_numpy(dtype=np.float64)
+        expected = _summarize_xy(xy[~np.isnan(xy).any(axis=1)])
+        summary = self.get_xy_summary(points_only=points_only)
+
+        assert summary["count"] == expected["count"], message_count.format(
+            expected["count"], summary["count"]
+        )
+        if not summary["count"]:
+            return
+        bounds = ["xmin", "xmax", "ymin", "ymax"]
+        np.testing.assert_allclose(
+            [summary[b] for b in bounds],
+            [expected[b] for b in bounds],
+            rtol=0,
+            atol=tolerance,
+            err_msg=message,
+        )
+        if tolerance == 0:
+            assert summary["checksum"] == expected["checksum"], message
+
+    def _iter_plotted_arrays(self):
+        """Helper function for find_nodata.
+        Yields the artist, a name for the array and the array itself for every
+        numeric array plotted on Axes `ax`: the x and y data of lines,
+        collections and bars, the values mapped to colors by collections and
+        the data of images. The arrays are views of the data on the artists.
+        """
+        index = self.get_artist_index()
+        for line in index["lines"]:
+            yield line, "xy", _line_xydata(line)
+        for c in index["collections"]:
+            yield c, "xy", _collection_offsets(c)
+            values = c.get_array()
+            if values is not None:
+                yield c, "values", _readonly(values)
+        if index["patches"]:
+            yield index["patches"], "xy", np.array(
+                [
+                    [(p.get_x() + (p.get_width() / 2)), p.get_height()]
+                    for p in index["patches"]
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 2)
+        for im in index["images"]:
+            values = _image_array(im)
+            if values is not None:
+                yield im, "values", values
+
+    def find_nodata(self, nodata=(), valid_range=None):
+        """Scans every numeric array plotted on Axes `ax` for nodata values,
+        NaN and infinite values and values outside of a valid range.
+
+        Lines, collections, bars and images are checked, one array at a time
+        and without building a DataFrame. Masked values are not plotted and
+        are skipped.
 
-        return xy_data
+        Parameters
+        ----------
+        nodata : number or list of numbers
+            Sentinel values that mark missing data, e.g. ``[-9999, 999.99]``.
+        valid_range : tuple of (min, max) (Optional)
+            Values outside of this range are reported as ``'out_of_range'``.
+            For x and y data only the y values are tested.
+
+        Returns
+        -------
+        found : list of dicts
+            One dict for each array in which a value was found, with keys:
+            ``'artist'``, the artist holding the array (the list of patches
+            for bars); ``'array'``, ``'xy'`` for x and y data or ``'values'``
+            for image data and colors; ``'counts'``, a dict mapping each
+            sentinel value found and ``'nan'``, ``'inf'`` or
+            ``'out_of_range'`` to the number of values found; and
+            ``'locations'``, an array with the index of each point (for x and
+            y data) or value (for other data) where a value was found.
+        """
+        nodata = np.atleast_1d(np.asarray(nodata, dtype=np.float64))
+        found = []
+        for artist, name, values in self._iter_plotted_arrays():
+            counts, bad = _scan_values(
+                values,
+                nodata,
+                valid_range=valid_range,
+                range_cols=1 if name == "xy" else None,
+            )
+            if not counts:
+                continue
+            if name == "xy":
+                locations = np.flatnonzero(bad.any(axis=1))
+            else:
+                locations = np.argwhere(bad)
+            found.append(
+                {
+                    "artist": artist,
+                    "array": name,
+                    "counts": counts,
+                    "locations": locations,
+                }
+            )
+        return found
 
     def assert_xydata(
         self,
@@ -837,9 +1686,10 @@ class PlotTester(object):
 
         Parameters
         ----------
-        xy_expected : pandas or geopandas dataframe
+        xy_expected : pandas or geopandas dataframe or PlotExpectation
             (Required) DataFrame contains data expected to be on the plot
-            (axis object)
+            (axis object). A PlotExpectation has its data already prepared,
+            and `xcol` and `ycol` are ignored.
         xcol : string
             (Required for non geopandas objects) Title of column in
             `xy_expected` containing values along `x_axis`.
@@ -873,10 +1723,37 @@ class PlotTester(object):
         """
         if xy_expected is None:
             return
+        elif isinstance(xy_expected, PlotExpectation):
+            # The expected data was sorted and cast when the expectation was
+            # compiled, so only the plot data needs preparing here
+            if xlabels:
+                self.assert_xlabel_ydata(
+                    xy_expected.data.copy(),
+                    xcol=xy_expected.xcol,
+                    ycol=xy_expected.ycol,
+                    message=message,
+                )
+                return
+            if xy_expected.x is None:
+                raise ValueError(
+                    "The expected x data is not numeric. Set xlabels=True "
+                    + "to compare it to the x tick labels."
+                )
+            xy = self.get_xy(points_only=points_only).to_numpy()
+            order = np.lexsort((xy[:, 1], xy[:, 0]))
+            self._assert_xy_arrays(
+                xy[order, 0],
+                xy[order, 1],
+                xy_expected.x,
+                xy_expected.y,
+                tolerance=tolerance,
+                message=message,
+            )
+            return
         elif not isinstance(xy_expected, pd.DataFrame):
             raise ValueError(
-                "xy_expected must be of type: pandas dataframe or Geopandas "
-                + "Dataframe"
+                "xy_expected must be of type: pandas dataframe, Geopandas "
+                + "Dataframe or PlotExpectation"
             )
 
         # If xy_expected is a GeoDataFrame, then we make is a normal DataFrame
@@ -885,8 +1762,8 @@ class PlotTester(object):
         if isinstance(xy_expected, gpd.geodataframe.GeoDataFrame) and not xcol:
             xy_expected = pd.DataFrame(
                 data={
-                    "x": [p.x for p in xy_expected.geometry],
-                    "y": [p.y for p in xy_expected.geometry],
+                    "x": xy_expected.geometry.x.to_numpy(dtype=np.float64),
+                    "y": xy_expected.geometry.y.to_numpy(dtype=np.float64),
                 }
             ).dropna()
             xcol, ycol = "x", "y"
@@ -898,24 +1775,34 @@ class PlotTester(object):
             return
         xy_data = self.get_xy(points_only=points_only)
 
-        # Make sure the data are sorted the same
+        # Make sure the data are sorted the same, also where x values repeat
         xy_data, xy_expected = (
-            xy_data.sort_values(by="x"),
-            xy_expected.sort_values(by=xcol),
+            xy_data.sort_values(by=["x", "y"]),
+            xy_expected.sort_values(by=[xcol, ycol]),
+        )
+        self._assert_xy_arrays(
+            xy_data["x"].to_numpy(),
+            xy_data["y"].to_numpy(),
+            xy_expected[xcol].to_numpy(),
+            xy_expected[ycol].to_numpy(),
+            tolerance=tolerance,
+            message=message,
         )
 
+    def _assert_xy_arrays(
+        self, x, y, x_exp, y_exp, tolerance=0, message="Incorrect data values"
+    ):
+        """Helper function for assert_xydata.
+        Compares sorted x and y arrays from the plot against sorted expected
+        arrays, either within an absolute `tolerance` or, if `tolerance` is 0,
+        to within a few units in the last place.
+        """
         if tolerance > 0:
             np.testing.assert_allclose(
-                xy_data["x"],
-                xy_expected[xcol],
-                atol=tolerance,
-                err_msg=message,
+                x, x_exp, atol=tolerance, err_msg=message
             )
             np.testing.assert_allclose(
-                xy_data["y"],
-                xy_expected[ycol],
-                atol=tolerance,
-                err_msg=message,
+                y, y_exp, atol=tolerance, err_msg=message
             )
 
         else:
@@ -928,35 +1815,21 @@ class PlotTester(object):
 
             We catch this error and raise our own that is more relevant to
             the assertion being run."""
-            try:
-                np.testing.assert_array_max_ulp(
-                    xy_data["x"].to_numpy(dtype=np.float64),
-                    xy_expected[xcol].to_numpy(dtype=np.float64),
-                    5,
-                )
-            except AssertionError:
-                # xy_data and xy_expected do not contain the same data
-                raise AssertionError(message)
-            except ValueError:
-                # xy_data and xy_expected do not have the same shape
-                raise ValueError(
-                    "xy_data and xy_expected do not have the same shape"
-                )
-            try:
-                np.testing.assert_array_max_ulp(
-                    xy_data["y"].to_numpy(dtype=np.float64),
-                    xy_expected[ycol].to_numpy(dtype=np.float64),
-                    5,
-                )
-
-            except AssertionError:
-                # xy_data and xy_expected do not contain the same data
-                raise AssertionError(message)
-            except ValueError:
-                # xy_data and xy_expected do not have the same shape
-                raise ValueError(
-                    "xy_data and xy_expected do not have the same shape"
-                )
+            for actual, expected in [(x, x_exp), (y, y_exp)]:
+                try:
+                    np.testing.assert_array_max_ulp(
+                        np.asarray(actual, dtype=np.float64),
+                        np.asarray(expected, dtype=np.float64),
+                        5,
+                    )
+                except AssertionError:
+                    # xy_data and xy_expected do not contain the same data
+                    raise AssertionError(message)
+                except ValueError:
+                    # xy_data and xy_expected do not have the same shape
+                    raise ValueError(
+                        "xy_data and xy_expected do not have the same shape"
+                    )
 
     def assert_xlabel_ydata(
         self, xy_expected, xcol, ycol, message="Incorrect Data"
@@ -985,10 +1858,7 @@ class PlotTester(object):
         -----
         This is only testing the numbers in x-axis labels.
         """
-        x_data = [
-            "".join(c for c in label.get_text())
-            for label in self.ax.xaxis.get_majorticklabels()
-        ]
+        x_data = self.get_ticks("x")[1]
         y_data = self.get_xy()["y"]
         xy_data = pd.DataFrame(data={"x": x_data, "y": y_data})
 
@@ -1109,7 +1979,7 @@ class PlotTester(object):
             xy = self.get_xy(points_only=True)
             min_val, max_val = min(xy["x"]), max(xy["x"])
 
-        for line in self.ax.lines:
+        for line in self.get_artist_index()["lines"]:
             # Here we will get the verticies for the line and reformat them in
 
             # the way that get_slope_yintercept() expects
@@ -1142,7 +2012,9 @@ class PlotTester(object):
         if check_coverage:
             assert flag_length, message_data
 
-    def assert_lines_of_type(self, line_types, check_coverage=True):
+    def assert_lines_of_type(
+        self, line_types, check_coverage=True, regression=None
+    ):
         """Asserts each line of type in `line_types` exist on `ax`
 
         Parameters
@@ -1155,6 +2027,10 @@ class PlotTester(object):
             least from x coordinate `min_val` to x coordinate `max_val`. If the
             line does not cover the entire dataset, and `AssertionError` with
             be thrown with message `message_data`.
+        regression : tuple (Optional)
+            Expected (slope, intercept) of the 'linear-regression' line, such
+            as ``PlotExpectation.regression``. If ``None``, the line is fit to
+            the points on `ax`.
 
         Raises
         -------
@@ -1169,7 +2045,9 @@ class PlotTester(object):
             line_types = [line_types]
 
         for line_type in line_types:
-            if line_type == "linear-regression":
+            if line_type == "linear-regression" and regression is not None:
+                slope_exp, intercept_exp = regression
+            elif line_type == "linear-regression":
                 xy = self.get_xy(points_only=True)
                 # Check that there is xy data for this line. Some one-to-one
                 # lines do not produce xy data.
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from .base import PlotTester
 from .timeseries import TimeSeriesTester
 from .vector import VectorTester
@@ -58,6 +59,11 @@ class PlotBasicSuite(object):
         if None: no tests are run
     legend_labels: list of lower case stings. Each string is an expected entry
     label in the legend, barring capitalization.
+    expectation: PlotExpectation object prepared from the expected data and
+    strings. If given, its data and strings are used in place of data_exp,
+    xcol, ycol, title_contains, xlabel_contains, ylabel_contains,
+    caption_strings and legend_labels, and its regression line is used for
+    "linear-regression" line tests.
     """
 
     def __init__(
@@ -79,7 +85,18 @@ class PlotBasicSuite(object):
         title_points=1,
         xlab_points=1,
         ylab_points=1,
+        expectation=None,
     ):
+        regression = None
+        if expectation is not None:
+            data_exp, xcol, ycol = expectation, None, None
+            title_contains = expectation.title_contains
+            xlabel_contains = expectation.xlabel_contains
+            ylabel_contains = expectation.ylabel_contains
+            caption_strings = expectation.caption_strings
+            legend_labels = expectation.legend_labels
+            regression = expectation.regression
+
         class PlotLabelsTest(unittest.TestCase):
             """A unittest.TestCase containing 3 tests:
             1. title_exist: ax has a title that contains each string in list of
@@ -96,19 +113,19 @@ class PlotBasicSuite(object):
             @unittest.skipIf(title_contains is None, "Skip title test")
             def test_title_exist(self):
                 self.pt.assert_title_contains(
-                    lst=title_contains, title_type=title_type
+                    strings_expected=title_contains, title_type=title_type
                 )
 
             @unittest.skipIf(xlabel_contains is None, "Skip x axis label test")
             def test_xlab_exist(self):
                 self.pt.assert_axis_label_contains(
-                    axis="x", lst=xlabel_contains
+                    axis="x", strings_expected=xlabel_contains
                 )
 
             @unittest.skipIf(ylabel_contains is None, "Skip y axis label test")
             def test_ylab_exist(self):
                 self.pt.assert_axis_label_contains(
-                    axis="y", lst=ylabel_contains
+                    axis="y", strings_expected=ylabel_contains
                 )
 
             def tearDown(self):
@@ -150,7 +167,9 @@ class PlotBasicSuite(object):
 
             @unittest.skipIf(caption_strings is None, "Skip caption test")
             def test_caption_words(self):
-                self.pt.assert_caption_contains(strings_exp=caption_strings)
+                self.pt.assert_caption_contains(
+                    strings_expected=caption_strings
+                )
 
             def tearDown(self):
                 self.pt = None
@@ -178,7 +197,6 @@ class PlotBasicSuite(object):
                     xcol=xcol,
                     ycol=ycol,
                     points_only=points_only,
-                    xtime=False,
                     xlabels=xlabels,
                 )
 
@@ -186,7 +204,9 @@ class PlotBasicSuite(object):
                 line_types is None, "No additional lines requested"
             )
             def test_lines(self):
-                self.pt.assert_lines_of_type(line_types=line_types)
+                self.pt.assert_lines_of_type(
+                    line_types=line_types, regression=regression
+                )
 
             @unittest.skipIf(
                 plot_type is None, "No specific plot type requested"
@@ -466,7 +486,7 @@ class PlotTimeSeriesSuite(PlotBasicSuite):
 
             def test_xydata(self):
                 self.tst.assert_xydata(
-                    xy_expected=data_exp, xcol=xcol, ycol=ycol, xtime=True
+                    xy_expected=data_exp, xcol=xcol, ycol=ycol
                 )
 
             def tearDown(self):
@@ -737,7 +757,8 @@ class PlotRasterSuite(PlotVectorSuite):
             1. image_data: asserts image is as expected. If Image is
             classified image classification may be shifted or reversed.
             2. image_stretch: asserts image takes up entire display as expected
-            3. image_mask:
+            3. image_mask: if im_expected is a masked array, asserts the
+            same pixels are masked on the image
             4. legend_accuracy: if image is classified, asserts legend exists
             and correctly describes image.
                 if image is not classified, assertion is passed.
@@ -759,9 +780,12 @@ class PlotRasterSuite(PlotVectorSuite):
             def test_image_stretch(self):
                 self.rt.assert_image_full_screen()
 
-            @unittest.skip("Mask test not implemented")
+            @unittest.skipIf(
+                not np.ma.isMaskedArray(im_expected),
+                "Expected image is not masked",
+            )
             def test_image_mask(self):
-                pass
+                self.rt.assert_image_mask(mask_expected=im_expected)
 
             @unittest.skipIf(
                 not im_classified, "Image not expected to be classified"
@@ -0,0 +1,149 @@
+"""
+matplotcheck.figure
+===================
+
+Checking figures that contain many Axes (subplots).
+
+"""
+
+from .base import (
+    PlotTester,
+    _artist_index_key,
+    _build_artist_index,
+    _caption_texts,
+)
+
+
+class FigureTester(object):
+    """Object to grab elements from all Axes of a Matplotlib Figure.
+
+    The Figure is walked once when the object is created: texts, legends,
+    colorbars and images are assigned to the Axes they belong to. Testers
+    for single Axes are then handed out by ``get_tester()`` and share this
+    data instead of searching the Figure again, so a figure with many panels
+    can be checked in one pass.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The Figure to be tested.
+
+    Attributes
+    ----------
+    axes : list of matplotlib.axes.Axes
+        The Axes on the Figure that hold plots. Axes that only hold a
+        colorbar are not included.
+    suptitle : string
+        Figure title, an empty string if the Figure has no title.
+    legends : list of matplotlib.legend.Legend
+        Legends placed on the Figure itself rather than on one of its Axes.
+    """
+
+    def __init__(self, fig):
+        self.fig = fig
+        self.suptitle = fig._suptitle.get_text() if fig._suptitle else ""
+        self.legends = list(fig.legends)
+
+        all_axes = list(fig.axes)
+        captions = _caption_texts(list(fig.texts), all_axes)
+        self._indexes = {}
+        colorbar_axes = set()
+        for ax, ax_captions in zip(all_axes, captions):
+            index = _build_artist_index(ax, captions=ax_captions)
+            self._indexes[ax] = (_artist_index_key(ax), index)
+            colorbar_axes.update(cb.ax for cb in index["colorbars"])
+        self.axes = [ax for ax in all_axes if ax not in colorbar_axes]
+        self._testers = {}
+
+    def __len__(self):
+        return len(self.axes)
+
+    def _get_ax(self, ax):
+        """Returns the Axes given by `ax`, either an Axes on the Figure or
+        its position in ``self.axes``."""
+        if isinstance(ax, int):
+            return self.axes[ax]
+        if ax not in self._indexes:
+            raise ValueError("ax must be an Axes of the tested Figure")
+        return ax
+
+    def get_tester(self, ax=0, tester_class=PlotTester):
+        """Returns a tester for one Axes of the Figure.
+
+        Testers share the artists collected when the Figure was walked, and
+        the same tester is returned when asked for the same Axes and class
+        again.
+
+        Parameters
+        ----------
+        ax : int or matplotlib.axes.Axes
+            The Axes to be tested, or its position in ``self.axes``.
+        tester_class : class
+            ``PlotTester`` or one of its subclasses, e.g. ``RasterTester``.
+
+        Returns
+        -------
+        tester : PlotTester
+            Instance of `tester_class` for `ax`.
+        """
+        ax = self._get_ax(ax)
+        tester = self._testers.get((ax, tester_class))
+        if tester is None:
+            tester = tester_class(ax)
+            tester._artist_index = self._indexes[ax]
+            self._testers[(ax, tester_class)] = tester
+        return tester
+
+    def get_testers(self, tester_class=PlotTester):
+        """Returns a tester for each Axes in ``self.axes``, in order.
+
+        Parameters
+        ----------
+        tester_class : class
+            ``PlotTester`` or one of its subclasses, e.g. ``RasterTester``.
+
+        Returns
+        -------
+        testers : list of PlotTester
+        """
+        return [self.get_tester(ax, tester_class) for ax in self.axes]
+
+    def get_artists(self, ax, kind):
+        """Returns the artists of one type that belong to an Axes.
+
+        Parameters
+        ----------
+        ax : int or matplotlib.axes.Axes
+            The Axes, or its position in ``self.axes``.
+        kind : string
+            A key of the dict returned by ``PlotTester.get_artist_index()``,
+            e.g. ``'legends'``, ``'images'``, ``'colorbars'`` or
+            ``'captions'``.
+
+        Returns
+        -------
+        artists : list
+        """
+        return self._indexes[self._get_ax(ax)][1][kind]
+
+    def assert_num_axes(
+        self, n_exp, message="Expected {0} plots, but found {1}"
+    ):
+        """Asserts the Figure holds `n_exp` Axes, not counting Axes that only
+        hold a colorbar.
+
+        Parameters
+        ----------
+        n_exp : int
+            Expected number of Axes.
+        message : string
+            The error message to be displayed if the number of Axes is wrong.
+            If `message` contains ``'{0}'`` it will be replaced with `n_exp`,
+            ``'{1}'`` with the number of Axes found.
+
+        Raises
+        -------
+        AssertionError
+            if the Figure does not hold `n_exp` Axes
+        """
+        assert len(self.axes) == n_exp, message.format(n_exp, len(self.axes))
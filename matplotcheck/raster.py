@@ -1,19 +1,294 @@
+import os
 import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.collections import QuadMesh
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.io import DatasetReader
+from rasterio.windows import Window
+from scipy.spatial import cKDTree
+from .base import _image_array, _readonly
 from .vector import VectorTester
 
 
+def _mesh_coordinates(mesh):
+    """Returns the vertex coordinates of a QuadMesh as a read-only array
+    view of shape (rows + 1, cols + 1, 2)."""
+    if hasattr(mesh, "get_coordinates"):
+        coords = mesh.get_coordinates()
+    else:
+        coords = mesh._coordinates
+    return _readonly(np.asarray(coords))
+
+
+def _mesh_array(mesh):
+    """Returns the data of a QuadMesh as a read-only 2d array view, keeping
+    its mask. Older Matplotlib versions store the data flattened, which is
+    reshaped to one value per cell (or per vertex for gouraud shading).
+    Returns ``None`` if the mesh has no data."""
+    arr = mesh.get_array()
+    if arr is None:
+        return None
+    if arr.ndim == 1:
+        rows, cols = _mesh_coordinates(mesh).shape[:2]
+        if arr.size != rows * cols:
+            rows, cols = rows - 1, cols - 1
+        arr = arr.reshape(rows, cols)
+    return _readonly(arr)
+
+
+def _to_uint8(arr):
+    """Returns RGB(A) values as uint8 the way Matplotlib reads them: floats
+    range from 0 to 1 and integers from 0 to 255, values out of range are
+    clipped. uint8 data is returned as it is, without a copy."""
+    arr = np.ma.getdata(arr)
+    if arr.dtype == np.uint8:
+        return arr
+    if arr.dtype.kind == "f":
+        return np.round(np.clip(arr, 0, 1) * 255).astype(np.uint8)
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+
+def _in_display_range(arr):
+    """Returns True if ``_to_uint8()`` converts `arr` without clipping,
+    that is floats lie from 0 to 1 and integers from 0 to 255."""
+    arr = np.ma.getdata(arr)
+    if arr.dtype == np.uint8 or not arr.size:
+        return True
+    high = 1 if arr.dtype.kind == "f" else 255
+    return bool(np.nanmin(arr) >= 0 and np.nanmax(arr) <= high)
+
+
+def _color_keys(colors):
+    """Returns one integer key per RGB(A) color along the last axis of
+    `colors`. Colors are quantized to uint8 first (see ``_to_uint8()``), so
+    colors that look the same get the same key. Alpha is ignored."""
+    rgb = _to_uint8(np.asarray(colors)[..., :3]).astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _key_colors(keys):
+    """Inverse of ``_color_keys()``, returns an (n, 3) array of colors."""
+    return np.column_stack(((keys >> 16) & 255, (keys >> 8) & 255, keys & 255))
+
+
+def _lookup_colors(colors, lut_colors, lut_values, nearest=False):
+    """Turns colors back into the values they stand for.
+
+    Parameters
+    ----------
+    colors : numpy.ndarray
+        Colors to look up, RGB(A) along the last axis.
+    lut_colors : numpy.ndarray
+        Array of shape (n, 3) or (n, 4) with the color of each value. If a
+        color appears more than once, the last value with it is used.
+    lut_values : numpy.ndarray
+        The n values.
+    nearest : boolean
+        If ``False``, a color must match a color in `lut_colors` once both
+        are quantized to uint8. If ``True``, the value of the nearest color is
+        used.
+
+    Returns
+    -------
+    values : numpy.ma.MaskedArray
+        Array of the shape of `colors` without its last axis, holding the
+        value of each color. Colors without a match are masked.
+    """
+    keys = _color_keys(colors)
+    lut_keys, first = np.unique(
+        _color_keys(lut_colors)[::-1], return_index=True
+    )
+    lut_values = np.asarray(lut_values)[::-1][first]
+    # Each distinct color is looked up once
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    if nearest:
+        _, idx = cKDTree(_key_colors(lut_keys)).query(_key_colors(uniq))
+        matched = np.ones(len(uniq), dtype=bool)
+    else:
+        idx = np.minimum(np.searchsorted(lut_keys, uniq), len(lut_keys) - 1)
+        matched = lut_keys[idx] == uniq
+    inverse = inverse.reshape(keys.shape)
+    return np.ma.masked_array(lut_values[idx][inverse], mask=~matched[inverse])
+
+
+# Number of bits set in each possible byte
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _packed_mask_blocks(values, chunksize, nodata=None):
+    """Yields the mask of `values` packed into bits, one block of
+    `chunksize` rows at a time, so a full boolean mask is never built.
+
+    A boolean array is taken as the mask itself, otherwise the mask of a
+    masked array is used. If `nodata` is given, values equal to it (or NaN
+    values if `nodata` is NaN) are masked as well. For 3d arrays a pixel is
+    masked if any of its bands is masked.
+    """
+    is_mask = values.dtype == bool and not np.ma.isMaskedArray(values)
+    mask = np.ma.getmask(values)
+    for start in range(0, values.shape[0], chunksize):
+        block = slice(start, start + chunksize)
+        if is_mask:
+            block_mask = np.asarray(values[block])
+        elif mask is np.ma.nomask:
+            block_mask = np.zeros(values[block].shape, dtype=bool)
+        else:
+            block_mask = mask[block]
+        if nodata is not None and not is_mask:
+            data = np.ma.getdata(values[block])
+            if np.isnan(nodata):
+                block_mask = block_mask | np.isnan(data)
+            else:
+                block_mask = block_mask | (data == nodata)
+        if block_mask.ndim == 3:
+            block_mask = block_mask.any(axis=2)
+        yield np.packbits(block_mask, axis=None)
+
+
+def _downsample_factor(n, m, how):
+    """Returns the integer factor that an axis of length `n` was downsampled
+    by to get length `m`, or ``None`` if there is none.
+
+    Taking every k-th value (``how='nearest'``) gives ``ceil(n / k)``
+    values, while reducing blocks of k values (``'mean'`` or ``'mode'``)
+    drops the incomplete last block and gives ``n // k`` values.
+    """
+    if m <= 0 or n < m:
+        return None
+    if how == "nearest":
+        k = -(-n // m)
+        return k if -(-n // k) == m else None
+    k = n // m
+    return k if n // k == m else None
+
+
+def _sorted_mode(blocks):
+    """Returns the most common value along the last axis of `blocks`. Ties
+    go to the smallest value."""
+    blocks = np.sort(blocks, axis=-1)
+    size = blocks.shape[-1]
+    idx = np.arange(size)
+    is_start = np.ones(blocks.shape, dtype=bool)
+    is_start[..., 1:] = blocks[..., 1:] != blocks[..., :-1]
+    # Length of the run of equal values ending at each position
+    run_start = np.maximum.accumulate(np.where(is_start, idx, 0), axis=-1)
+    longest = np.argmax(idx - run_start, axis=-1)
+    return np.take_along_axis(blocks, longest[..., np.newaxis], axis=-1)[
+        ..., 0
+    ]
+
+
+def _block_reduce_bands(arr, factors, shape, how, chunksize):
+    """Yields `arr` downsampled by `factors` to `shape`, one band of at most
+    `chunksize` output rows at a time, as ``(rows, band)`` pairs where
+    `rows` is the slice of the output the band fills.
+
+    ``'nearest'`` takes every k-th value through a strided view. ``'mean'``
+    and ``'mode'`` reduce blocks of values, copying one band of `arr` at a
+    time. Extra bands of a 3d array are kept.
+    """
+    fy, fx = factors
+    rows, cols = shape
+    for start in range(0, rows, chunksize):
+        stop = min(start + chunksize, rows)
+        # Rows and columns of `arr` that the band is taken from
+        first, last, width = start * fy, stop * fy, cols * fx
+        if how == "nearest":
+            band = arr[first:last:fy, ::fx]
+        else:
+            band = arr[first:last, :width]
+            band = band.reshape((stop - start, fy, cols, fx) + arr.shape[2:])
+            if how == "mean":
+                band = band.mean(axis=(1, 3))
+            else:
+                # Move the values of each block to the last axis
+                axes = (0, 2) + tuple(range(4, band.ndim)) + (1, 3)
+                band = np.ma.getdata(band).transpose(axes)
+                band = _sorted_mode(band.reshape(band.shape[:-2] + (-1,)))
+        yield slice(start, stop), band
+
+
+def _bounds_window(transform, bounds):
+    """Returns the window of a dataset with affine `transform` that covers
+    `bounds` (left, bottom, right, top), and whether the rows and the columns
+    of the dataset run against the y and x axes. Offsets may be fractional.
+    """
+    if transform.b or transform.d:
+        raise ValueError("Rotated rasters are not supported")
+    left, bottom, right, top = bounds
+    cols = (np.array([left, right]) - transform.c) / transform.a
+    rows = (np.array([top, bottom]) - transform.f) / transform.e
+    window = Window(cols.min(), rows.min(), np.ptp(cols), np.ptp(rows))
+    return window, transform.e < 0, transform.a < 0
+
+
+def _window_strips(dataset, window, shape, bands, resampling, chunksize):
+    """Yields the data of `window` of `dataset` resampled to `shape`, one
+    strip of at most `chunksize` output rows at a time, as ``(rows, strip)``
+    pairs where `rows` is the slice of the output the strip fills. Strips
+    are masked arrays of shape (rows, cols, len(bands)).
+
+    Each strip is a separate windowed read, and GDAL reads from overviews
+    when the output is coarser than the dataset, so only about one strip of
+    the dataset is held in memory.
+    """
+    rows, cols = shape
+    row_size = window.height / rows
+    for start in range(0, rows, chunksize):
+        stop = min(start + chunksize, rows)
+        strip_window = Window(
+            window.col_off,
+            window.row_off + start * row_size,
+            window.width,
+            (stop - start) * row_size,
+        )
+        strip = dataset.read(
+            bands,
+            window=strip_window,
+            out_shape=(len(bands), stop - start, cols),
+            resampling=resampling,
+            masked=True,
+        )
+        yield slice(start, stop), strip.transpose(1, 2, 0)
+
+
+def _raster_array(artist):
+    """Returns the data of an AxesImage or QuadMesh as a read-only array
+    view. See ``_image_array()`` and ``_mesh_array()``."""
+    if isinstance(artist, QuadMesh):
+        return _mesh_array(artist)
+    return _image_array(artist)
+
+
 class RasterTester(VectorTester):
     """A PlotTester for spatial raster plots.
 
     Parameters
     ----------
     ax: ```matplotlib.axes.Axes``` object
+    crs: pyproj.CRS, string or int (Optional)
+        CRS of the coordinates on Axes ax, see ``VectorTester``.
 
     """
 
-    def __init__(self, ax):
+    def __init__(self, ax, crs=None):
         """Initialize the raster tester"""
-        super(RasterTester, self).__init__(ax)
+        super(RasterTester, self).__init__(ax, crs=crs)
+
+    def get_raster_artists(self):
+        """Returns the rasters plotted on Axes ax: images drawn with
+        ``imshow()`` followed by meshes drawn with ``pcolormesh()`` (also
+        used by xarray and rasterio plotting).
+
+        Returns
+        -------
+        list of matplotlib.image.AxesImage and
+        matplotlib.collections.QuadMesh objects
+        """
+        index = self.get_artist_index()
+        return index["images"] + index["collections_by_type"].get(QuadMesh, [])
 
     def get_colorbars(self):
         """Retrieve list of colorbars on axes ax
@@ -23,8 +298,47 @@ class RasterTester(VectorTester):
         list of matplotlib.colorbar.Colorbar objects on axes.
             If no colorbars exist, Returns an empty list.
         """
-        cb = [im.colorbar for im in self.ax.images if im.colorbar]
-        return cb
+        return list(self.get_artist_index()["colorbars"])
+
+    def get_raster_coordinates(self):
+        """Returns the coordinates of the cell corners of the first raster on
+        Axes ax.
+
+        For a mesh this is a read-only view of the mesh coordinates. For an
+        image the corners are spaced evenly over its extent, with the first
+        row at the top for images shown with ``origin='upper'``.
+
+        Returns
+        -------
+        coords : numpy.ndarray
+            Array of shape (rows + 1, cols + 1, 2) holding the x and y
+            coordinates of the cell corners.
+        """
+        rasters = self.get_raster_artists()
+        assert rasters, "No Image Displayed"
+        raster = rasters[0]
+        if isinstance(raster, QuadMesh):
+            return _mesh_coordinates(raster)
+        rows, cols = _raster_array(raster).shape[:2]
+        left, right, bottom, top = raster.get_extent()
+        if raster.origin == "upper":
+            bottom, top = top, bottom
+        coords = np.empty((rows + 1, cols + 1, 2))
+        coords[..., 0] = np.linspace(left, right, cols + 1)
+        coords[..., 1] = np.linspace(bottom, top, rows + 1)[:, np.newaxis]
+        return coords
+
+    def get_raster_norm(self):
+        """Returns the normalization that maps the values of the first raster
+        on Axes ax to colors, which is also the range of its colorbar.
+
+        Returns
+        -------
+        norm : matplotlib.colors.Normalize
+        """
+        rasters = self.get_raster_artists()
+        assert rasters, "No Image Displayed"
+        return rasters[0].norm
 
     def assert_colorbar_range(self, crange):
         """Asserts colorbar range matches min and max of crange parameter.
@@ -40,7 +354,7 @@ class RasterTester(VectorTester):
         Nothing (if checks pass) or raises error
         """
         # Check that images exist
-        if not self.ax.images:
+        if not self.get_raster_artists():
             assert False, "No image found on axes"
 
         # Get colorbars and check there's only one
@@ -114,11 +428,12 @@ class RasterTester(VectorTester):
         Finally those two arrays of strings are compared. Passes if they match.
         """
         # Retrieve image array
-        im_data = []
-        if self.ax.get_images():
-            im = self.ax.get_images()[0]
-            im_data, im_cmap = im.get_array(), im.get_cmap()
-        assert list(im_data), "No Image Displayed"
+        im_data = None
+        rasters = self.get_raster_artists()
+        if rasters:
+            im = rasters[0]
+            im_data, im_cmap = _raster_array(im), im.get_cmap()
+        assert im_data is not None and im_data.size, "No Image Displayed"
 
         # Retrieve legend
         legends = self.get_legends()
@@ -126,60 +441,228 @@ class RasterTester(VectorTester):
 
         # Retrieve legend entries and find which element of all_label_options
         # matches that entry
-        legend_dict = {}
-        for p in [
-            p
-            for sublist in [leg.get_patches() for leg in legends]
-            for p in sublist
-        ]:
-            label = p.get_label().lower()
-            legend_dict[p.get_facecolor()] = self._which_label(
-                label, all_label_options
+        patches = [p for leg in legends for p in leg.get_patches()]
+        first_labels = [opts[0] for opts in all_label_options]
+        legend_classes = []
+        for p in patches:
+            label = self._which_label(p.get_label().lower(), all_label_options)
+            legend_classes.append(
+                -1 if label is None else first_labels.index(label)
             )
-
-        # Check that each legend entry label is in one of all_label_options
-        assert len([val for val in legend_dict.values() if val]) == len(
+        legend_classes = np.array(legend_classes, dtype=np.int64)
+
+        # Check that each legend entry label is in one of all_label_options.
+        # Entries are told apart by color, the last entry of a color counts.
+        legend_colors = np.array(
+            [p.get_facecolor() for p in patches], dtype=np.float64
+        ).reshape(-1, 4)
+        _, last = np.unique(
+            _color_keys(legend_colors)[::-1], return_index=True
+        )
+        assert np.count_nonzero(legend_classes[::-1][last] >= 0) == len(
             all_label_options
         ), "Incorrect legend labels"
 
-        # Create two copies of image array, one filled with the plot data class
-        # labels (im_data_labels) and the other with the expected labels
-        # (im_expected_labels)
-        im_class_dict = {}
-        for val in np.unique(im_data):
-            im_class_dict[val] = legend_dict[im_cmap(im.norm(val))]
-        im_data_labels = [
-            [im_class_dict[val] for val in row] for row in im_data.data
-        ]
-        im_expected_labels = [
-            [all_label_options[val][0] for val in row] for row in im_expected
-        ]
-
-        # Check that expected and actual labels match up
-        assert np.array_equal(
-            im_data_labels, im_expected_labels
+        # Turn the colors of the image back into classes through the legend
+        # colors. Images of values are colored once per distinct value,
+        # RGB(A) images are looked up directly.
+        if im_data.ndim == 3:
+            im_classes = _lookup_colors(im_data, legend_colors, legend_classes)
+        else:
+            values, inverse = np.unique(
+                np.ma.getdata(im_data), return_inverse=True
+            )
+            im_classes = _lookup_colors(
+                im_cmap(im.norm(values)), legend_colors, legend_classes
+            )[inverse.reshape(im_data.shape)]
+
+        # Check that expected and actual classes match up
+        assert not np.ma.is_masked(im_classes) and np.array_equal(
+            np.ma.getdata(im_classes), im_expected
         ), "Incorrect legend to data relation"
 
         # IMAGE TESTS/HELPER FUNCTIONS
 
     def get_plot_image(self):
-        """Returns images stored on the Axes object as a list of numpy arrays.
+        """Returns the data of the first image on the Axes object, or of the
+        first mesh if there is no image (see ``get_raster_artists()``).
 
         Returns
         -------
-        im_data: List
-            Numpy array of images stored on Axes object.
+        im_data: numpy.ndarray
+            Read-only view of the image data stored on the Axes object.
         """
-        im_data = []
-        if self.ax.get_images():
-            im_data = self.ax.get_images()[0].get_array()
-        assert list(im_data), "No Image Displayed"
+        im_data = None
+        rasters = self.get_raster_artists()
+        if rasters:
+            im_data = _raster_array(rasters[0])
+        assert im_data is not None and im_data.size, "No Image Displayed"
 
         # If image array has 3 dims (e.g. rgb image), remove alpha channel
         if len(im_data.shape) == 3:
             im_data = im_data[:, :, :3]
         return im_data
 
+    def get_image_values(
+        self, cmap=None, norm=None, values=None, n_levels=256
+    ):
+        """Returns the data values behind the colors of the image on Axes ax.
+
+        For an image of values shown through a colormap this is the image
+        data itself. A pre-colored RGB(A) image is turned back into values
+        with colormap `cmap` and normalization `norm`, all pixels at once:
+
+        - If `values` is given (e.g. the classes of a classified image), each
+          pixel must have the color of one of the values. Other pixels are
+          masked.
+        - Otherwise `n_levels` evenly spaced values between the limits of
+          `norm` are colored and each pixel gets the value of the nearest
+          color, which inverts a continuous colormap.
+
+        Parameters
+        ----------
+        cmap: matplotlib.colors.Colormap or string
+            The colormap used to color the image. Required for RGB(A) images.
+        norm: matplotlib.colors.Normalize (Optional)
+            The normalization used to color the image. Defaults to a linear
+            scale between the smallest and largest of `values`, or between 0
+            and 1 if `values` is not given.
+        values: list of numbers (Optional)
+            The values that may appear in the image.
+        n_levels: int
+            Number of values sampled from a continuous colormap.
+
+        Returns
+        ----------
+        values: numpy.ndarray
+            Array with one value per pixel. Masked where no value matches.
+        """
+        im_data = self.get_plot_image()
+        if im_data.ndim != 3:
+            return im_data
+        assert cmap is not None, "A colormap is needed to read an RGB image"
+        if isinstance(cmap, str):
+            cmap = plt.get_cmap(cmap)
+        if values is not None:
+            values = np.asarray(values)
+            if norm is None:
+                norm = matplotlib.colors.Normalize(values.min(), values.max())
+            return _lookup_colors(im_data, cmap(norm(values)), values)
+        if norm is None:
+            norm = matplotlib.colors.Normalize(0, 1)
+        levels = norm.inverse(np.linspace(0, 1, n_levels))
+        return _lookup_colors(
+            im_data, cmap(norm(levels)), levels, nearest=True
+        )
+
+    def get_rgb_mismatch(self, im_expected, atol=0, chunksize=256):
+        """Returns the fraction of pixels of the RGB image on Axes ax that
+        differ from `im_expected`.
+
+        If both images lie in the range Matplotlib displays (floats from 0
+        to 1, integers from 0 to 255) they are converted to uint8 the way
+        Matplotlib reads colors, so an image stored as floats matches the
+        same image stored as uint8. Otherwise the raw values are compared,
+        so values out of range are not clipped into a match. The images are
+        compared a block of rows at a time, so only small temporary arrays
+        are created. Alpha channels are ignored.
+
+        Parameters
+        ----------
+        im_expected: Numpy Array
+            Array of shape (rows, cols, 3) or (rows, cols, 4) containing the
+            expected image.
+        atol: int or list of 3 ints
+            Largest difference allowed in each of the red, green and blue
+            channels, in units of 0 to 255, or in the units of the raw
+            values if these are compared. Raises a ValueError if the uint8
+            values are compared and `atol` is not a whole number.
+        chunksize: int
+            Number of rows compared at once.
+
+        Returns
+        ----------
+        mismatch: float
+            Fraction of pixels where any channel differs by more than `atol`.
+        """
+        im_data = self.get_plot_image()
+        assert im_data.ndim == 3, "Expected an RGB image"
+        assert (
+            im_expected.ndim == 3
+            and im_data.shape[:2] == im_expected.shape[:2]
+            and im_expected.shape[2] >= 3
+        ), "Incorrect Image Size"
+        as_uint8 = all(
+            _in_display_range(im[:, :, :3]) for im in (im_data, im_expected)
+        )
+        atol = np.broadcast_to(np.asarray(atol, dtype=float), (3,))
+        if as_uint8:
+            if (atol != np.round(atol)).any():
+                raise ValueError(
+                    "atol must be a whole number of levels from 0 to 255"
+                )
+            atol = atol.astype(np.int16)
+
+        rows = im_data.shape[0]
+        if not rows or not im_data.shape[1]:
+            return 0.0
+        bad = 0
+        for start in range(0, rows, chunksize):
+            block = slice(start, start + chunksize)
+            if as_uint8:
+                plotted = _to_uint8(im_data[block, :, :3]).astype(np.int16)
+                expected = _to_uint8(im_expected[block, :, :3])
+                differs = np.abs(plotted - expected) > atol
+            else:
+                differs = ~np.isclose(
+                    np.ma.getdata(im_data[block, :, :3]),
+                    np.ma.getdata(im_expected[block, :, :3]),
+                    rtol=0,
+                    atol=atol,
+                    equal_nan=True,
+                )
+            bad += np.count_nonzero(differs.any(axis=2))
+        return bad / float(rows * im_data.shape[1])
+
+    def assert_image_rgb(
+        self,
+        im_expected,
+        atol=0,
+        max_mismatch=0,
+        chunksize=256,
+        m="Incorrect Image Displayed",
+    ):
+        """Asserts the RGB image on Axes ax matches `im_expected`, see
+        ``get_rgb_mismatch()``.
+
+        Parameters
+        ----------
+        im_expected: Numpy Array
+            Array of shape (rows, cols, 3) or (rows, cols, 4) containing the
+            expected image.
+        atol: int or list of 3 ints
+            Largest difference allowed in each of the red, green and blue
+            channels, in units of 0 to 255, or in the units of the raw
+            values if these are compared. Raises a ValueError if the uint8
+            values are compared and `atol` is not a whole number.
+        max_mismatch: float
+            Largest fraction of pixels allowed to differ by more than `atol`.
+        chunksize: int
+            Number of rows compared at once.
+        m: string
+            String error message if assertion is not met.
+
+        Returns
+        ----------
+        Nothing (if checks pass) or raises error
+        """
+        mismatch = self.get_rgb_mismatch(
+            im_expected, atol=atol, chunksize=chunksize
+        )
+        assert (
+            mismatch <= max_mismatch
+        ), "{0}: Arrays are not equal in {1:.2%} of pixels".format(m, mismatch)
+
     def assert_image(
         self, im_expected, im_classified=False, m="Incorrect Image Displayed"
     ):
@@ -187,8 +670,9 @@ class RasterTester(VectorTester):
 
         Parameters
         ----------
-        im_expected: Numpy Array
-            Array containing the expected image data.
+        im_expected: Numpy Array, string, path or rasterio DatasetReader
+            Array containing the expected image data, or a raster file
+            compared with ``assert_image_file()``.
         im_classified: boolean
             Set to True image has been classified. Since classified images
             values can be reversed or shifted and still produce the same image,
@@ -199,24 +683,29 @@ class RasterTester(VectorTester):
         Returns
         ----------
         Nothing (if checks pass) or raises error
-        """
-        im_data = []
-        if self.ax.get_images():
-            im_data = self.ax.get_images()[0].get_array()
-        assert list(im_data), "No Image Displayed"
 
-        # If image array has 3 dims (e.g. rgb image), remove alpha channel
-        if len(im_data.shape) == 3:
-            im_data = im_data[:, :, :3]
+        Notes
+        ----------
+        RGB images are compared with ``assert_image_rgb()``, so their values
+        must match exactly after conversion to uint8, or exactly as they are
+        if they lie outside the range Matplotlib displays.
+        """
+        if isinstance(im_expected, (str, os.PathLike, DatasetReader)):
+            self.assert_image_file(im_expected, m=m)
+            return
+        im_data = self.get_plot_image()
+        if im_data.ndim == 3 and not im_classified:
+            self.assert_image_rgb(im_expected, m=m)
+            return
         assert im_data.shape == im_expected.shape, "Incorrect Image Size"
 
         # If image is a classified image, allow for shifted or reversed values
         if im_classified:
-            im_data_vals = np.unique(im_data)
-            im_range = max(im_data_vals) - min(im_data_vals)
-            offset = min(im_data_vals) - min(np.unique(im_expected))
-            im_data = [val - offset for val in im_data]
-            im_data_rev = [abs(val - im_range) for val in im_data]
+            im_min, im_max = im_data.min(), im_data.max()
+            im_range = im_max - im_min
+            offset = im_min - np.min(im_expected)
+            im_data = im_data - offset
+            im_data_rev = np.abs(im_data - im_range)
             assert np.array_equal(im_data, im_expected) or np.array_equal(
                 im_data_rev, im_expected
             ), m
@@ -224,6 +713,250 @@ class RasterTester(VectorTester):
         else:
             np.testing.assert_equal(im_data, im_expected), m
 
+    def get_mask_mismatch(self, mask_expected, nodata=None, chunksize=256):
+        """Returns the number of pixels of the image on Axes ax that are
+        masked (not displayed) when they should not be, or the other way
+        around.
+
+        The masks are packed into bits a block of rows at a time and compared
+        with XOR and a bit count, so about one bit per pixel is held in
+        memory. NaN values are masked by Matplotlib when an image is plotted,
+        so they count as masked.
+
+        Parameters
+        ----------
+        mask_expected: Numpy Array
+            Either a boolean array that is ``True`` where pixels should be
+            masked, a masked array whose mask is expected, or, if `nodata` is
+            given, the expected data with nodata values in it.
+        nodata: float (Optional)
+            Pixels of `mask_expected` equal to this value are expected to be
+            masked.
+        chunksize: int
+            Number of rows compared at once.
+
+        Returns
+        ----------
+        mismatch: int
+            Number of pixels masked differently than expected.
+        """
+        im_data = self.get_plot_image()
+        assert (
+            im_data.shape[:2] == np.shape(mask_expected)[:2]
+        ), "Incorrect Image Size"
+        mismatch = 0
+        for plotted, expected in zip(
+            _packed_mask_blocks(im_data, chunksize),
+            _packed_mask_blocks(mask_expected, chunksize, nodata=nodata),
+        ):
+            mismatch += int(
+                _POPCOUNT[np.bitwise_xor(plotted, expected)].sum(
+                    dtype=np.int64
+                )
+            )
+        return mismatch
+
+    def assert_image_mask(
+        self,
+        mask_expected,
+        nodata=None,
+        max_mismatch=0,
+        chunksize=256,
+        m="Incorrect pixels masked",
+    ):
+        """Asserts the pixels masked in the image on Axes ax match
+        `mask_expected`, see ``get_mask_mismatch()``.
+
+        Parameters
+        ----------
+        mask_expected: Numpy Array
+            Either a boolean array that is ``True`` where pixels should be
+            masked, a masked array whose mask is expected, or, if `nodata` is
+            given, the expected data with nodata values in it.
+        nodata: float (Optional)
+            Pixels of `mask_expected` equal to this value are expected to be
+            masked.
+        max_mismatch: int
+            Largest number of pixels allowed to be masked differently.
+        chunksize: int
+            Number of rows compared at once.
+        m: string
+            String error message if assertion is not met.
+
+        Returns
+        ----------
+        Nothing (if checks pass) or raises error
+        """
+        mismatch = self.get_mask_mismatch(
+            mask_expected, nodata=nodata, chunksize=chunksize
+        )
+        n_pixels = np.prod(np.shape(mask_expected)[:2])
+        message = "{0}: {1} of {2} pixels differ"
+        assert mismatch <= max_mismatch, message.format(m, mismatch, n_pixels)
+
+    def get_downsample_factors(self, im_expected, how="nearest"):
+        """Returns the integer factors that `im_expected` was downsampled by
+        along its rows and columns to give the image on Axes ax.
+
+        Parameters
+        ----------
+        im_expected: Numpy Array
+            The full resolution expected image.
+        how: string
+            One of the following ['nearest', 'mean', 'mode']. See
+            ``assert_image_downsampled()``.
+
+        Returns
+        ----------
+        factors: tuple of 2 ints
+            The row and column factors. Raises an AssertionError if the image
+            sizes do not fit an integer downsampling.
+        """
+        im_data = self.get_plot_image()
+        factors = tuple(
+            _downsample_factor(n, m, how)
+            for n, m in zip(im_expected.shape[:2], im_data.shape[:2])
+        )
+        assert (
+            None not in factors and im_data.shape[2:] == im_expected.shape[2:]
+        ), "Incorrect Image Size"
+        return factors
+
+    def assert_image_downsampled(
+        self,
+        im_expected,
+        how="nearest",
+        atol=0,
+        chunksize=256,
+        m="Incorrect Image Displayed",
+    ):
+        """Asserts the image on Axes ax matches `im_expected` after reducing
+        `im_expected` to the size of the plotted image.
+
+        The downsampling factors are found from the image sizes (see
+        ``get_downsample_factors()``). The expected image is then reduced a
+        band of rows at a time, so no full resolution copy of it is made.
+
+        Parameters
+        ----------
+        im_expected: Numpy Array
+            The full resolution expected image.
+        how: string
+            How the image was reduced, one of the following ['nearest',
+            'mean', 'mode'].
+            'nearest': every k-th pixel was taken, starting with the first,
+            e.g. ``im[::k, ::k]``
+            'mean': each block of k by k pixels was averaged, dropping
+            incomplete blocks at the edges
+            'mode': each block of k by k pixels was replaced by its most
+            common value (smallest value on ties), for classified images
+        atol: float
+            Absolute tolerance allowed between the values.
+        chunksize: int
+            Number of rows of the plotted image compared at once.
+        m: string
+            String error message if assertion is not met.
+
+        Returns
+        ----------
+        Nothing (if checks pass) or raises error
+        """
+        if how not in ["nearest", "mean", "mode"]:
+            raise ValueError(
+                'how must be one of the following ["nearest", "mean", "mode"]'
+            )
+        im_data = self.get_plot_image()
+        factors = self.get_downsample_factors(im_expected, how=how)
+        for rows, band in _block_reduce_bands(
+            im_expected, factors, im_data.shape[:2], how, chunksize
+        ):
+            np.testing.assert_allclose(
+                im_data[rows], band, atol=atol, err_msg=m
+            )
+
+    def assert_image_file(
+        self,
+        source,
+        bands=None,
+        resampling="nearest",
+        atol=0,
+        chunksize=256,
+        m="Incorrect Image Displayed",
+    ):
+        """Asserts the image on Axes ax matches the data of a raster file
+        within the plotted extent.
+
+        The window of the file that covers the extent of the image is read
+        at the resolution of the image, a strip of rows at a time, so memory
+        use does not depend on the size of the file. Pixels that are nodata
+        in the file are not compared, see ``assert_image_mask()`` to check
+        that they are masked.
+
+        Parameters
+        ----------
+        source: string, path or rasterio.io.DatasetReader
+            Path to the expected raster file, or a dataset opened with
+            ``rasterio.open()``. A dataset is not closed.
+        bands: list of ints (Optional)
+            Bands of the file to compare, starting at 1. Defaults to the
+            first band, or the first three bands for an RGB image.
+        resampling: string
+            Name of the ``rasterio.enums.Resampling`` method used when the
+            image is coarser than the file, e.g. 'nearest', 'average' or
+            'mode'. 'nearest' takes the pixel at the center of each block.
+        atol: float
+            Absolute tolerance allowed between the values.
+        chunksize: int
+            Number of rows of the plotted image compared at once.
+        m: string
+            String error message if assertion is not met.
+
+        Returns
+        ----------
+        Nothing (if checks pass) or raises error
+        """
+        im_data = self.get_plot_image()
+        if bands is None:
+            bands = [1, 2, 3] if im_data.ndim == 3 else [1]
+        coords = self.get_raster_coordinates()
+        xs, ys = coords[..., 0], coords[..., 1]
+        bounds = (xs.min(), ys.min(), xs.max(), ys.max())
+
+        dataset = source
+        if not isinstance(source, DatasetReader):
+            dataset = rasterio.open(source)
+        try:
+            window, rows_down, cols_left = _bounds_window(
+                dataset.transform, bounds
+            )
+            # Flip the image so its rows and columns run like the file's
+            if (ys[0, 0] > ys[-1, 0]) != rows_down:
+                im_data = im_data[::-1]
+            if (xs[0, 0] > xs[0, -1]) != cols_left:
+                im_data = im_data[:, ::-1]
+            strips = _window_strips(
+                dataset,
+                window,
+                im_data.shape[:2],
+                bands,
+                Resampling[resampling],
+                chunksize,
+            )
+            for rows, strip in strips:
+                im_strip = im_data[rows].reshape(strip.shape)
+                if im_data.ndim == 3:
+                    im_strip, strip = _to_uint8(im_strip), _to_uint8(strip)
+                valid = ~np.ma.getmaskarray(strip)
+                np.testing.assert_allclose(
+                    np.ma.getdata(im_strip)[valid],
+                    np.ma.getdata(strip)[valid],
+                    atol=atol,
+                    err_msg=m,
+                )
+        finally:
+            if dataset is not source:
+                dataset.close()
+
     def assert_image_full_screen(self, m="Image is stretched inaccurately"):
         """Asserts the first image in ax fills the entire axes window
 
@@ -236,7 +969,16 @@ class RasterTester(VectorTester):
         Nothing (if checks pass) or raises error with message m
         """
         ax_extent = list(self.ax.get_xlim() + self.ax.get_ylim())
-        if self.ax.images:
-            assert np.array_equal(self.ax.images[0].get_extent(), ax_extent), m
-        else:
+        rasters = self.get_raster_artists()
+        if not rasters:
             assert False, "No image found on axes"
+        if isinstance(rasters[0], QuadMesh):
+            # Meshes can run either way along an axis, so compare bounds
+            coords = _mesh_coordinates(rasters[0]).reshape(-1, 2)
+            mesh_bounds = np.column_stack(
+                (coords.min(axis=0), coords.max(axis=0))
+            )
+            ax_bounds = np.sort(np.reshape(ax_extent, (2, 2)), axis=1)
+            assert np.array_equal(mesh_bounds, ax_bounds), m
+        else:
+            assert np.array_equal(rasters[0].get_extent(), ax_extent), m
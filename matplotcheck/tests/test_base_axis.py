@@ -271,3 +271,43 @@ def test_assert_equal_xlims_ylims_bad_ylims(pt_line_plt):
     with pytest.raises(AssertionError, match="xlims and ylims are not equal"):
         pt_line_plt.assert_equal_xlims_ylims()
     plt.close()
+
+
+""" TICK TESTS """
+
+
+def test_get_ticks_within_limits(pt_line_plt):
+    """Checks that get_ticks only returns ticks within the axis limits"""
+    pt_line_plt.ax.set_xlim((0, 10))
+    pt_line_plt.ax.xaxis.set_major_locator(plt.MultipleLocator(5))
+    locs, labels = pt_line_plt.get_ticks("x")
+    assert list(locs) == [0, 5, 10]
+    assert labels == ["0", "5", "10"]
+    plt.close()
+
+
+def test_get_ticks_updates_with_limits(pt_line_plt):
+    """Checks that get_ticks follows changes to the axis limits"""
+    pt_line_plt.ax.set_xlim((0, 10))
+    pt_line_plt.ax.xaxis.set_major_locator(plt.MultipleLocator(5))
+    assert len(pt_line_plt.get_ticks("x")[0]) == 3
+    pt_line_plt.ax.set_xlim((0, 20))
+    assert len(pt_line_plt.get_ticks("x")[0]) == 5
+    plt.close()
+
+
+def test_get_ticks_set_labels(pt_line_plt):
+    """Checks that get_ticks returns tick labels set by the user without
+    drawing the figure"""
+    pt_line_plt.ax.set_xlim((0, 3))
+    pt_line_plt.ax.set_xticks([1, 2])
+    pt_line_plt.ax.set_xticklabels(["a", "b"])
+    assert pt_line_plt.get_ticks("x")[1] == ["a", "b"]
+    plt.close()
+
+
+def test_get_ticks_invalid_axis(pt_line_plt):
+    """Checks that get_ticks fails with an invalid axis"""
+    with pytest.raises(ValueError, match="axis must be one of"):
+        pt_line_plt.get_ticks("z")
+    plt.close()
@@ -1,6 +1,9 @@
 """Tests for the base module that check data"""
+import pickle
+import unittest
 import pytest
-from matplotcheck.base import PlotTester
+from matplotcheck.base import PlotTester, PlotExpectation
+from matplotcheck.cases import PlotBasicSuite
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -138,6 +141,136 @@ def test_assert_xydata_floatingpoint_error(pt_scatter_plt, pd_df):
     plt.close()
 
 
+def test_iter_xy_matches_get_xy(pt_scatter_plt):
+    """Tests that iter_xy yields the same data as get_xy in blocks no larger
+    than chunksize"""
+    blocks = list(pt_scatter_plt.iter_xy(points_only=True, chunksize=30))
+    assert max(len(b) for b in blocks) <= 30
+    np.testing.assert_equal(
+        np.concatenate(blocks), pt_scatter_plt.get_xy(points_only=True)
+    )
+    plt.close()
+
+
+def test_assert_xydata_repeated_x():
+    """Tests that points sharing an x value are compared in the same order,
+    no matter the order they were plotted in"""
+    df = pd.DataFrame({"x": [1.0, 2.0, 1.0, 3.0], "y": [5.0, 1.0, -2.0, 0.0]})
+    fig, ax = plt.subplots()
+    ax.scatter(df.x[::-1], df.y[::-1])
+    PlotTester(ax).assert_xydata(df, xcol="x", ycol="y", points_only=True)
+    plt.close()
+
+
+def test_assert_xydata_empty_scatter(pd_df):
+    """Tests that empty artists, such as legend proxies, are skipped"""
+    fig, ax = plt.subplots()
+    ax.scatter(pd_df.A, pd_df.B)
+    ax.scatter([], [], label="proxy")
+    pt = PlotTester(ax)
+    assert len(list(pt.iter_xy(points_only=True))) == 1
+    pt.assert_xydata(pd_df, xcol="A", ycol="B", points_only=True)
+    plt.close()
+
+
+def test_iter_xy_returns_readonly_views(pt_line_plt):
+    """Tests that iter_xy hands out read-only views of the line data rather
+    than copies"""
+    line = pt_line_plt.ax.lines[0]
+    (block,) = pt_line_plt.iter_xy()
+    assert np.shares_memory(block, line.get_xydata())
+    assert not block.flags.writeable
+    plt.close()
+
+
+def test_get_xy_summary(pt_scatter_plt, pd_df):
+    """Tests that get_xy_summary returns the count and bounds of the data"""
+    summary = pt_scatter_plt.get_xy_summary(points_only=True, chunksize=7)
+    assert summary["count"] == 100
+    assert summary["xmin"] == pd_df["A"].min()
+    assert summary["ymax"] == pd_df["B"].max()
+    plt.close()
+
+
+def test_assert_xy_summary(pt_scatter_plt, pd_df):
+    """Tests that assert_xy_summary passes with the expected data in any
+    order"""
+    pt_scatter_plt.assert_xy_summary(
+        pd_df.sample(frac=1), xcol="A", ycol="B", points_only=True
+    )
+    plt.close()
+
+
+def test_assert_xy_summary_changed_data(pt_scatter_plt, pd_df):
+    """Tests that assert_xy_summary fails when one value changes inside the
+    bounds of the data"""
+    pd_df.loc[1, "B"] = 50.5
+    with pytest.raises(AssertionError, match="Incorrect data values"):
+        pt_scatter_plt.assert_xy_summary(
+            pd_df, xcol="A", ycol="B", points_only=True
+        )
+    plt.close()
+
+
+def test_assert_xy_summary_count(pt_scatter_plt, pd_df):
+    """Tests that assert_xy_summary fails with the wrong number of points"""
+    with pytest.raises(AssertionError, match="Expected 99 data points"):
+        pt_scatter_plt.assert_xy_summary(
+            pd_df.iloc[1:], xcol="A", ycol="B", points_only=True
+        )
+    plt.close()
+
+
+def test_plot_expectation_prepares_data(pd_df):
+    """Tests that PlotExpectation sorts and casts the expected data once and
+    normalizes the expected strings"""
+    expected = PlotExpectation(
+        pd_df.sample(frac=1), xcol="A", ycol="B", title_contains=["My Title"]
+    )
+    assert expected.x.dtype == np.float64
+    np.testing.assert_equal(expected.x, np.arange(100))
+    assert expected.title_contains == ["mytitle"]
+    slope, intercept = expected.regression
+    assert np.isclose(intercept, pd_df["B"].mean() - slope * 49.5)
+
+
+def test_assert_xydata_plot_expectation(pt_scatter_plt, pd_df):
+    """Tests that assert_xydata accepts a pickled PlotExpectation"""
+    expected = pickle.loads(
+        pickle.dumps(PlotExpectation(pd_df, xcol="A", ycol="B"))
+    )
+    pt_scatter_plt.assert_xydata(expected, points_only=True)
+    plt.close()
+
+
+def test_assert_xydata_plot_expectation_fails(pt_scatter_plt, pd_df):
+    """Tests that assert_xydata fails with a PlotExpectation of other data"""
+    pd_df.loc[1, "B"] += 5
+    expected = PlotExpectation(pd_df, xcol="A", ycol="B")
+    with pytest.raises(AssertionError, match="Incorrect data values"):
+        pt_scatter_plt.assert_xydata(expected, points_only=True)
+    plt.close()
+
+
+def test_plot_basic_suite_expectation(pt_scatter_plt, pd_df):
+    """Tests that PlotBasicSuite runs its tests against a PlotExpectation"""
+    expected = PlotExpectation(
+        pd_df,
+        xcol="A",
+        ycol="B",
+        title_contains=["Plot Title"],
+        xlabel_contains=["x"],
+        ylabel_contains=["y"],
+    )
+    suite = PlotBasicSuite(
+        pt_scatter_plt.ax, plot_type="scatter", expectation=expected
+    ).suite
+    result = unittest.TestResult()
+    suite.run(result)
+    assert result.wasSuccessful(), result.failures + result.errors
+    plt.close()
+
+
 """ LABELS DATA TESTS """
 
 
@@ -451,3 +584,31 @@ def test_assert_bin_midpoints_overlap_length_fail(pt_hist_overlapping):
         pt_hist_overlapping.assert_bin_midpoints(bins)
 
     plt.close()
+
+
+def test_find_nodata_lines_and_images():
+    """Test that find_nodata reports sentinel values, NaN and out of range
+    values per artist, and skips masked image values"""
+    fig, ax = plt.subplots()
+    ax.plot([1, 2, 3, 4], [1, -9999, np.nan, 50])
+    image = np.ma.masked_equal(
+        np.array([[1, 999.99], [-9999, 2]], dtype=np.float32), -9999
+    )
+    ax.imshow(image)
+    found = PlotTester(ax).find_nodata([-9999, 999.99], valid_range=(0, 10))
+
+    assert len(found) == 2
+    line, im = found
+    assert line["array"] == "xy"
+    assert line["counts"] == {-9999.0: 1, "nan": 1, "out_of_range": 2}
+    np.testing.assert_equal(line["locations"], [1, 2, 3])
+    assert im["array"] == "values"
+    assert im["counts"] == {np.float32(999.99).item(): 1, "out_of_range": 1}
+    np.testing.assert_equal(im["locations"], [[0, 1]])
+    plt.close()
+
+
+def test_find_nodata_clean(pt_scatter_plt):
+    """Test that find_nodata reports nothing for clean data"""
+    assert pt_scatter_plt.find_nodata([-9999]) == []
+    plt.close()
@@ -109,3 +109,31 @@ def test_assert_no_legend_overlap_fail(pt_multi_line_plt):
     with pytest.raises(AssertionError, match="Legends overlap eachother"):
         pt_multi_line_plt.assert_no_legend_overlap()
     plt.close()
+
+
+def test_get_artist_index_legends(pt_multi_line_plt):
+    """Check that the artist index holds the legend on the axes and picks up
+    legends added after the tester was created"""
+    index = pt_multi_line_plt.get_artist_index()
+    assert len(index["legends"]) == 1
+    assert index["lines"] == list(pt_multi_line_plt.ax.get_lines())
+    leg_1 = plt.legend(loc=[0.8, 0.8])
+    plt.legend(loc=[0.1, 0.1])
+    pt_multi_line_plt.ax.add_artist(leg_1)
+    assert len(pt_multi_line_plt.get_legends()) == 2
+    plt.close()
+
+
+def test_get_artist_index_replaced_line(pt_multi_line_plt):
+    """Check that the artist index is rebuilt when a line is replaced by
+    another, leaving the number of lines the same"""
+    ax = pt_multi_line_plt.ax
+    index = pt_multi_line_plt.get_artist_index()
+    assert pt_multi_line_plt.get_artist_index() is index
+    ax.lines[0].remove()
+    (line,) = ax.plot([0, 1], [0, 1])
+    assert line in pt_multi_line_plt.get_artist_index()["lines"]
+    assert len(pt_multi_line_plt.get_artist_index()["lines"]) == len(
+        index["lines"]
+    )
+    plt.close()
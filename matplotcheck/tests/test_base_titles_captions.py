@@ -1,6 +1,7 @@
 """Tests for the base module -- titles and captions"""
 import pytest
 import matplotlib.pyplot as plt
+from matplotcheck.base import _KeywordMatcher
 
 
 """ TITLE TESTS """
@@ -169,3 +170,44 @@ def test_assert_caption_contains_nocaption(pt_bar_plt):
     ):
         pt_bar_plt.assert_caption_contains([["Figure"], ["Caption"]])
     plt.close()
+
+
+""" TEXT INDEX TESTS """
+
+
+def test_get_text_index(pt_line_plt):
+    """Check that the text index holds the normalized plot text"""
+    index = pt_line_plt.get_text_index()
+    assert index["title"] == "myplottitle"
+    assert index["suptitle"] == "myfiguretitle"
+    assert index["xlabel"] == "xlabel"
+    plt.close()
+
+
+def test_get_text_index_updates(pt_line_plt):
+    """Check that the text index is rebuilt when the plot text changes"""
+    assert pt_line_plt.get_text_index()["ylabel"] == "ylabel"
+    pt_line_plt.ax.set_ylabel("New Label")
+    assert pt_line_plt.get_text_index()["ylabel"] == "newlabel"
+    plt.close()
+
+
+def test_get_text_index_legend_updates(pt_multi_line_plt):
+    """Check that the text index is rebuilt when legend text changes or a
+    new legend replaces the old one"""
+    legend = pt_multi_line_plt.ax.get_legend()
+    assert pt_multi_line_plt.get_text_index()["legend_titles"] == ["legend"]
+    legend.get_texts()[0].set_text("New Entry")
+    labels = pt_multi_line_plt.get_text_index()["legend_labels"]
+    assert labels[0][0] == "new entry"
+    pt_multi_line_plt.ax.legend(title="Other")
+    assert pt_multi_line_plt.get_text_index()["legend_titles"] == ["other"]
+    plt.close()
+
+
+def test_keyword_matcher_overlapping():
+    """Check that the keyword matcher finds overlapping and nested
+    keywords"""
+    matcher = _KeywordMatcher(["he", "she", "his", "hers", "ers", "x"])
+    assert matcher.find("ushers") == {"he", "she", "hers", "ers"}
+    assert matcher.find("") == set()
@@ -0,0 +1,78 @@
+"""Tests for the figure module"""
+import pytest
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotcheck.figure import FigureTester
+from matplotcheck.raster import RasterTester
+
+
+@pytest.fixture
+def multi_panel_fig():
+    """A figure with two line plots with captions and a raster with a
+    colorbar"""
+    fig = plt.figure(figsize=(8, 8))
+    axs = [fig.add_subplot(2, 2, 1), fig.add_subplot(2, 2, 2)]
+    axs.append(fig.add_subplot(2, 1, 2))
+    fig.suptitle("My Figure Title")
+    for i, ax in enumerate(axs[:2]):
+        ax.plot([1, 2, 3], [i, i + 1, i + 2], label="line {0}".format(i))
+        ax.legend()
+    # The caption area of the left plot is narrow enough to leave out the
+    # right caption, but not the other way round, so add the right one first
+    for i in [1, 0]:
+        pos = axs[i].get_position()
+        fig.text(pos.xmax - 0.05, pos.ymin - 0.05, "Caption {0}".format(i))
+    im = axs[2].imshow(np.arange(16).reshape(4, 4))
+    fig.colorbar(im, ax=axs[2])
+    return fig
+
+
+def test_figure_tester_axes(multi_panel_fig):
+    """Check that colorbar axes are left out of the tested axes"""
+    ft = FigureTester(multi_panel_fig)
+    assert len(ft) == 3
+    ft.assert_num_axes(3)
+    assert ft.suptitle == "My Figure Title"
+    assert len(ft.get_artists(2, "colorbars")) == 1
+    plt.close()
+
+
+def test_figure_tester_captions(multi_panel_fig):
+    """Check that each caption is assigned to the axes above it"""
+    ft = FigureTester(multi_panel_fig)
+    testers = ft.get_testers()
+    assert [pt.get_caption() for pt in testers] == [
+        "Caption 0",
+        "Caption 1",
+        None,
+    ]
+    testers[1].assert_caption_contains(["caption 1"])
+    plt.close()
+
+
+def test_figure_tester_shared_testers(multi_panel_fig):
+    """Check that testers are reused and hold the legends of their axes"""
+    ft = FigureTester(multi_panel_fig)
+    assert ft.get_tester(0) is ft.get_tester(ft.axes[0])
+    ft.get_tester(1).assert_legend_labels(["line 1"])
+    rt = ft.get_tester(2, tester_class=RasterTester)
+    assert isinstance(rt, RasterTester)
+    assert len(ft.get_artists(2, "images")) == 1
+    plt.close()
+
+
+def test_figure_tester_num_axes_fail(multi_panel_fig):
+    """Check that assert_num_axes fails with the wrong number of axes"""
+    ft = FigureTester(multi_panel_fig)
+    with pytest.raises(AssertionError, match="Expected 2 plots, but found 3"):
+        ft.assert_num_axes(2)
+    plt.close()
+
+
+def test_figure_tester_bad_axes(multi_panel_fig):
+    """Check that get_tester rejects an Axes of another figure"""
+    ft = FigureTester(multi_panel_fig)
+    _, other_ax = plt.subplots()
+    with pytest.raises(ValueError, match="Axes of the tested Figure"):
+        ft.get_tester(other_ax)
+    plt.close("all")
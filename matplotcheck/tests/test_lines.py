@@ -2,10 +2,15 @@
 import matplotlib
 import matplotlib.pyplot as plt
 import pytest
+import numpy as np
 import geopandas as gpd
 from shapely.geometry import LineString
 
-from matplotcheck.vector import VectorTester
+from matplotcheck.vector import (
+    VectorTester,
+    _RaggedGeometry,
+    _get_transformer,
+)
 
 matplotlib.use("Agg")
 
@@ -170,3 +175,153 @@ def test_get_lines_by_collection(multiline_geo_plot):
     sorted_lines_list = sorted([sorted(line) for line in lines_list])
     assert sorted_lines_list == multiline_geo_plot.get_lines_by_collection()
     plt.close("all")
+
+
+def test_get_lines_by_attributes(multiline_geo_plot):
+    """Lines colored by attribute should be grouped by color"""
+    lines_list = [
+        [
+            [(1, 1), (2, 2), (3, 2), (5, 3)],
+            [(3, 4), (5, 7), (12, 2), (10, 5), (9, 7.5)],
+        ],
+        [[(2, 1), (3, 1), (4, 1), (5, 2)]],
+    ]
+    sorted_lines_list = sorted([sorted(line) for line in lines_list])
+    assert sorted_lines_list == multiline_geo_plot.get_lines_by_attributes()
+    plt.close("all")
+
+
+def test_ragged_geometry_from_geometries(multi_line_gdf):
+    """Multi-part lines should be split into parts held in flat arrays"""
+    geometry = _RaggedGeometry.from_geometries(multi_line_gdf.geometry)
+    assert len(geometry) == 3
+    assert geometry.coords.shape == (13, 2)
+    np.testing.assert_equal(geometry.part_sizes(), [4, 5, 4])
+    assert geometry.to_tuples()[2] == [(2, 1), (3, 1), (4, 1), (5, 2)]
+
+
+def test_ragged_geometry_take_and_equals():
+    """Parts should be gathered in any order, and geometries holding the
+    same parts in another order should be equal"""
+    geometry = _RaggedGeometry.from_parts(
+        [[[(0, 0), (1, 1)]], [[(2, 2), (3, 3), (4, 4)]], [[(5, 5)]]]
+    )
+    taken = geometry.take([2, 0, 1])
+    np.testing.assert_equal(taken.part_sizes(), [1, 2, 3])
+    np.testing.assert_equal(taken.rings()[0], [[5, 5]])
+    assert taken.equals(geometry)
+    assert not geometry.take([0, 1, 1]).equals(geometry)
+    reversed_part = _RaggedGeometry.from_parts(
+        [[[(1, 1), (0, 0)]], [[(2, 2), (3, 3), (4, 4)]], [[(5, 5)]]]
+    )
+    assert not reversed_part.equals(geometry)
+
+
+def test_assert_lines_tolerance(line_geo_plot, two_line_gdf):
+    """Lines with noise and extra vertices should pass within a tolerance"""
+    noisy = gpd.GeoDataFrame(
+        geometry=[
+            LineString(
+                [(x + 1e-9, y - 1e-9) for x, y in np.asarray(line.coords)]
+            )
+            for line in two_line_gdf.geometry
+        ]
+    )
+    with pytest.raises(AssertionError, match="Incorrect Line Data"):
+        line_geo_plot.assert_lines(noisy)
+    line_geo_plot.assert_lines(noisy, tolerance=1e-6)
+
+    coords = np.asarray(two_line_gdf.geometry[0].coords)
+    midpoints = (coords[:-1] + coords[1:]) / 2
+    dense = np.empty((2 * len(coords) - 1, 2))
+    dense[::2], dense[1::2] = coords, midpoints
+    denser = gpd.GeoDataFrame(
+        geometry=[LineString(dense), two_line_gdf.geometry[1]]
+    )
+    line_geo_plot.assert_lines(denser, tolerance=1e-6)
+    plt.close("all")
+
+
+def test_assert_lines_tolerance_fail(line_geo_plot, two_line_gdf):
+    """Lines further apart than the tolerance, or missing, should fail"""
+    shifted = two_line_gdf.copy()
+    shifted["geometry"] = two_line_gdf.geometry.translate(xoff=0.5)
+    with pytest.raises(AssertionError, match="Incorrect Line Data"):
+        line_geo_plot.assert_lines(shifted, tolerance=0.1)
+    line_geo_plot.assert_lines(shifted, tolerance=0.6)
+    with pytest.raises(AssertionError, match="Incorrect Line Data"):
+        line_geo_plot.assert_lines(two_line_gdf.iloc[:1], tolerance=0.1)
+    plt.close("all")
+
+
+def test_match_lines(line_geo_plot, two_line_gdf):
+    """Each plotted line should be paired with its expected line"""
+    reordered = two_line_gdf.iloc[::-1].reset_index(drop=True)
+    matches = line_geo_plot.match_lines(reordered, tolerance=1e-6)
+    np.testing.assert_equal(matches, [1, 0])
+    matches = line_geo_plot.match_lines(reordered.iloc[:1], tolerance=1e-6)
+    np.testing.assert_equal(matches, [-1, 0])
+    plt.close("all")
+
+
+def test_assert_lines_reprojected(two_line_gdf):
+    """Expected lines should be reprojected once, with a cached
+    transformer"""
+    _, ax = plt.subplots()
+    two_line_gdf.to_crs("epsg:3857").plot(ax=ax)
+    vt = VectorTester(ax, crs=3857)
+    vt.assert_lines(two_line_gdf)
+    vt.assert_lines(two_line_gdf, tolerance=1e-6)
+    assert vt._get_expected_geometry(two_line_gdf).coords is (
+        vt._get_expected_geometry(two_line_gdf).coords
+    )
+    plt.close("all")
+
+
+def test_assert_lines_reprojected_new_tester(two_line_gdf):
+    """Another tester, e.g. for the next submission, should reuse the
+    reprojected lines without reprojecting them again"""
+    _, ax = plt.subplots()
+    two_line_gdf.to_crs("epsg:3857").plot(ax=ax)
+    expected = VectorTester(ax, crs=3857)._get_expected_geometry(two_line_gdf)
+    misses = _get_transformer.cache_info().misses
+    hits = _get_transformer.cache_info().hits
+    vt = VectorTester(ax, crs=3857)
+    vt.assert_lines(two_line_gdf)
+    assert vt._get_expected_geometry(two_line_gdf).coords is expected.coords
+    assert not vt._get_expected_geometry(two_line_gdf).coords.flags.writeable
+    assert _get_transformer.cache_info().hits == hits
+    assert _get_transformer.cache_info().misses == misses
+    plt.close("all")
+
+
+@pytest.mark.parametrize(
+    "lines, stage",
+    [
+        ([[(1, 1), (2, 2), (3, 2), (5, 3)]], "feature count"),
+        (
+            [[(1, 1), (2, 2), (5, 3)], [(3, 4), (5, 7), (12, 2), (9, 7.5)]],
+            "vertex count",
+        ),
+        (
+            [
+                [(1, 1), (2, 2), (3, 2), (5, 3)],
+                [(3, 4), (5, 7), (13, 2), (10, 5), (9, 7.5)],
+            ],
+            "bounds",
+        ),
+        (
+            [
+                [(1, 1), (2, 2.5), (3, 2), (5, 3)],
+                [(3, 4), (5, 7), (12, 2), (10, 5), (9, 7.5)],
+            ],
+            "checksum",
+        ),
+    ],
+)
+def test_assert_lines_failed_stage(line_geo_plot, lines, stage):
+    """The error message should name the first check that failed"""
+    lines_gdf = gpd.GeoDataFrame(geometry=[LineString(c) for c in lines])
+    with pytest.raises(AssertionError, match="failed at " + stage):
+        line_geo_plot.assert_lines(lines_gdf)
+    plt.close("all")
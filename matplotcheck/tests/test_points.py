@@ -4,6 +4,7 @@ import matplotlib
 import matplotlib.pyplot as plt
 import pytest
 import geopandas as gpd
+from shapely.geometry import Point
 
 from matplotcheck.vector import VectorTester
 
@@ -159,3 +160,113 @@ def test_point_gdf_with_point_at_origin(pt_geo_plot_origin, origin_pt_gdf):
     """Test that assert_points works when there's a point at the origin in the
     gdf"""
     pt_geo_plot_origin.assert_points(origin_pt_gdf)
+
+
+def test_assert_xydata_geodataframe(pt_geo_plot, pd_gdf):
+    """Test that assert_xydata reads expected x and y values from the point
+    geometries of a GeoDataFrame"""
+    pt_geo_plot.assert_xydata(pd_gdf, points_only=True)
+    plt.close("all")
+
+
+def test_assert_xydata_geodataframe_fail(pt_geo_plot, bad_pd_gdf):
+    """Test that assert_xydata fails with the wrong point geometries"""
+    with pytest.raises(AssertionError, match="Incorrect data values"):
+        pt_geo_plot.assert_xydata(bad_pd_gdf, points_only=True)
+    plt.close("all")
+
+
+def test_get_points_by_attributes(pt_geo_plot, pd_gdf):
+    """Tests that get_points_by_attributes returns one sorted array of
+    coordinates for each group of like points"""
+    groups = pt_geo_plot.get_points_by_attributes()
+    assert sorted(len(g) for g in groups) == [2, 3]
+    for group in groups:
+        assert group.shape[1] == 2
+        np.testing.assert_equal(group, group[np.lexsort(group.T[::-1])])
+    plt.close("all")
+
+
+def test_sort_collection_by_markersize(pd_gdf):
+    """Tests that points from several collections are sorted by size, with
+    both single and per-point marker sizes"""
+    _, ax = plt.subplots()
+    ax.scatter(pd_gdf.geometry.x[:2], pd_gdf.geometry.y[:2], s=[50, 10])
+    ax.scatter(pd_gdf.geometry.x[2:], pd_gdf.geometry.y[2:], s=30)
+    df = VectorTester(ax).sort_collection_by_markersize()
+    assert list(df.markersize) == [10, 30, 30, 30, 50]
+    assert list(df.x[1:4]) == list(pd_gdf.geometry.x[2:])
+    assert (df.x[0], df.y[0]) == (pd_gdf.geometry.x[1], pd_gdf.geometry.y[1])
+    plt.close("all")
+
+
+def test_iter_points(pt_geo_plot, pd_gdf):
+    """Tests that iter_points yields the offsets of each point collection"""
+    blocks = list(pt_geo_plot.iter_points())
+    assert len(blocks) == 2
+    assert sum(len(offsets) for _, offsets in blocks) == len(pd_gdf)
+    plt.close("all")
+
+
+def test_assert_points_reprojected(pd_gdf):
+    """Expected points in another CRS should be reprojected to the CRS of
+    the tester"""
+    gdf = pd_gdf.set_crs("epsg:4326")
+    _, ax = plt.subplots()
+    gdf.to_crs("epsg:3857").plot(ax=ax)
+    with pytest.raises(AssertionError, match="Incorrect Point Data"):
+        VectorTester(ax).assert_points(gdf)
+    vt = VectorTester(ax, crs="epsg:3857")
+    vt.assert_points(gdf)
+    x, y = vt._get_xy_arrays(gdf)
+    assert np.shares_memory(vt._get_xy_arrays(gdf)[0], x)
+    plt.close("all")
+
+
+def test_assert_points_reprojected_edited(pd_gdf):
+    """Editing a reprojected layer in place should not reuse the projected
+    points"""
+    gdf = pd_gdf.set_crs("epsg:4326")
+    _, ax = plt.subplots()
+    gdf.to_crs("epsg:3857").plot(ax=ax)
+    vt = VectorTester(ax, crs="epsg:3857")
+    vt.assert_points(gdf)
+    gdf.loc[2, "geometry"] = Point(7, 7)
+    with pytest.raises(AssertionError, match="Incorrect Point Data"):
+        vt.assert_points(gdf)
+    plt.close("all")
+
+
+def test_assert_points_failed_stage(pt_geo_plot, pd_gdf):
+    """Moved points should fail at the bounds check"""
+    moved = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy(pd_gdf.geometry.x + 400, pd_gdf.geometry.y)
+    )
+    with pytest.raises(AssertionError, match="failed at bounds"):
+        pt_geo_plot.assert_points(moved)
+    plt.close("all")
+
+
+def test_assert_points_layer_changed(pt_geo_plot, pd_gdf):
+    """Replacing the geometries of a checked layer should not reuse the
+    cached points"""
+    layer = pd_gdf.copy()
+    pt_geo_plot.assert_points(layer)
+    layer["geometry"] = gpd.points_from_xy(
+        pd_gdf.geometry.x + 400, pd_gdf.geometry.y
+    )
+    with pytest.raises(AssertionError, match="failed at bounds"):
+        pt_geo_plot.assert_points(layer)
+    plt.close("all")
+
+
+def test_assert_points_near_equal(pt_geo_plot_bad, pd_gdf):
+    """Points off by tiny float errors should pass, as they do in the final
+    comparison of the data"""
+    near = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy(
+            pd_gdf.geometry.x * (1 + 1e-12), pd_gdf.geometry.y * (1 - 1e-12)
+        )
+    )
+    pt_geo_plot_bad.assert_points(near)
+    plt.close("all")
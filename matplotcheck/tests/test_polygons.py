@@ -2,10 +2,11 @@
 import matplotlib
 import matplotlib.pyplot as plt
 import pytest
+import numpy as np
 import geopandas as gpd
 from shapely.geometry import Polygon
 
-from matplotcheck.vector import VectorTester
+from matplotcheck.vector import VectorTester, _RaggedGeometry
 
 matplotlib.use("Agg")
 
@@ -121,3 +122,111 @@ def test_multi_polygon_pass(multi_poly_geo_plot, multi_polygon_gdf):
     """Check a multipolygon passes"""
     multi_poly_geo_plot.assert_polygons(multi_polygon_gdf)
     plt.close("all")
+
+
+@pytest.fixture
+def holes_polygon_gdf():
+    """A GeoDataFrame with a polygon that has two holes (lakes), and a
+    polygon inside one of the holes (an island)."""
+    lake_a = [(2, 2), (4, 2), (4, 4), (2, 4)]
+    lake_b = [(6, 6), (8, 6), (8, 8), (6, 8)]
+    land = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)], [lake_a, lake_b])
+    island = Polygon([(2.5, 2.5), (3.5, 2.5), (3, 3.5)])
+    return gpd.GeoDataFrame(geometry=[land, island], crs="epsg:4326")
+
+
+@pytest.fixture
+def holes_poly_geo_plot(holes_polygon_gdf):
+    """Create a vector tester object for polygons with holes."""
+    _, ax = plt.subplots()
+
+    holes_polygon_gdf.plot(ax=ax)
+
+    return VectorTester(ax)
+
+
+def test_polygon_holes_pass(holes_poly_geo_plot, holes_polygon_gdf):
+    """Polygons with holes should pass when the holes match"""
+    holes_poly_geo_plot.assert_polygons(holes_polygon_gdf)
+    holes_poly_geo_plot.assert_polygons(holes_polygon_gdf, dec=6)
+    plt.close("all")
+
+
+def test_polygon_missing_hole_fail(holes_poly_geo_plot, holes_polygon_gdf):
+    """Polygons should fail when a hole was filled in"""
+    land = holes_polygon_gdf.geometry[0]
+    filled = gpd.GeoDataFrame(
+        geometry=[
+            Polygon(land.exterior, [land.interiors[0]]),
+            holes_polygon_gdf.geometry[1],
+        ]
+    )
+    with pytest.raises(AssertionError, match="Incorrect Polygon"):
+        holes_poly_geo_plot.assert_polygons(filled)
+    with pytest.raises(AssertionError, match="Incorrect Polygon"):
+        holes_poly_geo_plot.assert_polygons(filled, dec=6)
+    plt.close("all")
+
+
+def test_polygon_ring_order_ignored(poly_geo_plot, basic_polygon):
+    """Polygons should pass when their rings start at another vertex or run
+    the other way"""
+    coords = list(basic_polygon.exterior.coords)[:-1]
+    rotated = coords[2:] + coords[:2]
+    poly_geo_plot.assert_polygons([rotated[::-1]])
+    plt.close("all")
+
+
+def test_ragged_geometry_normalized():
+    """Rings should be opened, turned counterclockwise, rotated to their
+    smallest vertex, and holes sorted after the exterior ring"""
+    exterior = [(0, 10), (10, 10), (10, 0), (0, 0), (0, 10)]
+    small_hole = [(6, 6), (7, 6), (7, 7)]
+    large_hole = [(4, 2), (2, 2), (2, 4), (4, 4)]
+    geometry = _RaggedGeometry.from_parts(
+        [[exterior, large_hole, small_hole]]
+    ).normalized()
+    np.testing.assert_equal(geometry.ring_offsets, [0, 4, 7, 11])
+    np.testing.assert_equal(
+        geometry.rings()[0], [(0, 0), (10, 0), (10, 10), (0, 10)]
+    )
+    np.testing.assert_equal(geometry.rings()[1], small_hole)
+    np.testing.assert_equal(
+        geometry.rings()[2], [(2, 2), (4, 2), (4, 4), (2, 4)]
+    )
+
+
+def test_polygon_dec_failed_bounds(poly_geo_plot, basic_polygon):
+    """Polygons further off than the decimal precision should fail at the
+    bounds check"""
+    x, y = basic_polygon.exterior.coords.xy
+    poly_list = [[(x + 0.5, y) for x, y in zip(x, y)]]
+    with pytest.raises(AssertionError, match="failed at bounds"):
+        poly_geo_plot.assert_polygons(poly_list, dec=1)
+    plt.close("all")
+
+
+def test_polygon_dec_noisy_start_vertex():
+    """Polygons within the decimal precision should pass even when the noise
+    changes which vertex is smallest"""
+    square = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)])
+    _, ax = plt.subplots()
+    gpd.GeoDataFrame(geometry=[square]).plot(ax=ax)
+    noisy = [(0, 0), (10, 0), (10, 10), (-1e-9, 10), (0, 0)]
+    VectorTester(ax).assert_polygons([noisy], dec=6)
+    plt.close("all")
+
+
+def test_polygon_dec_same_first_vertex():
+    """Polygons sharing their first vertex and size should pass in any order
+    when compared to a decimal precision"""
+    triangles = [
+        Polygon([(0, 0), (2, 0), (1, 1)]),
+        Polygon([(0, 0), (1, 1), (0, 2)]),
+    ]
+    _, ax = plt.subplots()
+    gpd.GeoDataFrame(geometry=triangles[::-1]).plot(ax=ax)
+    gdf = gpd.GeoDataFrame(geometry=triangles)
+    VectorTester(ax).assert_polygons(gdf)
+    VectorTester(ax).assert_polygons(gdf, dec=6)
+    plt.close("all")
@@ -4,7 +4,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib
+import unittest
+import rasterio
+from affine import Affine
 from matplotcheck.raster import RasterTester
+from matplotcheck.cases import PlotRasterSuite
 
 
 @pytest.fixture
@@ -329,3 +333,371 @@ def test_get_plot_images(raster_plt_rgb):
     """get_plot_image should get correct image from ax object"""
     ax_im = raster_plt_rgb.get_plot_image()
     raster_plt_rgb.assert_image(ax_im)
+
+
+def test_get_plot_image_is_readonly_view(raster_plt, np_ar):
+    """Test that get_plot_image returns a read-only view of the image data"""
+    im_data = raster_plt.get_plot_image()
+    assert np.shares_memory(im_data, raster_plt.ax.get_images()[0].get_array())
+    assert not im_data.flags.writeable
+    plt.close()
+
+
+""" MESH TESTS """
+
+
+@pytest.fixture
+def raster_plt_mesh(np_ar):
+    """Create raster plot drawn with pcolormesh for testing"""
+    fig, ax = plt.subplots()
+    mesh = ax.pcolormesh(np.arange(101), np.arange(101), np_ar)
+    fig.colorbar(mesh)
+
+    return RasterTester(ax)
+
+
+def test_mesh_get_plot_image(raster_plt_mesh, np_ar):
+    """get_plot_image should return the data of a pcolormesh plot"""
+    im_data = raster_plt_mesh.get_plot_image()
+    assert im_data.shape == np_ar.shape
+    assert not im_data.flags.writeable
+    raster_plt_mesh.assert_image(np_ar)
+    plt.close()
+
+
+def test_mesh_assert_colorbar_range(raster_plt_mesh, np_ar):
+    """Colorbars drawn for a mesh should be found"""
+    raster_plt_mesh.assert_colorbar_range((np_ar.min(), np_ar.max()))
+    norm = raster_plt_mesh.get_raster_norm()
+    assert (norm.vmin, norm.vmax) == (np_ar.min(), np_ar.max())
+    plt.close()
+
+
+def test_mesh_assert_image_fullscreen(raster_plt_mesh):
+    """assert_image_full_screen should pass for a mesh filling the axes and
+    fail when the x limits are changed"""
+    raster_plt_mesh.assert_image_full_screen()
+    raster_plt_mesh.ax.set_xlim((0, 200))
+    with pytest.raises(AssertionError, match="Image is stretched"):
+        raster_plt_mesh.assert_image_full_screen()
+    plt.close()
+
+
+def test_get_raster_coordinates(raster_plt_mesh, raster_plt):
+    """Mesh and image coordinates should hold the cell corners"""
+    coords = raster_plt_mesh.get_raster_coordinates()
+    assert coords.shape == (101, 101, 2)
+    np.testing.assert_equal(coords[0, :, 0], np.arange(101))
+    im_coords = raster_plt.get_raster_coordinates()
+    assert im_coords.shape == (101, 101, 2)
+    np.testing.assert_equal(im_coords[0, 0], [-0.5, -0.5])
+    np.testing.assert_equal(im_coords[-1, -1], [99.5, 99.5])
+    plt.close("all")
+
+
+""" RGB TESTS """
+
+
+def test_assert_image_rgb_float_plot(np_ar_rgb):
+    """An RGB image plotted as floats should match the same uint8 image"""
+    fig, ax = plt.subplots()
+    ax.imshow(np_ar_rgb / 255.0)
+    RasterTester(ax).assert_image(np_ar_rgb.astype(np.uint8))
+    plt.close()
+
+
+def test_assert_image_rgb_channel_tolerance(raster_plt_rgb, np_ar_rgb):
+    """Per-channel tolerances should allow small changes in one channel"""
+    changed = np.clip(np_ar_rgb, 0, 250)
+    changed[:, :, 2] += 3
+    with pytest.raises(AssertionError, match="Arrays are not equal"):
+        raster_plt_rgb.assert_image_rgb(changed, atol=[5, 5, 0])
+    raster_plt_rgb.assert_image_rgb(changed, atol=[5, 5, 5], chunksize=7)
+    plt.close()
+
+
+def test_assert_image_rgb_fractional_tolerance(raster_plt_rgb, np_ar_rgb):
+    """Tolerances between uint8 levels should raise rather than be
+    truncated"""
+    with pytest.raises(ValueError, match="atol must be a whole number"):
+        raster_plt_rgb.assert_image_rgb(np_ar_rgb, atol=0.5)
+    with pytest.raises(ValueError, match="atol must be a whole number"):
+        raster_plt_rgb.get_rgb_mismatch(np_ar_rgb, atol=[1, 1, 2.5])
+    raster_plt_rgb.assert_image_rgb(np_ar_rgb, atol=[1.0, 1.0, 2.0])
+    plt.close()
+
+
+def test_get_rgb_mismatch(raster_plt_rgb, np_ar_rgb):
+    """get_rgb_mismatch should report the fraction of changed pixels"""
+    changed = np_ar_rgb.copy()
+    changed[:10] = 255 - changed[:10]
+    assert raster_plt_rgb.get_rgb_mismatch(changed, chunksize=3) == 0.1
+    raster_plt_rgb.assert_image_rgb(changed, max_mismatch=0.1)
+    plt.close()
+
+
+""" MASK TESTS """
+
+
+@pytest.fixture
+def np_ar_masked(np_ar):
+    """Create masked numpy array with a masked corner for testing"""
+    data = np_ar.copy()
+    data[:10, :13] = -9999
+    return np.ma.masked_equal(data, -9999)
+
+
+@pytest.fixture
+def raster_plt_masked(np_ar_masked):
+    """Create raster plot of a masked array for testing"""
+    fig, ax = plt.subplots()
+    ax.imshow(np_ar_masked)
+    return RasterTester(ax)
+
+
+def test_assert_image_mask(raster_plt_masked, np_ar_masked):
+    """assert_image_mask should pass with the expected masked array, boolean
+    mask or nodata value, with a chunk size not dividing the rows"""
+    raster_plt_masked.assert_image_mask(np_ar_masked, chunksize=7)
+    raster_plt_masked.assert_image_mask(np.ma.getmaskarray(np_ar_masked))
+    raster_plt_masked.assert_image_mask(
+        np_ar_masked.filled(-9999), nodata=-9999
+    )
+    plt.close()
+
+
+def test_assert_image_mask_nan(np_ar):
+    """NaN values are masked when plotted and should match a NaN nodata"""
+    data = np_ar.copy()
+    data[5, :] = np.nan
+    fig, ax = plt.subplots()
+    ax.imshow(data)
+    RasterTester(ax).assert_image_mask(data, nodata=np.nan)
+    plt.close()
+
+
+def test_assert_image_mask_fails(raster_plt, np_ar_masked):
+    """assert_image_mask should fail and count the pixels when the plotted
+    image is not masked"""
+    assert raster_plt.get_mask_mismatch(np_ar_masked) == 130
+    with pytest.raises(AssertionError, match="130 of 10000 pixels differ"):
+        raster_plt.assert_image_mask(np_ar_masked)
+    plt.close()
+
+
+def test_raster_suite_image_mask(raster_plt_masked, np_ar_masked):
+    """The mask test of PlotRasterSuite should run for a masked image and
+    fail when the mask differs"""
+    for expected, ok in [(np_ar_masked, True), (np_ar_masked[::-1], False)]:
+        suite = PlotRasterSuite(
+            raster_plt_masked.ax,
+            im_expected=expected,
+            caption_strings=None,
+            im_classified=False,
+        )
+        result = unittest.TestResult()
+        suite.RasterCase("test_image_mask").run(result)
+        assert result.testsRun == 1 and not result.skipped
+        assert result.wasSuccessful() == ok
+    plt.close()
+
+
+""" COLORMAP INVERSION TESTS """
+
+
+def test_get_image_values_classes(np_ar_discrete):
+    """An image colored before plotting should be turned back into its
+    classes"""
+    cmap = plt.get_cmap("tab10")
+    fig, ax = plt.subplots()
+    ax.imshow(cmap(np_ar_discrete))
+    values = RasterTester(ax).get_image_values(
+        cmap=cmap, norm=plt.Normalize(0, 9), values=np.arange(4)
+    )
+    assert not np.ma.is_masked(values)
+    np.testing.assert_equal(values, np_ar_discrete)
+    plt.close()
+
+
+def test_get_image_values_continuous(np_ar):
+    """A continuous colormap should be inverted to the nearest color, within
+    the resolution of its 256 colors"""
+    fig, ax = plt.subplots()
+    ax.imshow(plt.get_cmap("viridis")(np_ar))
+    values = RasterTester(ax).get_image_values(cmap="viridis")
+    np.testing.assert_allclose(values, np_ar, atol=2.0 / 255)
+    plt.close()
+
+
+def test_get_image_values_scalar_image(raster_plt, np_ar):
+    """An image of values should be returned as it is"""
+    np.testing.assert_equal(raster_plt.get_image_values(), np_ar)
+    plt.close()
+
+
+def test_assert_legend_accuracy_rgb(np_ar_discrete):
+    """The legend check should also work with a pre-colored image"""
+    cmap = plt.get_cmap("tab10")
+    fig, ax = plt.subplots()
+    ax.imshow(cmap(np_ar_discrete))
+    values = np.unique(np_ar_discrete)
+    patches = [
+        mpatches.Patch(color=cmap(val), label="Level {0}".format(val))
+        for val in values
+    ]
+    ax.legend(handles=patches)
+    RasterTester(ax).assert_legend_accuracy_classified_image(
+        np_ar_discrete, [[str(val)] for val in values]
+    )
+    plt.close()
+
+
+"""DOWNSAMPLED IMAGE TESTS"""
+
+
+@pytest.fixture
+def np_ar_large():
+    """Create a larger numpy array to be plotted at lower resolution"""
+    return np.random.rand(101, 60)
+
+
+def test_assert_image_downsampled_nearest(np_ar_large):
+    """An image decimated with a step should match its full data"""
+    fig, ax = plt.subplots()
+    ax.imshow(np_ar_large[::4, ::3])
+    rt = RasterTester(ax)
+    assert rt.get_downsample_factors(np_ar_large) == (4, 3)
+    rt.assert_image_downsampled(np_ar_large, chunksize=5)
+    plt.close()
+
+
+def test_assert_image_downsampled_mean(np_ar_large):
+    """An image of block means should match its full data, dropping the
+    incomplete blocks at the edges"""
+    coarse = np_ar_large[:100].reshape(25, 4, 20, 3).mean(axis=(1, 3))
+    fig, ax = plt.subplots()
+    ax.imshow(coarse)
+    rt = RasterTester(ax)
+    rt.assert_image_downsampled(np_ar_large, how="mean", chunksize=7)
+    with pytest.raises(AssertionError, match="Incorrect Image Displayed"):
+        rt.assert_image_downsampled(np_ar_large + 1, how="mean")
+    plt.close()
+
+
+def test_assert_image_downsampled_mode():
+    """Blocks of a classified image should be reduced to their most common
+    class, with ties going to the smallest class"""
+    classes = np.array(
+        [[1, 1, 2, 3], [1, 2, 3, 3], [4, 4, 2, 2], [5, 5, 3, 3]]
+    )
+    fig, ax = plt.subplots()
+    ax.imshow(np.array([[1, 3], [4, 2]]))
+    RasterTester(ax).assert_image_downsampled(classes, how="mode")
+    plt.close()
+
+
+def test_assert_image_downsampled_rgb(np_ar_rgb):
+    """Each band of an RGB image should be downsampled"""
+    fig, ax = plt.subplots()
+    ax.imshow(np_ar_rgb[::5, ::5])
+    RasterTester(ax).assert_image_downsampled(np_ar_rgb)
+    plt.close()
+
+
+def test_assert_image_downsampled_bad_size(raster_plt, np_ar_large):
+    """Image sizes that are not an integer downsampling should fail"""
+    with pytest.raises(AssertionError, match="Incorrect Image Size"):
+        raster_plt.assert_image_downsampled(np_ar_large, how="mean")
+    with pytest.raises(ValueError, match="how must be one of"):
+        raster_plt.assert_image_downsampled(np_ar_large, how="max")
+    plt.close()
+
+
+"""RASTER FILE TESTS"""
+
+
+@pytest.fixture
+def np_ar_tif(tmp_path):
+    """Write an array to a GeoTIFF with 1 unit cells, whose top left corner
+    is at (0, 100). Returns the array and the file path."""
+    arr = np.arange(100 * 80, dtype="float32").reshape(100, 80)
+    arr[0, 0] = -1
+    path = str(tmp_path / "expected.tif")
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        height=100,
+        width=80,
+        count=1,
+        dtype="float32",
+        transform=Affine(1.0, 0.0, 0.0, 0.0, -1.0, 100.0),
+        nodata=-1,
+    ) as dst:
+        dst.write(arr, 1)
+    return arr, path
+
+
+def test_assert_image_file(np_ar_tif):
+    """A plotted GeoTIFF should match its file, read in strips"""
+    arr, path = np_ar_tif
+    fig, ax = plt.subplots()
+    ax.imshow(arr, extent=(0, 80, 0, 100))
+    rt = RasterTester(ax)
+    rt.assert_image(path)
+    rt.assert_image_file(path, chunksize=7)
+    plt.close()
+
+
+def test_assert_image_file_wrong_data(np_ar_tif):
+    """A plot of other data should fail"""
+    arr, path = np_ar_tif
+    fig, ax = plt.subplots()
+    ax.imshow(arr + 1, extent=(0, 80, 0, 100))
+    with pytest.raises(AssertionError, match="Incorrect Image Displayed"):
+        RasterTester(ax).assert_image(path)
+    plt.close()
+
+
+def test_assert_image_file_window(np_ar_tif):
+    """Only the window of the file within the plotted extent should be
+    compared, also when the image is drawn upside down"""
+    arr, path = np_ar_tif
+    fig, ax = plt.subplots()
+    ax.imshow(arr[20:50, 10:50][::-1], origin="lower", extent=(10, 50, 50, 80))
+    with rasterio.open(path) as src:
+        RasterTester(ax).assert_image_file(src, chunksize=4)
+        assert not src.closed
+    plt.close()
+
+
+def test_assert_image_file_resampled(np_ar_tif):
+    """A coarser image should be compared with the file resampled to its
+    resolution"""
+    arr, path = np_ar_tif
+    fig, ax = plt.subplots()
+    ax.imshow(arr[1::2, 1::2], extent=(0, 80, 0, 100))
+    rt = RasterTester(ax)
+    rt.assert_image_file(path)
+    with pytest.raises(AssertionError, match="Incorrect Image Displayed"):
+        rt.assert_image_file(path, resampling="average")
+    plt.close()
+
+
+def test_assert_image_rgb_float_out_of_range():
+    """Float RGB values above 1 should not be clipped into a match"""
+    fig, ax = plt.subplots()
+    ax.imshow(np.ones((5, 5, 3)))
+    with pytest.raises(AssertionError, match="Arrays are not equal"):
+        RasterTester(ax).assert_image(np.full((5, 5, 3), 2.0))
+    plt.close()
+
+
+def test_assert_image_rgb_int_out_of_range():
+    """Integer RGB values above 255 should not be clipped into a match"""
+    fig, ax = plt.subplots()
+    ax.imshow(np.full((5, 5, 3), 255))
+    with pytest.raises(AssertionError, match="Arrays are not equal"):
+        RasterTester(ax).assert_image(np.full((5, 5, 3), 300))
+    RasterTester(ax).assert_image(np.full((5, 5, 3), 255, dtype=np.uint8))
+    plt.close()
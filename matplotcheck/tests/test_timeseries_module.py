@@ -1,8 +1,9 @@
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 import numpy as np
 import pandas as pd
 import pytest
-from matplotcheck.timeseries import TimeSeriesTester
+from matplotcheck.timeseries import TimeSeriesTester, _shift_dates
 
 
 @pytest.fixture
@@ -73,3 +74,197 @@ def test_assert_xydata_timeseries_roundoff_error(pt_time_line_plt):
     data.loc[0, "x"] = data.loc[0, "x"] + 0.00000000001
 
     pt_time_line_plt.assert_xydata(data, xcol="x", ycol="y")
+
+
+def test_assert_xticks_reformatted_month(pd_df_timeseries):
+    """Tests that assert_xticks_reformatted() checks the tick format against
+    the current Matplotlib date epoch"""
+    fig, ax = plt.subplots()
+    ax.plot(pd_df_timeseries["time"], pd_df_timeseries["A"])
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%b"))
+    tester = TimeSeriesTester(ax)
+    tester.assert_xticks_reformatted(loc_exp="month")
+    with pytest.raises(AssertionError, match="x ticks have not been"):
+        tester.assert_xticks_reformatted(loc_exp="year")
+    plt.close()
+
+
+@pytest.fixture
+def pt_time_mpl_plt(pd_df_timeseries):
+    """Create timeseries line plot with Matplotlib date numbers on x"""
+    fig, ax = plt.subplots()
+    ax.plot(pd_df_timeseries["time"], pd_df_timeseries["A"])
+    ax.xaxis.set_major_locator(mdates.MonthLocator())
+    return TimeSeriesTester(ax)
+
+
+def test_assert_xdata_date(pt_time_mpl_plt, pd_df_timeseries):
+    """Tests that assert_xdata_date() passes with the plotted dates in any
+    order"""
+    pt_time_mpl_plt.assert_xdata_date(pd_df_timeseries["time"][::-1])
+    plt.close()
+
+
+def test_assert_xdata_date_fails(pt_time_mpl_plt, pd_df_timeseries):
+    """Tests that assert_xdata_date() fails when one date is off by a day"""
+    x_exp = pd_df_timeseries["time"].copy()
+    x_exp.iloc[0] -= pd.Timedelta(days=1)
+    with pytest.raises(AssertionError, match="not in appropriate date"):
+        pt_time_mpl_plt.assert_xdata_date(x_exp)
+    plt.close()
+
+
+def test_assert_xticks_locs_month(pt_time_mpl_plt):
+    """Tests that assert_xticks_locs() passes with monthly ticks"""
+    pt_time_mpl_plt.assert_xticks_locs(loc_exp="month")
+    with pytest.raises(AssertionError):
+        pt_time_mpl_plt.assert_xticks_locs(loc_exp="week")
+    plt.close()
+
+
+def test_shift_dates_end_of_month():
+    """Tests that month steps use the last day of shorter months"""
+    start = np.datetime64("2019-01-31T12:00")
+    shifted = _shift_dates(start, "month", np.arange(3))
+    assert list(shifted.astype("datetime64[D]").astype(str)) == [
+        "2019-01-31",
+        "2019-02-28",
+        "2019-03-31",
+    ]
+
+
+def test_assert_xticks_locs_hour():
+    """Tests that assert_xticks_locs() checks hourly ticks"""
+    fig, ax = plt.subplots()
+    times = pd.date_range("2020-01-01", periods=48, freq="H")
+    ax.plot(times, np.arange(48))
+    ax.xaxis.set_major_locator(mdates.HourLocator())
+    TimeSeriesTester(ax).assert_xticks_locs(loc_exp="hour")
+    plt.close()
+
+
+def test_assert_xticks_locs_minor(pt_time_mpl_plt):
+    """Tests that minor ticks are expected everywhere but on major ticks"""
+    pt_time_mpl_plt.ax.xaxis.set_minor_locator(mdates.DayLocator())
+    pt_time_mpl_plt.assert_xticks_locs(tick_size="small", loc_exp="day")
+    plt.close()
+
+
+def test_assert_xticks_locs_timezone():
+    """Tests that calendar steps are counted in the timezone of the ticks,
+    which are not evenly spaced in UTC across a daylight saving change"""
+    fig, ax = plt.subplots()
+    times = pd.date_range("2018-01-01", periods=180, freq="D")
+    ax.plot(times, np.arange(180))
+    ax.xaxis.set_major_locator(mdates.MonthLocator(tz="US/Mountain"))
+    tester = TimeSeriesTester(ax)
+    tester.assert_xticks_locs(loc_exp="month", tz="US/Mountain")
+    with pytest.raises(AssertionError, match="Incorrect X axis tick"):
+        tester.assert_xticks_locs(loc_exp="month")
+    plt.close()
+
+
+def test_assert_no_data_value(pt_time_mpl_plt):
+    """Tests that assert_no_data_value() passes on clean data"""
+    pt_time_mpl_plt.assert_no_data_value(nodata=[-9999, 999.99])
+    plt.close()
+
+
+def test_assert_no_data_value_fails(pd_df_timeseries):
+    """Tests that assert_no_data_value() fails when any of several nodata
+    values is plotted"""
+    fig, ax = plt.subplots()
+    values = pd_df_timeseries["A"].astype(float)
+    values.iloc[[3, 7]] = -9999
+    ax.plot(pd_df_timeseries["time"], values)
+    with pytest.raises(AssertionError, match="Values of -9999.0 have been"):
+        TimeSeriesTester(ax).assert_no_data_value(nodata=[-9999, 999.99])
+    plt.close()
+
+
+def test_assert_no_data_value_nonfinite(pd_df_timeseries):
+    """Tests that NaN values only fail assert_no_data_value() when
+    nonfinite is set"""
+    fig, ax = plt.subplots()
+    values = pd_df_timeseries["A"].astype(float)
+    values.iloc[3] = np.nan
+    ax.plot(pd_df_timeseries["time"], values)
+    tester = TimeSeriesTester(ax)
+    tester.assert_no_data_value()
+    with pytest.raises(AssertionError, match="Values of nan have been"):
+        tester.assert_no_data_value(nonfinite=True)
+    plt.close()
+
+
+@pytest.fixture
+def pd_df_hourly():
+    """Create a pandas dataframe with three days of hourly data"""
+    return pd.DataFrame(
+        {
+            "time": pd.date_range(start="1/1/2018", periods=72, freq="H"),
+            "A": np.arange(72, dtype=float),
+        }
+    )
+
+
+def test_assert_xydata_binned_resampled(pd_df_hourly):
+    """Tests that a plot of daily means passes against the hourly data"""
+    fig, ax = plt.subplots()
+    daily = pd_df_hourly.resample("D", on="time").mean().reset_index()
+    ax.plot(daily["time"], daily["A"])
+    TimeSeriesTester(ax).assert_xydata_binned(
+        pd_df_hourly, "time", "A", freq="day"
+    )
+    plt.close()
+
+
+@pytest.mark.parametrize(
+    "how, values", [("max", [23, 47, 71]), ("min", [0, 24, 48])]
+)
+def test_assert_xydata_binned_max_min(pd_df_hourly, how, values):
+    """Tests that a plot of daily maxima or minima passes against the
+    hourly data, and fails when a daily value is slightly off"""
+    days = pd.date_range(start="1/1/2018", periods=3, freq="D")
+    fig, ax = plt.subplots()
+    ax.plot(days, values)
+    tester = TimeSeriesTester(ax)
+    tester.assert_xydata_binned(pd_df_hourly, "time", "A", how=how)
+    with pytest.raises(AssertionError, match="Incorrect data values at day"):
+        tester.assert_xydata_binned(pd_df_hourly, "time", "A", how="mean")
+    plt.close()
+
+    fig, ax = plt.subplots()
+    ax.plot(days, np.array(values) + [0, 0.01, 0])
+    with pytest.raises(AssertionError, match="Incorrect data values at day"):
+        TimeSeriesTester(ax).assert_xydata_binned(
+            pd_df_hourly, "time", "A", how=how, tolerance=0.001
+        )
+    plt.close()
+
+
+def test_assert_xydata_binned_chunks(pd_df_hourly):
+    """Tests that the raw plot passes when read in small blocks"""
+    fig, ax = plt.subplots()
+    ax.plot(pd_df_hourly["time"], pd_df_hourly["A"])
+    TimeSeriesTester(ax).assert_xydata_binned(
+        pd_df_hourly, "time", "A", freq="hour", how="min", chunksize=10
+    )
+    plt.close()
+
+
+def test_assert_xydata_binned_fails(pd_df_hourly):
+    """Tests that assert_xydata_binned fails with wrong values"""
+    fig, ax = plt.subplots()
+    ax.plot(pd_df_hourly["time"], pd_df_hourly["A"] + 1)
+    with pytest.raises(AssertionError, match="Incorrect data values at day"):
+        TimeSeriesTester(ax).assert_xydata_binned(pd_df_hourly, "time", "A")
+    plt.close()
+
+
+def test_assert_xydata_binned_missing_bin(pd_df_hourly):
+    """Tests that assert_xydata_binned fails when a day is not plotted"""
+    fig, ax = plt.subplots()
+    ax.plot(pd_df_hourly["time"][:48], pd_df_hourly["A"][:48])
+    with pytest.raises(AssertionError, match="does not cover the same days"):
+        TimeSeriesTester(ax).assert_xydata_binned(pd_df_hourly, "time", "A")
+    plt.close()
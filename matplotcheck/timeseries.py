@@ -1,11 +1,206 @@
 import numpy as np
+import pandas as pd
 import matplotlib.dates as mdates
-from dateutil.relativedelta import relativedelta
-import math
+from datetime import datetime
 
 from .base import PlotTester
 
 
+def _to_datetime64(values, unit="ns"):
+    """Converts dates to a numpy datetime64 array in one vectorized step.
+
+    Parameters
+    ----------
+    values : array-like
+        Either Matplotlib date numbers (floats counting days since the
+        Matplotlib date epoch, as stored on a plot) or datetimes (python,
+        numpy or pandas, timezone aware or not).
+    unit : string
+        numpy datetime unit of the result, e.g. ``'D'`` for days or ``'ns'``
+        for nanoseconds. Dates are floored to this unit.
+
+    Returns
+    -------
+    dates : numpy.ndarray
+        Array of dtype ``datetime64[unit]``. Timezone aware datetimes are
+        converted to UTC.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiu":
+        # Date numbers are rounded to the microsecond like num2date does
+        epoch = np.datetime64(mdates.get_epoch(), "us")
+        usecs = np.round(arr.astype(np.float64) * 86400e6)
+        dates = epoch + usecs.astype(np.int64).astype("timedelta64[us]")
+    else:
+        dates = pd.DatetimeIndex(pd.to_datetime(values))
+        if dates.tz is not None:
+            dates = dates.tz_convert(None)
+        dates = dates.to_numpy()
+    return dates.astype("datetime64[{0}]".format(unit))
+
+
+def _same_values(a, b):
+    """Returns True if `a` and `b` hold the same values the same number of
+    times, in any order. Values are counted in hash tables, so neither
+    array is sorted."""
+    if len(a) != len(b):
+        return False
+    counts_a = pd.Series(a).value_counts(sort=False)
+    counts_b = pd.Series(b).value_counts(sort=False)
+    return len(counts_a) == len(counts_b) and bool(
+        counts_a.reindex(counts_b.index).eq(counts_b).all()
+    )
+
+
+# Number of months, or fixed length, of one step of each tick frequency
+_TICK_STEPS = {
+    "decade": (120, None),
+    "year": (12, None),
+    "month": (1, None),
+    "week": (0, np.timedelta64(7, "D")),
+    "day": (0, np.timedelta64(1, "D")),
+    "hour": (0, np.timedelta64(1, "h")),
+    "minute": (0, np.timedelta64(1, "m")),
+    "second": (0, np.timedelta64(1, "s")),
+}
+
+
+def _shift_dates(start, loc_exp, n):
+    """Returns `start` moved by each number of steps in `n`, where a step is
+    one unit of the tick frequency `loc_exp` (a key of ``_TICK_STEPS``).
+
+    Steps of months and years keep the day of the month and time of day of
+    `start`, using the last day of the month when a month is too short, so
+    Jan 31 plus one month is Feb 28 (or 29).
+
+    Parameters
+    ----------
+    start : numpy.datetime64
+        Date to start from.
+    loc_exp : string
+        Tick frequency.
+    n : int or numpy.ndarray of ints
+        Numbers of steps, may be negative.
+
+    Returns
+    -------
+    dates : numpy.datetime64 or numpy.ndarray of dtype datetime64[ns]
+    """
+    start = np.datetime64(start, "ns")
+    n = np.asarray(n, dtype=np.int64)
+    months, step = _TICK_STEPS[loc_exp]
+    if step is not None:
+        return start + n * step.astype("timedelta64[ns]")
+    start_day = start.astype("datetime64[D]")
+    start_month = start.astype("datetime64[M]")
+    month = start_month + n * months
+    first_day = month.astype("datetime64[D]")
+    days_in_month = (month + 1).astype("datetime64[D]") - first_day
+    day = np.minimum(
+        start_day - start_month.astype("datetime64[D]"),
+        days_in_month - np.timedelta64(1, "D"),
+    )
+    return (first_day + day).astype("datetime64[ns]") + (start - start_day)
+
+
+def _tick_range(start, end, loc_exp):
+    """Returns every date from `start` up to and including `end`, one step
+    of the tick frequency `loc_exp` apart, as a datetime64[ns] array built
+    without a Python loop over the dates."""
+    start, end = np.datetime64(start, "ns"), np.datetime64(end, "ns")
+    months, step = _TICK_STEPS[loc_exp]
+    if step is not None:
+        count = (end - start) // step.astype("timedelta64[ns]") + 1
+    else:
+        span = end.astype("datetime64[M]") - start.astype("datetime64[M]")
+        count = span.astype(np.int64) // months + 1
+    dates = _shift_dates(start, loc_exp, np.arange(max(count, 0)))
+    return dates[dates <= end]
+
+
+def _to_wall_time(dates, tz):
+    """Converts UTC datetime64 values to the local time of timezone `tz`,
+    dropping the timezone again. Returns `dates` unchanged if `tz` is
+    ``None``."""
+    if tz is None:
+        return dates
+    return (
+        pd.DatetimeIndex(dates)
+        .tz_localize("UTC")
+        .tz_convert(tz)
+        .tz_localize(None)
+        .to_numpy()
+    )
+
+
+def _from_wall_time(dates, tz):
+    """Inverse of ``_to_wall_time()``. Local times that do not exist or are
+    ambiguous because of daylight saving time changes are dropped."""
+    if tz is None:
+        return dates
+    dates = (
+        pd.DatetimeIndex(dates)
+        .tz_localize(tz, ambiguous="NaT", nonexistent="NaT")
+        .tz_convert(None)
+        .to_numpy()
+    )
+    return dates[~np.isnat(dates)]
+
+
+# numpy datetime unit of each bin size of assert_xydata_binned
+_BIN_UNITS = {
+    "year": "Y",
+    "month": "M",
+    "week": "W",
+    "day": "D",
+    "hour": "h",
+    "minute": "m",
+    "second": "s",
+}
+
+
+def _bin_ids(x, freq):
+    """Returns the number of the `freq` bin (a key of ``_BIN_UNITS``) that
+    each date in `x` falls in, counted from the Unix epoch."""
+    return _to_datetime64(x, unit=_BIN_UNITS[freq]).view(np.int64)
+
+
+def _accumulate_bins(state, idx, y):
+    """Adds the values `y` falling in bins `idx` to the running bin
+    statistics in `state`, a dict made by ``TimeSeriesTester`` with the
+    aggregation ``'how'``, and arrays ``'count'`` and ``'value'``."""
+    n = len(state["count"])
+    state["count"] += np.bincount(idx, minlength=n)
+    if state["how"] in ["mean", "sum"]:
+        state["value"] += np.bincount(idx, weights=y, minlength=n)
+    elif state["how"] == "min":
+        np.minimum.at(state["value"], idx, y)
+    else:
+        np.maximum.at(state["value"], idx, y)
+
+
+def _new_bins(n, how):
+    """Returns empty running bin statistics for ``_accumulate_bins()``."""
+    if how not in ["mean", "sum", "min", "max"]:
+        raise ValueError(
+            'how must be one of the following ["mean", "sum", "min", "max"]'
+        )
+    start = {"mean": 0.0, "sum": 0.0, "min": np.inf, "max": -np.inf}[how]
+    return {
+        "how": how,
+        "count": np.zeros(n, dtype=np.int64),
+        "value": np.full(n, start),
+    }
+
+
+def _finish_bins(state):
+    """Returns the aggregated value of each bin in `state`."""
+    if state["how"] == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return state["value"] / state["count"]
+    return state["value"]
+
+
 class TimeSeriesTester(PlotTester):
     """A PlotTester for 2 dimensional time series plots.
 
@@ -46,20 +241,22 @@ class TimeSeriesTester(PlotTester):
             string error message if assertion is not met
         """
         if loc_exp:
+            # The date number of a date depends on the Matplotlib date epoch
+            probe = mdates.date2num(datetime(2013, 9, 30))
             if tick_size == "large":
                 test_date = (
                     self.ax.xaxis.get_major_formatter()
-                    .format_data(735141)
+                    .format_data(probe)
                     .replace(" ", "")
                     .lower()
-                )  # September 30, 2013
+                )
             elif tick_size == "small":
                 test_date = (
                     self.ax.xaxis.get_minor_formatter()
-                    .format_data(735141)
+                    .format_data(probe)
                     .replace(" ", "")
                     .lower()
-                )  # September 30, 2013
+                )
             else:
                 raise ValueError(
                     "tick_size must be on of the following string "
@@ -83,28 +280,39 @@ class TimeSeriesTester(PlotTester):
         tick_size="large",
         loc_exp=None,
         m="Incorrect X axis tick locations",
+        tz=None,
     ):
         """Asserts that Axes ax has xaxis ticks as noted by tick_size and
         loc_exp
 
+        The ticks must cover the x axis and be evenly spaced in calendar
+        steps of `loc_exp`, starting at the first tick. Minor ticks that fall
+        on a major tick are not shown by Matplotlib and are not expected.
+
         Parameters
         ----------
         tick_size: str, opts: ['large','small']
             'large': if testing large ticks
             'small': if testing small ticks
-        loc_exp: string ['decade','year', 'month', 'week', 'day']
+        loc_exp: string ['decade','year', 'month', 'week', 'day', 'hour',
+            'minute', 'second']
             'decade': if tick should be shown every ten years
             'year': if tick should be shown every new year
             'month': if tick should be shown every new month
             'week': if tick should be shown every new week
             'day': if tick should be shown every new day
+            'hour', 'minute', 'second': if tick should be shown every new
+            hour, minute or second
             None: if no tick location has been specified. This will
             automatically assert True
         m: error message if assertion is not met
+        tz: string or tzinfo (Optional)
+            Timezone the ticks are placed in, e.g. ``'US/Mountain'``. Calendar
+            steps are counted in local time of `tz`. If ``None``, ticks are
+            expected in UTC.
         """
 
         if loc_exp:
-            xlims = [mdates.num2date(limit) for limit in self.ax.get_xlim()]
             if tick_size == "large":
                 ticks = self.ax.xaxis.get_majorticklocs()
             elif tick_size == "small":
@@ -114,81 +322,192 @@ class TimeSeriesTester(PlotTester):
                     """"Tick_size must be one of the following strings
                     ['large', 'small']"""
                 )
-
-            if loc_exp == "decade":
-                inc = relativedelta(years=10)
-            elif loc_exp == "year":
-                inc = relativedelta(years=1)
-            elif loc_exp == "month":
-                inc = relativedelta(months=1)
-            elif loc_exp == "week":
-                inc = relativedelta(days=7)
-            elif loc_exp == "day":
-                inc = relativedelta(days=1)
-            else:
+            if loc_exp not in _TICK_STEPS:
                 raise ValueError(
                     """"loc_exp must be one of the following strings ['decade',
-                    'year', 'month', 'week', 'day'] or None"""
+                    'year', 'month', 'week', 'day', 'hour', 'minute',
+                    'second'] or None"""
                 )
+            assert len(ticks), "Tick locators do not cover x axis"
 
-            start, end = mdates.num2date(ticks[0]), mdates.num2date(ticks[-1])
-            assert start < xlims[0] + inc, "Tick locators do not cover x axis"
-            assert end > xlims[1] - inc, "Tick locators do not cover x axis"
-            ticks_exp = [
-                d.toordinal() for d in self._my_range(start, end, inc)
-            ]
-            np.testing.assert_equal(ticks, ticks_exp, m)
+            xlims = _to_wall_time(_to_datetime64(self.ax.get_xlim()), tz)
+            start, end = _to_wall_time(_to_datetime64(ticks[[0, -1]]), tz)
+            assert start < _shift_dates(
+                xlims[0], loc_exp, 1
+            ), "Tick locators do not cover x axis"
+            assert end > _shift_dates(
+                xlims[1], loc_exp, -1
+            ), "Tick locators do not cover x axis"
 
-    def _my_range(self, start, end, step):
-        """helper function for assert_xticks_locs
-        alternative to range to use in a for loop. my_range allows for dataype
-        other than ints. both start and end are included in the loop.
+            ticks_exp = _from_wall_time(
+                _tick_range(start, end, loc_exp), tz
+            ).astype("datetime64[us]")
+            if tick_size == "small":
+                major = _to_datetime64(
+                    self.ax.xaxis.get_majorticklocs(), unit="us"
+                )
+                ticks_exp = ticks_exp[~np.isin(ticks_exp, major)]
+            np.testing.assert_equal(
+                _to_datetime64(ticks, unit="us"), ticks_exp, m
+            )
 
-        Parameters
-        ----------
-        start: value to start while loop at
-        end: last value to run in while loop
-        step: about to increase between cycles in loop
-              start, end, and step must be comparable datatypes.
-        """
-        while start <= end:
-            yield start
-            start += step
+    def assert_no_data_value(
+        self, nodata=999.99, valid_range=None, nonfinite=False
+    ):
+        """Asserts nodata values have been removed from the data on the plot
 
-    def assert_no_data_value(self, nodata=999.99):
-        """Asserts nodata values have been removed from the data, when x is a
-        datetime with error message m
+        Every plotted array is scanned once, see ``find_nodata()``.
 
         Parameters
         ----------
-        nodata: float or int
-            a nodata value that will be searched for in dataset
-        xtime: boolean
-            does the x-axis contains datetime values?
+        nodata: float or int, or list of floats or ints
+            nodata values that will be searched for in dataset
+        valid_range: tuple of (min, max) (Optional)
+            y values (and image values) outside of this range also fail the
+            assertion.
+        nonfinite: boolean
+            Set ``True`` to also fail the assertion if NaN or infinite values
+            are plotted.
         """
-        if nodata:
-            xy = self.get_xy(xtime=False)
-            assert ~np.isin(nodata, xy["x"]), (
-                "Values of {0} have been found in data. Be sure to remove no "
-                "data values"
-            ).format(nodata)
-            assert ~np.isin(nodata, xy["y"]), (
-                "Values of {0} have been found in data. Be sure to remove no "
-                "data values"
-            ).format(nodata)
+        if nodata is None:
+            nodata = []
+        found = []
+        for entry in self.find_nodata(nodata, valid_range=valid_range):
+            counts = entry["counts"]
+            if not nonfinite:
+                counts = {
+                    k: n for k, n in counts.items() if k not in ["nan", "inf"]
+                }
+            if counts:
+                artist = entry["artist"]
+                name = "bars" if isinstance(artist, list) else str(artist)
+                found.append((name, counts))
+
+        values = []
+        for _, counts in found:
+            values.extend(k for k in counts if k not in values)
+        assert not found, (
+            "Values of {0} have been found in data ({1}). Be sure to remove "
+            "no data values"
+        ).format(
+            ", ".join(str(v).replace("_", " ") for v in values),
+            ", ".join(
+                "{0} in {1}".format(sum(counts.values()), name)
+                for name, counts in found
+            ),
+        )
 
     def assert_xdata_date(
         self, x_exp, m="X-axis is not in appropriate date format"
     ):
         """Asserts x-axis data has been parsed into datetime objects.
         Matplotlib changes datetime to floats representing number of days since
-        day 0. If you are using dates prior to year 270, this assertion will
-        fail.
+        the Matplotlib date epoch. Both the plotted and the expected dates are
+        compared by day, in any order.
 
         Parameters
         ----------
         x_exp: expected x_axis values, must be in a datetime format
         """
-        x_data = [math.floor(d) for d in self.get_xy(xtime=False)["x"]]
-        x_exp = [d.toordinal() for d in x_exp]  # convert to days elapsed
-        assert np.array_equal(sorted(x_exp), sorted(x_data)), m
+        x_data = _to_datetime64(self.get_xy()["x"].to_numpy(), unit="D")
+        x_exp = _to_datetime64(x_exp, unit="D")
+        assert _same_values(x_exp, x_data), m
+
+    def assert_xydata_binned(
+        self,
+        xy_expected,
+        xcol,
+        ycol,
+        freq="day",
+        how="mean",
+        tolerance=0,
+        points_only=False,
+        chunksize=None,
+        message="Incorrect data values at {0} resolution",
+        message_bins="Plotted data does not cover the same {0}s as the "
+        + "expected data",
+    ):
+        """Asserts that the data on the plot matches `xy_expected` once both
+        are aggregated to a common time resolution, e.g. daily means.
+
+        This lets a plot of resampled or aggregated data pass against the
+        raw expected data. The plot data is read one block at a time and
+        aggregated with ``numpy.bincount``, so memory use only depends on the
+        number of bins and `chunksize`. The x data on the plot must be
+        Matplotlib dates.
+
+        Parameters
+        ----------
+        xy_expected : pandas.DataFrame
+            DataFrame with the expected data.
+        xcol : string
+            Column title containing the expected dates.
+        ycol : string
+            Column title containing the expected values.
+        freq : string
+            Size of the bins, one of the following ['year', 'month', 'week',
+            'day', 'hour', 'minute', 'second']. Bins follow the calendar,
+            e.g. daily bins start at midnight UTC. Weeks start on Thursday,
+            as numpy counts them from 1970-01-01.
+        how : string
+            How values in a bin are aggregated, one of the following
+            ['mean', 'sum', 'min', 'max'].
+        tolerance : float
+            Absolute tolerance allowed between the aggregated values. If 0,
+            they only may differ by floating point rounding.
+        points_only : boolean
+            Set ``True`` to check only points, set ``False`` to check all data
+            on plot.
+        chunksize : int (Optional)
+            Maximum number of plotted points aggregated at once. See
+            ``iter_xy()``.
+        message : string
+            The error message to be displayed if the aggregated values do not
+            match. If `message` contains ``'{0}'`` it will be replaced with
+            `freq`.
+        message_bins : string
+            The error message to be displayed if the plot has data in bins
+            where the expected data has none, or the other way around. If
+            `message_bins` contains ``'{0}'`` it will be replaced with
+            `freq`.
+
+        Raises
+        -------
+        AssertionError
+            if the aggregated data on the plot does not match the aggregated
+            expected data
+        """
+        if freq not in _BIN_UNITS:
+            raise ValueError(
+                "freq must be one of the following strings "
+                + str(list(_BIN_UNITS))
+            )
+        expected = xy_expected[[xcol, ycol]].dropna()
+        bins, exp_idx = np.unique(
+            _bin_ids(expected[xcol], freq), return_inverse=True
+        )
+        state_exp = _new_bins(len(bins), how)
+        _accumulate_bins(
+            state_exp, exp_idx, expected[ycol].to_numpy(dtype=np.float64)
+        )
+
+        state = _new_bins(len(bins), how)
+        blocks = self.iter_xy(points_only=points_only, chunksize=chunksize)
+        for block in blocks:
+            ids = _bin_ids(block[:, 0], freq)
+            idx = np.minimum(np.searchsorted(bins, ids), len(bins) - 1)
+            assert len(bins) and np.array_equal(
+                bins[idx], ids
+            ), message_bins.format(freq)
+            _accumulate_bins(state, idx, block[:, 1])
+        assert np.array_equal(
+            state["count"] > 0, state_exp["count"] > 0
+        ), message_bins.format(freq)
+
+        np.testing.assert_allclose(
+            _finish_bins(state),
+            _finish_bins(state_exp),
+            rtol=1e-9,
+            atol=tolerance,
+            err_msg=message.format(freq),
+        )
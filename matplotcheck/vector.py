@@ -1,11 +1,507 @@
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import geopandas as gpd
-import matplotlib.pyplot as plt
 import matplotlib
 import shapely
+from matplotlib.path import Path
+from pyproj import CRS, Transformer
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching
+from scipy.spatial import cKDTree
 
-from .base import PlotTester
+from .base import (
+    PlotTester,
+    _collection_offsets,
+    _path_vertices,
+    _summarize_xy,
+)
+
+
+def _ring_hashes(coords, ring_offsets):
+    """Returns one uint64 hash per ring of vertices. The hash depends on the
+    order of the vertices, and -0.0 hashes like 0.0."""
+    lengths = np.diff(ring_offsets)
+    bits = (coords + 0.0).view(np.uint64)
+    position = np.arange(len(coords), dtype=np.uint64) - np.repeat(
+        ring_offsets[:-1], lengths
+    ).astype(np.uint64)
+    hashed = (bits[:, 0] * np.uint64(0x9E3779B97F4A7C15)) ^ (
+        (bits[:, 1] + position) * np.uint64(0xC2B2AE3D27D4EB4F)
+    )
+    hashed ^= hashed >> np.uint64(31)
+    hashes = np.zeros(len(lengths), dtype=np.uint64)
+    full = lengths > 0
+    if full.any():
+        hashes[full] = np.add.reduceat(hashed, ring_offsets[:-1][full])
+    return hashes
+
+
+class _RaggedGeometry(object):
+    """Lines or polygons stored as flat arrays, the way GeoArrow does.
+
+    The vertices of all rings are held in one (n, 2) float64 array. Ring
+    ``i`` is ``coords[ring_offsets[i]:ring_offsets[i + 1]]``, and part ``j``
+    (a line, or a polygon) is made of rings ``part_offsets[j]`` up to
+    ``part_offsets[j + 1]``. A line has a single ring.
+
+    Parameters
+    ----------
+    coords : numpy.ndarray
+        Array of shape (n, 2) with the vertices of all rings.
+    ring_offsets : numpy.ndarray
+        Array of n_rings + 1 positions in `coords`.
+    part_offsets : numpy.ndarray (Optional)
+        Array of n_parts + 1 positions in `ring_offsets`. Defaults to one
+        ring per part.
+    """
+
+    def __init__(self, coords, ring_offsets, part_offsets=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+        if part_offsets is None:
+            part_offsets = np.arange(len(self.ring_offsets))
+        self.part_offsets = np.asarray(part_offsets, dtype=np.int64)
+        self.part_rows = None
+
+    @classmethod
+    def from_parts(cls, parts):
+        """Builds the geometry from a list of parts, each a list of rings
+        given as arrays or lists of (x, y) coords."""
+        rings = [
+            np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+            for part in parts
+            for ring in part
+        ]
+        ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+        np.cumsum([len(ring) for ring in rings], out=ring_offsets[1:])
+        part_offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(part) for part in parts], out=part_offsets[1:])
+        coords = np.concatenate(rings) if rings else np.empty((0, 2))
+        return cls(coords, ring_offsets, part_offsets)
+
+    @classmethod
+    def from_geometries(cls, geometries):
+        """Builds the geometry from shapely lines or polygons. Each line and
+        each polygon of a multi-part geometry becomes a part, empty
+        geometries are skipped. Each polygon has its exterior ring first,
+        followed by its interior rings (holes).
+
+        The position in `geometries` that each part comes from is kept in
+        the ``part_rows`` attribute.
+        """
+        parts, rows = [], []
+        for row, geom in enumerate(geometries):
+            if geom is None or geom.is_empty:
+                continue
+            for single in getattr(geom, "geoms", [geom]):
+                rows.append(row)
+                if isinstance(single, shapely.geometry.LineString):
+                    parts.append([np.asarray(single.coords)[:, :2]])
+                elif isinstance(single, shapely.geometry.Polygon):
+                    parts.append(
+                        [
+                            np.asarray(ring.coords)[:, :2]
+                            for ring in [single.exterior, *single.interiors]
+                        ]
+                    )
+                else:
+                    raise ValueError(
+                        "Geometry is not of an expected type: LineString, "
+                        "MultiLineString, Polygon, MultiPolygon"
+                    )
+        geometry = cls.from_parts(parts)
+        geometry.part_rows = np.array(rows, dtype=np.int64)
+        return geometry
+
+    @classmethod
+    def from_paths(cls, paths):
+        """Builds the geometry from matplotlib Paths, one part per path.
+
+        Paths are split into rings at their MOVETO codes. The vertices of
+        CLOSEPOLY and STOP codes carry no position and are dropped.
+        """
+        verts, codes = [], []
+        for path in paths:
+            path_verts = _path_vertices(path)
+            path_codes = path.codes
+            if path_codes is None:
+                path_codes = np.full(len(path_verts), Path.LINETO)
+            verts.append(path_verts)
+            codes.append(np.asarray(path_codes))
+        if not verts:
+            return cls.from_parts([])
+        sizes = [len(v) for v in verts]
+        path_ids = np.repeat(np.arange(len(verts)), sizes)
+        codes = np.concatenate(codes)
+        # The first vertex of each path starts a ring, even without MOVETO
+        starts = codes == Path.MOVETO
+        starts[np.cumsum([0] + sizes[:-1])[np.array(sizes) > 0]] = True
+        keep = (codes != Path.CLOSEPOLY) & (codes != Path.STOP)
+        starts, path_ids = starts[keep], path_ids[keep]
+        ring_starts = np.flatnonzero(starts)
+        ring_offsets = np.append(ring_starts, keep.sum())
+        # Drop rings left without vertices, e.g. a MOVETO then CLOSEPOLY
+        ring_offsets = np.unique(ring_offsets)
+        ring_starts = ring_offsets[:-1]
+        part_offsets = np.zeros(len(verts) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(path_ids[ring_starts], minlength=len(verts)),
+            out=part_offsets[1:],
+        )
+        return cls(np.concatenate(verts)[keep], ring_offsets, part_offsets)
+
+    def __len__(self):
+        return len(self.part_offsets) - 1
+
+    def part_sizes(self):
+        """Returns the number of vertices of each part."""
+        return np.diff(self.ring_offsets[self.part_offsets])
+
+    def bounds(self):
+        """Returns the bounding box of each part as an array of shape
+        (n_parts, 4) with columns xmin, ymin, xmax, ymax. Parts without
+        vertices get NaN bounds."""
+        starts = self.ring_offsets[self.part_offsets]
+        sizes = np.diff(starts)
+        bounds = np.full((len(self), 4), np.nan)
+        full = sizes > 0
+        if full.any():
+            bounds[full, :2] = np.minimum.reduceat(
+                self.coords, starts[:-1][full]
+            )
+            bounds[full, 2:] = np.maximum.reduceat(
+                self.coords, starts[:-1][full]
+            )
+        return bounds
+
+    def rings(self):
+        """Returns the rings as a list of read-only (n, 2) array views."""
+        coords = self.coords.view()
+        coords.flags.writeable = False
+        return np.split(coords, self.ring_offsets[1:-1])
+
+    def to_tuples(self):
+        """Returns each part as a list of (x, y) tuples, with the vertices of
+        all its rings in order."""
+        coords = [tuple(xy) for xy in self.coords.tolist()]
+        bounds = self.ring_offsets[self.part_offsets].tolist()
+        return [coords[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def take(self, parts):
+        """Returns a new geometry holding `parts`, an array of part indices,
+        in that order. The vertices are gathered without a Python loop."""
+        parts = np.asarray(parts, dtype=np.int64)
+        rings = _ragged_ranges(self.part_offsets, parts)
+        vertices = _ragged_ranges(self.ring_offsets, rings)
+        ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+        np.cumsum(np.diff(self.ring_offsets)[rings], out=ring_offsets[1:])
+        part_offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum(np.diff(self.part_offsets)[parts], out=part_offsets[1:])
+        return _RaggedGeometry(
+            self.coords[vertices], ring_offsets, part_offsets
+        )
+
+    def part_hashes(self):
+        """Returns one uint64 hash per part, which depends on the order of
+        its rings and vertices."""
+        ring_hashes = _ring_hashes(self.coords, self.ring_offsets)
+        # Ring position within the part is mixed in so ring order counts
+        n_rings = np.diff(self.part_offsets)
+        position = np.arange(len(ring_hashes)) - np.repeat(
+            self.part_offsets[:-1], n_rings
+        )
+        ring_hashes *= (2 * position + 1).astype(np.uint64)
+        hashes = np.zeros(len(self), dtype=np.uint64)
+        full = n_rings > 0
+        if full.any():
+            hashes[full] = np.add.reduceat(
+                ring_hashes, self.part_offsets[:-1][full]
+            )
+        return hashes
+
+    def normalized(self, decimal=None):
+        """Returns the geometry with each ring in a canonical form, for
+        comparing polygons.
+
+        Rings are made open (a closing vertex equal to the first one is
+        dropped), turned counterclockwise, and rotated to start at their
+        smallest vertex by x then y. The interior rings of each polygon are
+        sorted by size, then hash, after its exterior ring. All rings are
+        handled at once with array operations.
+
+        If `decimal` is given, these choices are made on the coordinates
+        rounded to `decimal` places, so that rings differing by less than
+        that get the same start vertex, direction and order. The
+        coordinates returned are not rounded.
+        """
+        coords = self.coords
+        key = coords if decimal is None else np.round(coords, decimal)
+        lengths = np.diff(self.ring_offsets)
+        n_rings = len(lengths)
+        starts, ends = self.ring_offsets[:-1], self.ring_offsets[1:] - 1
+
+        # Drop the closing vertex of closed rings
+        closed = lengths > 1
+        closed[closed] = (key[starts[closed]] == key[ends[closed]]).all(axis=1)
+        keep = np.ones(len(coords), dtype=bool)
+        keep[ends[closed]] = False
+        coords, key = coords[keep], key[keep]
+        lengths = lengths - closed
+        ring_offsets = np.zeros(n_rings + 1, dtype=np.int64)
+        np.cumsum(lengths, out=ring_offsets[1:])
+        ring_ids = np.repeat(np.arange(n_rings), lengths)
+        ring_starts = ring_offsets[:-1][ring_ids]
+        ring_sizes = lengths[ring_ids]
+        position = np.arange(len(coords)) - ring_starts
+
+        # Signed area of each ring by the shoelace formula
+        following = key[ring_starts + (position + 1) % ring_sizes]
+        cross = key[:, 0] * following[:, 1] - following[:, 0] * key[:, 1]
+        clockwise = np.bincount(ring_ids, cross, minlength=n_rings) < 0
+
+        # Position of the smallest vertex of each ring
+        order = np.lexsort((key[:, 1], key[:, 0], ring_ids))
+        first = np.zeros(n_rings, dtype=np.int64)
+        full = lengths > 0
+        first[full] = position[order[ring_offsets[:-1][full]]]
+
+        # Walk each ring from its smallest vertex, backwards if clockwise
+        step = np.where(clockwise, -1, 1)[ring_ids]
+        walk = ring_starts + (first[ring_ids] + step * position) % ring_sizes
+        coords, key = coords[walk], key[walk]
+        normalized = _RaggedGeometry(coords, ring_offsets, self.part_offsets)
+
+        # Sort interior rings, keeping the exterior ring of each part first
+        n_parts = np.diff(self.part_offsets)
+        part_ids = np.repeat(np.arange(len(n_parts)), n_parts)
+        interior = np.arange(n_rings) > self.part_offsets[:-1][part_ids]
+        ring_order = np.lexsort(
+            (
+                _ring_hashes(key, ring_offsets),
+                lengths,
+                interior,
+                part_ids,
+            )
+        )
+        vertices = _ragged_ranges(ring_offsets, ring_order)
+        np.cumsum(lengths[ring_order], out=normalized.ring_offsets[1:])
+        normalized.coords = coords[vertices]
+        return normalized
+
+    def canonical_order(self):
+        """Returns the order of the parts by size, then hash. Geometries
+        holding the same parts in any order give the same sequence of parts
+        in this order."""
+        return np.lexsort((self.part_hashes(), self.part_sizes()))
+
+    def sort_order(self, decimal=None):
+        """Returns the order of the parts by their first vertex, rounded to
+        `decimal` places, then by size, then by all their vertices, rounded
+        the same way. Unlike ``canonical_order()`` this order barely changes
+        when the coordinates change by small amounts."""
+        sizes = self.part_sizes()
+        vertex_offsets = self.ring_offsets[self.part_offsets]
+        starts = vertex_offsets[:-1]
+        first = np.full((len(self), 2), -np.inf)
+        first[sizes > 0] = self.coords[starts[sizes > 0]]
+        if decimal is not None:
+            first = np.round(first, decimal)
+        order = np.lexsort((sizes, first[:, 1], first[:, 0]))
+
+        # Parts with the same first vertex and size are ordered by the rest
+        # of their vertices, one run of such parts at a time
+        keys = np.column_stack((first, sizes))[order]
+        tied = (keys[1:] == keys[:-1]).all(axis=1)
+        if not tied.any():
+            return order
+        coords = self.coords
+        if decimal is not None:
+            coords = np.round(coords, decimal)
+        runs = np.split(np.arange(len(order)), np.flatnonzero(~tied) + 1)
+        for run in runs:
+            if len(run) > 1:
+                parts = order[run]
+                vertices = coords[_ragged_ranges(vertex_offsets, parts)]
+                vertices = vertices.reshape(len(parts), -1)
+                order[run] = parts[np.lexsort(vertices.T[::-1])]
+        return order
+
+    def canonical_key(self):
+        """Returns bytes that are equal for two geometries if and only if
+        they hold the same parts, in any order."""
+        canonical = self.take(self.canonical_order())
+        return b"".join(
+            (
+                np.diff(canonical.part_offsets).tobytes(),
+                np.diff(canonical.ring_offsets).tobytes(),
+                (canonical.coords + 0.0).tobytes(),
+            )
+        )
+
+    def equals(self, other):
+        """Returns True if `other` holds the same parts, in any order."""
+        return len(self) == len(other) and (
+            self.canonical_key() == other.canonical_key()
+        )
+
+    def group_keys(self, labels):
+        """Returns a sorted list with the ``canonical_key()`` of the parts
+        of each group in `labels`, one integer label per part."""
+        labels = np.asarray(labels)
+        order = np.argsort(labels, kind="stable")
+        splits = np.flatnonzero(np.diff(labels[order])) + 1
+        groups = np.split(order, splits) if len(order) else []
+        return sorted(self.take(group).canonical_key() for group in groups)
+
+
+def _directed_line_distance(a, b, chunksize=2**20):
+    """Returns the largest distance from a vertex of line `a` to line `b`,
+    where the distance to `b` is measured to its nearest segment. Vertices
+    of `a` are handled in blocks so at most about `chunksize` vertex to
+    segment distances are held at once."""
+    if len(b) == 1:
+        return np.sqrt(((a - b) ** 2).sum(axis=1)).max()
+    start, seg = b[:-1], np.diff(b, axis=0)
+    seg_len2 = (seg**2).sum(axis=1)
+    seg_len2[seg_len2 == 0] = 1
+    block = max(1, chunksize // len(seg))
+    largest = 0.0
+    for i in range(0, len(a), block):
+        stop = i + block
+        rel = a[i:stop, np.newaxis, :] - start
+        t = np.clip((rel * seg).sum(axis=2) / seg_len2, 0, 1)
+        dist2 = ((rel - t[..., np.newaxis] * seg) ** 2).sum(axis=2)
+        largest = max(largest, np.sqrt(dist2.min(axis=1).max()))
+    return largest
+
+
+def _line_hausdorff(a, b):
+    """Returns the discrete Hausdorff distance between lines `a` and `b`,
+    arrays of shape (n, 2): the largest distance from a vertex of either
+    line to the segments of the other. Unlike a distance between vertices
+    only, it is 0 for the same line drawn with more or fewer vertices along
+    its segments."""
+    return max(_directed_line_distance(a, b), _directed_line_distance(b, a))
+
+
+def _check_stages(
+    xy, xy_expected, n, n_expected, m, vertices=True, atol=None, rtol=0
+):
+    """Runs the cheap checks of a vector assertion, in order of cost, and
+    raises an AssertionError naming the first one that fails.
+
+    The stages are the number of features, the number of vertices, the
+    bounds of all vertices and an order independent checksum of the
+    vertices. Data that passes them all still needs the full comparison,
+    and the stages must never be stricter than that comparison.
+
+    Parameters
+    ----------
+    xy, xy_expected : numpy.ndarray
+        Arrays of shape (n, 2) with the plotted and the expected vertices.
+    n, n_expected : int
+        Number of plotted and expected features.
+    m : string
+        Error message, the failed stage is added to it.
+    vertices : boolean
+        Set to False if the number of vertices may differ.
+    atol : float (Optional)
+        Absolute tolerance allowed on the bounds. If given, the checksum
+        stage, which needs exact coordinates, is skipped.
+    rtol : float
+        Relative tolerance allowed on the bounds, relative to the larger of
+        the two values. Only used if `atol` is given.
+    """
+    message = m + " (failed at {0}: expected {1}, found {2})"
+    assert n == n_expected, message.format("feature count", n_expected, n)
+    found, expected = _summarize_xy(xy), _summarize_xy(xy_expected)
+    if vertices:
+        assert found["count"] == expected["count"], message.format(
+            "vertex count", expected["count"], found["count"]
+        )
+    if not len(xy) or not len(xy_expected):
+        return
+    keys = ["xmin", "ymin", "xmax", "ymax"]
+    bounds = np.array([found[k] for k in keys])
+    bounds_exp = np.array([expected[k] for k in keys])
+    allowed = 0
+    if atol is not None:
+        allowed = atol + rtol * np.maximum(np.abs(bounds), np.abs(bounds_exp))
+    assert (np.abs(bounds - bounds_exp) <= allowed).all(), message.format(
+        "bounds", tuple(bounds_exp), tuple(bounds)
+    )
+    if atol is None:
+        assert found["checksum"] == expected["checksum"], message.format(
+            "checksum", expected["checksum"], found["checksum"]
+        )
+
+
+@lru_cache(maxsize=None)
+def _get_transformer(crs_from, crs_to):
+    """Returns a pyproj Transformer between two CRS given as WKT strings.
+    Creating a Transformer is slow, so they are cached. Coordinates are
+    taken and returned in x, y (longitude, latitude) order."""
+    return Transformer.from_crs(crs_from, crs_to, always_xy=True)
+
+
+# Reprojected coordinates, shared by all testers so that the same expected
+# layer is reprojected only once however many plots are checked against it
+_PROJECTED_CACHE_SIZE = 32
+_projected_cache = OrderedDict()
+
+
+def _transform_coords(coords, crs_from, crs_to):
+    """Returns an (n, 2) read-only array of coords transformed from
+    `crs_from` to `crs_to` (both pyproj CRS objects), all at once.
+
+    Results are kept in a least recently used cache of
+    ``_PROJECTED_CACHE_SIZE`` entries, keyed on a digest of the content of
+    `coords` and the pair of CRS, so coords edited in place are transformed
+    again.
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+    key = (
+        hashlib.blake2b(coords.tobytes(), digest_size=16).digest(),
+        coords.shape,
+        crs_from.to_wkt(),
+        crs_to.to_wkt(),
+    )
+    projected = _projected_cache.get(key)
+    if projected is not None:
+        _projected_cache.move_to_end(key)
+        return projected
+    transformer = _get_transformer(key[2], key[3])
+    x, y = transformer.transform(coords[:, 0], coords[:, 1])
+    projected = np.column_stack((x, y))
+    projected.flags.writeable = False
+    _projected_cache[key] = projected
+    if len(_projected_cache) > _PROJECTED_CACHE_SIZE:
+        _projected_cache.popitem(last=False)
+    return projected
+
+
+def _ragged_ranges(offsets, indices):
+    """Returns the concatenation of ``range(offsets[i], offsets[i + 1])``
+    for each i in `indices`, computed without a Python loop."""
+    starts = offsets[indices]
+    lengths = offsets[indices + 1] - starts
+    total = lengths.sum()
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    # Steps of 1 within a range, and jumps to the next start between them
+    steps = np.ones(total, dtype=np.int64)
+    ends = np.cumsum(lengths)[:-1]
+    keep = lengths > 0
+    first = np.concatenate(([0], ends))[keep]
+    jumps = starts[keep] - np.concatenate(
+        ([0], starts[keep][:-1] + lengths[keep][:-1])
+    )
+    steps[first] = jumps + 1
+    steps[0] = starts[keep][0]
+    return np.cumsum(steps)
 
 
 class VectorTester(PlotTester):
@@ -14,15 +510,72 @@ class VectorTester(PlotTester):
     Parameters
     ----------
     ax: ```matplotlib.axes.Axes``` object
+    crs: pyproj.CRS, string or int (Optional)
+        CRS of the coordinates on Axes ax, in any form accepted by
+        ``pyproj.CRS.from_user_input()``. If given, expected GeoDataFrames
+        with another CRS are reprojected to it before being compared.
+        Reprojected coordinates are cached by their content and shared by
+        all testers, so checking the same layer again, also with a new
+        tester, does not reproject it.
 
     """
 
-    def __init__(self, ax):
+    def __init__(self, ax, crs=None):
         """Initialize the vector tester"""
         super(VectorTester, self).__init__(ax)
+        self.crs = None if crs is None else CRS.from_user_input(crs)
 
     """ Check Data """
 
+    def iter_points(self):
+        """Yields the points on Axes ax one collection at a time.
+
+        Yields
+        ------
+        (collection, offsets): tuple
+            The matplotlib PathCollection and a numpy array of shape (n, 2)
+            with the x and y coords of its points.
+        """
+        for c in self.get_artist_index()["collections"]:
+            if type(c) == matplotlib.collections.PathCollection:
+                yield c, _collection_offsets(c)
+
+    def iter_lines(self):
+        """Yields the line segments on Axes ax one collection at a time.
+
+        Yields
+        ------
+        (collection, segments): tuple
+            The matplotlib LineCollection and a list of numpy arrays of shape
+            (n, 2), one for each line segment in the collection.
+        """
+        for c in self.get_artist_index()["collections"]:
+            if type(c) == matplotlib.collections.LineCollection:
+                # Path vertices are read directly rather than through
+                # get_segments(), which rebuilds every segment vertex by
+                # vertex. Like get_segments(), missing vertices are dropped.
+                segments = []
+                for path in c.get_paths():
+                    verts = _path_vertices(path)
+                    missing = np.isnan(verts).any(axis=1)
+                    segments.append(
+                        verts[~missing] if missing.any() else verts
+                    )
+                yield c, segments
+
+    def iter_polygons(self):
+        """Yields the polygons on Axes ax one collection at a time.
+
+        Yields
+        ------
+        (collection, polygons): tuple
+            The matplotlib PatchCollection and a list of numpy arrays of shape
+            (n, 2), holding the vertices of each path in the collection.
+        """
+        for c in self.get_artist_index()["collections"]:
+            if type(c) == matplotlib.collections.PatchCollection:
+                yield c, [_path_vertices(path) for path in c.get_paths()]
+
     def _convert_length(self, arr, n):
         """Helper function for 'get_points_by_attributes' and
         'get_lines_by_attributes'
@@ -44,63 +597,153 @@ class VectorTester(PlotTester):
         array of length n
         """
         if len(arr) == 1:
+            if isinstance(arr, np.ndarray):
+                return np.repeat(arr, n, axis=0)
             return list(arr) * n
         elif len(arr) == n:
             return arr
         else:
             raise ValueError("Input array length is not: 1 or {0}".format(n))
 
-    def get_points_by_attributes(self):
-        """Returns a sorted list of lists where each list contains tuples of
-        xycoords for points of
-        the same attributes: color, marker, and markersize
+    def _project(self, coords, crs):
+        """Helper function for '_get_xy_arrays' and '_get_expected_geometry'.
+        Returns the (n, 2) array `coords` in CRS `crs` reprojected to the
+        CRS of the tester, or `coords` itself if either CRS is missing or
+        both are the same.
+
+        Reprojected coordinates are cached by ``_transform_coords()``, so a
+        layer is only reprojected again after it changes.
+        """
+        if self.crs is None or crs is None:
+            return coords
+        crs = CRS.from_user_input(crs)
+        if crs == self.crs:
+            return coords
+        return _transform_coords(coords, crs, self.crs)
+
+    def _get_xy_arrays(self, gdf):
+        """Helper function for the point assertions.
+        Returns the x and y coordinates of the Point geometries in `gdf` as
+        two float64 arrays, without building a shapely object per point.
+        Coordinates are reprojected to the CRS of the tester if it has one.
+
+        Parameters
+        ----------
+        gdf: GeoDataFrame or GeoSeries with Point geometries
 
         Returns
         -------
-        sorted list where each list represents all points with the same color.
-        each point is represented by a tuple with its coordinates.
+        x, y: tuple of numpy arrays of the same length as `gdf`
         """
-        points_dataframe = pd.DataFrame(
-            columns=["offset", "color", "msize", "mstyle"]
-        )
-        for c in (
-            coll
-            for coll in self.ax.collections
-            if type(coll) == matplotlib.collections.PathCollection
-        ):
-            colors, sizes = (
-                [tuple(color) for color in c.get_facecolors()],
-                c.get_sizes(),
+        geometry = getattr(gdf, "geometry", gdf)
+        xy = np.column_stack(
+            (
+                geometry.x.to_numpy(dtype=np.float64),
+                geometry.y.to_numpy(dtype=np.float64),
             )
-            styles, offsets = (
-                [tuple(tuple(v) for v in p.vertices) for p in c.get_paths()],
-                [tuple(o) for o in c.get_offsets()],
+        )
+        xy = self._project(xy, getattr(gdf, "crs", None))
+        return xy[:, 0], xy[:, 1]
+
+    def _get_expected_geometry(self, gdf):
+        """Helper function for the line and polygon assertions.
+        Returns the geometries of `gdf` as a _RaggedGeometry, reprojected
+        to the CRS of the tester if it has one.
+
+        Parameters
+        ----------
+        gdf: GeoDataFrame or GeoSeries with line or polygon geometries
+
+        Returns
+        -------
+        _RaggedGeometry with one part per line or polygon
+        """
+        geometry = _RaggedGeometry.from_geometries(
+            getattr(gdf, "geometry", gdf)
+        )
+        geometry.coords = self._project(
+            geometry.coords, getattr(gdf, "crs", None)
+        )
+        return geometry
+
+    def _group_points(self, xy, labels):
+        """Helper function for 'get_points_by_attributes' and
+        'assert_points_grouped_by_type'.
+        Splits the rows of `xy` into one array per group label and returns the
+        groups in a canonical order, so that two groupings of the same points
+        compare equal no matter how the groups were labeled.
+
+        Parameters
+        ----------
+        xy: numpy array of shape (n, 2) with point coordinates
+        labels: numpy array of n integer group labels
+
+        Returns
+        -------
+        list of numpy arrays of shape (k, 2). Points within each array are
+        sorted by x then y, and arrays are sorted by their first point.
+        """
+        # Adding 0.0 turns -0.0 into 0.0 so both sort and hash alike
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2) + 0.0
+        order = np.lexsort((xy[:, 1], xy[:, 0], labels))
+        xy, labels = xy[order], labels[order]
+        splits = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+        groups = np.split(xy, splits) if len(xy) else []
+        return sorted(groups, key=lambda g: (tuple(g[0]), len(g), g.tobytes()))
+
+    def get_points_by_attributes(self):
+        """Returns a sorted list of arrays where each array contains the
+        xycoords of points of the same attributes: color, marker, and
+        markersize
+
+        Returns
+        -------
+        sorted list where each array represents all points with the same
+        attributes. Each array has shape (n, 2), holds one point per row and
+        is sorted by x then y.
+        """
+        offsets, colors, sizes, styles = [], [], [], []
+        # Marker paths are interned to integer ids so they can be grouped
+        # numerically alongside colors and sizes
+        style_ids = {}
+        for c, offs in self.iter_points():
+            n = len(offs)
+            if not n:
+                continue
+            paths = np.array(
+                [
+                    style_ids.setdefault(
+                        (p.vertices.shape, p.vertices.tobytes()),
+                        len(style_ids),
+                    )
+                    for p in c.get_paths()
+                ]
             )
-            n = len(offsets)
-            colors, sizes, styles = (
-                self._convert_length(colors, n),
-                self._convert_length(sizes, n),
-                self._convert_length(styles, n),
+            offsets.append(offs)
+            colors.append(
+                self._convert_length(
+                    np.asarray(c.get_facecolors(), dtype=np.float64), n
+                )
             )
-            points_dataframe = points_dataframe.append(
-                pd.DataFrame(
-                    {
-                        "offset": offsets,
-                        "color": colors,
-                        "msize": sizes,
-                        "mstyle": styles,
-                    }
-                ),
-                ignore_index=True,
+            sizes.append(
+                self._convert_length(
+                    np.asarray(c.get_sizes(), dtype=np.float64), n
+                )
             )
+            styles.append(self._convert_length(paths, n))
 
-        points_grouped = [
-            [data["offset"][i] for i in data.index]
-            for c, data in points_dataframe.groupby(
-                ["color", "mstyle", "msize"], sort=False
+        if not offsets:
+            return []
+
+        keys = np.column_stack(
+            (
+                np.concatenate(colors),
+                np.concatenate(sizes),
+                np.concatenate(styles),
             )
-        ]
-        return sorted([sorted(p) for p in points_grouped])
+        )
+        _, labels = np.unique(keys, axis=0, return_inverse=True)
+        return self._group_points(np.concatenate(offsets), labels.ravel())
 
     def assert_points_grouped_by_type(
         self, data_exp, sort_column, m="Point attributes not accurate by type"
@@ -121,13 +764,14 @@ class VectorTester(PlotTester):
         """
 
         groups = self.get_points_by_attributes()
-        grouped_exp = [
-            [(data.geometry[i].x, data.geometry[i].y) for i in data.index]
-            for c, data in data_exp.groupby([sort_column], sort=False)
-        ]
-        np.testing.assert_equal(
-            groups, sorted([sorted(p) for p in grouped_exp]), m
+        x_exp, y_exp = self._get_xy_arrays(data_exp)
+        labels, _ = pd.factorize(data_exp[sort_column])
+        # Points without a category are not part of any group
+        keep = labels >= 0
+        grouped_exp = self._group_points(
+            np.column_stack((x_exp, y_exp))[keep], labels[keep]
         )
+        np.testing.assert_equal(groups, grouped_exp, m)
 
     def sort_collection_by_markersize(self):
         """Returns a pandas dataframe of points in collections on Axes ax.
@@ -137,27 +781,29 @@ class VectorTester(PlotTester):
         pandas dataframe with columns x, y, point_size. Each row reprsents a
         point on Axes ax with location x,y and markersize pointsize
         """
-        df = pd.DataFrame(columns=("x", "y", "markersize"))
-        for c in self.ax.collections:
+        offsets, markersizes = [], []
+        for c in self.get_artist_index()["collections"]:
             if isinstance(c, matplotlib.collections.PathCollection):
-                offsets, markersizes = c.get_offsets(), c.get_sizes()
-                x_data, y_data = (
-                    [offset[0] for offset in offsets],
-                    [offset[1] for offset in offsets],
+                offs = np.asarray(c.get_offsets(), dtype=np.float64).reshape(
+                    -1, 2
                 )
-                if len(markersizes) == 1:
-                    markersize = [markersizes[0]] * len(offsets)
-                    df2 = pd.DataFrame(
-                        {"x": x_data, "y": y_data, "markersize": markersize}
-                    )
-                    df = df.append(df2)
-                elif len(markersizes) == len(offsets):
-                    df2 = pd.DataFrame(
-                        {"x": x_data, "y": y_data, "markersize": markersizes}
-                    )
-                    df = df.append(df2)
-        df = df.sort_values(by="markersize").reset_index(drop=True)
-        return df
+                sizes = np.asarray(c.get_sizes(), dtype=np.float64)
+                if len(sizes) in (1, len(offs)):
+                    offsets.append(offs)
+                    markersizes.append(np.broadcast_to(sizes, len(offs)))
+        if not offsets:
+            return pd.DataFrame(columns=("x", "y", "markersize"))
+        offsets = np.concatenate(offsets)
+        markersizes = np.concatenate(markersizes)
+        # A stable sort keeps points of equal size in plotting order
+        order = np.argsort(markersizes, kind="stable")
+        return pd.DataFrame(
+            {
+                "x": offsets[order, 0],
+                "y": offsets[order, 1],
+                "markersize": markersizes[order],
+            }
+        )
 
     def assert_collection_sorted_by_markersize(self, df_expected, sort_column):
         """Asserts a collection of points vary in size by column expressed in
@@ -172,18 +818,19 @@ class VectorTester(PlotTester):
             if None, assertion is passed
         """
         df = self.sort_collection_by_markersize()
-        df_expected = df_expected.sort_values(by=sort_column).reset_index(
-            drop=True
-        )
+        df_expected = df_expected.sort_values(
+            by=sort_column, kind="stable"
+        ).reset_index(drop=True)
+        x_exp, y_exp = self._get_xy_arrays(df_expected)
         np.testing.assert_almost_equal(
-            np.array(df.x),
-            np.array([p.x for p in df_expected.geometry]),
+            df.x.to_numpy(dtype=np.float64),
+            x_exp,
             decimal=6,
             err_msg="Markersize not based on {0} values".format(sort_column),
         )
         np.testing.assert_almost_equal(
-            np.array(df.y),
-            np.array([p.y for p in df_expected.geometry]),
+            df.y.to_numpy(dtype=np.float64),
+            y_exp,
             decimal=6,
             err_msg="Markersize not based on {0} values".format(sort_column),
         )
@@ -215,9 +862,8 @@ class VectorTester(PlotTester):
         """
         if isinstance(points_expected, gpd.geodataframe.GeoDataFrame):
             points = self.get_points()
-            xy_expected = pd.DataFrame(columns=["x", "y"])
-            xy_expected["x"] = points_expected.geometry.x
-            xy_expected["y"] = points_expected.geometry.y
+            x_exp, y_exp = self._get_xy_arrays(points_expected)
+            xy_expected = pd.DataFrame({"x": x_exp, "y": y_exp})
             xy_expected = xy_expected.sort_values(by=["x", "y"])
             xy_expected.reset_index(inplace=True, drop=True)
             # Fix for failure if more than points were plotted in matplotlib
@@ -241,6 +887,17 @@ class VectorTester(PlotTester):
                         "points_expected's length does not match the stored"
                         "data's length."
                     )
+            _check_stages(
+                points[["x", "y"]].to_numpy(dtype=np.float64),
+                xy_expected.to_numpy(dtype=np.float64),
+                len(points),
+                len(xy_expected),
+                m,
+                vertices=False,
+                # The same tolerances as assert_frame_equal below
+                atol=1e-8,
+                rtol=1e-5,
+            )
             try:
                 pd.testing.assert_frame_equal(left=points, right=xy_expected)
             except AssertionError:
@@ -252,45 +909,6 @@ class VectorTester(PlotTester):
 
     # Lines
 
-    def _convert_multilines(self, df, column_title):
-        """Helper function for get_lines_by_attribute
-        converts a pandas dataframe containing a column of LineString and
-        MultiLinestring objects
-        to a pandas dataframe where each row represents a single line. Line
-        segment values are converted
-        to a list of tuples.
-
-        Parameters
-        ---------
-        df: pandas Dataframe containing a column of LineString and
-        MultiLinestring objects
-        column_title: string of column title which holds LineString and
-        MultLinestring objects
-
-        Returns
-        -------
-        Dataframe where each row represents a single line.
-        Line segments values are converted to a list of tuples in column
-        column_title
-        """
-        dfout = df.copy()
-        for i, row in dfout.iterrows():
-            seg = row[column_title]
-            if type(seg) == shapely.geometry.linestring.LineString:
-                dfout.at[i, column_title] = list(seg.coords)
-            elif type(seg) == shapely.geometry.multilinestring.MultiLineString:
-                dfout.at[i, column_title] = list(seg[0].coords)
-                for j in range(1, len(seg)):
-                    new_row = row.copy()
-                    new_row[column_title] = list(seg[j].coords)
-                    dfout = dfout.append(new_row).reset_index(drop=True)
-            else:
-                raise ValueError(
-                    "Segment is not of either expected type: MultiLinestring, "
-                    "LineString"
-                )
-        return dfout
-
     def _convert_linestyle(self, ls):
         """helper function for get_lines_by_attributes.
             converts linestyle to a tuple of (offset, onoffseq) to get hashable
@@ -309,6 +927,79 @@ class VectorTester(PlotTester):
             onoffseq = tuple(ls[1])
         return (ls[0], onoffseq)
 
+    def _get_line_geometry(self):
+        """Returns the line segments on Axes ax as one ragged geometry, and
+        the LineCollection each segment belongs to.
+
+        Returns
+        -------
+        (geometry, collections): tuple
+            A _RaggedGeometry with one part per line segment, in plotting
+            order, and a list of ``(collection, n)`` tuples giving the number
+            of segments taken from each LineCollection.
+        """
+        parts, collections = [], []
+        for c, segs in self.iter_lines():
+            parts.extend([seg] for seg in segs)
+            collections.append((c, len(segs)))
+        return _RaggedGeometry.from_parts(parts), collections
+
+    def _get_line_attribute_labels(self, collections):
+        """Helper function for 'get_lines_by_attributes' and
+        'assert_lines_grouped_by_type'.
+        Returns one integer label per line segment, equal for segments with
+        the same color, linewidth and linestyle.
+
+        Parameters
+        ----------
+        collections: list of ``(collection, n)`` tuples, as returned by
+            ``_get_line_geometry()``
+
+        Returns
+        -------
+        numpy array of labels, one per segment
+        """
+        colors, widths, styles = [], [], []
+        # Linestyles are interned to integer ids so they can be grouped
+        # numerically alongside colors and widths
+        style_ids = {}
+        for c, n in collections:
+            if not n:
+                continue
+            ids = np.array(
+                [
+                    style_ids.setdefault(
+                        self._convert_linestyle(ls), len(style_ids)
+                    )
+                    for ls in c.get_linestyle()
+                ]
+            )
+            colors.append(
+                self._convert_length(
+                    np.asarray(c.get_colors(), dtype=np.float64), n
+                )
+            )
+            widths.append(
+                self._convert_length(
+                    np.atleast_1d(
+                        np.asarray(c.get_linewidth(), dtype=np.float64)
+                    ),
+                    n,
+                )
+            )
+            styles.append(self._convert_length(ids, n))
+        if not colors:
+            return np.empty(0, dtype=np.int64)
+        keys = np.column_stack(
+            (
+                np.concatenate(colors),
+                np.concatenate(widths),
+                np.concatenate(styles),
+            )
+        )
+        _, labels = np.unique(keys, axis=0, return_inverse=True)
+        return labels.ravel()
+
     def get_lines(self):
         """Returns a dataframe with all lines on ax
 
@@ -318,13 +1009,8 @@ class VectorTester(PlotTester):
         segment. Its value in 'lines' is a list of tuples representing the
         line segment.
         """
-        lines = [
-            [tuple(coords) for coords in seg]
-            for c in self.ax.collections
-            if type(c) == matplotlib.collections.LineCollection
-            for seg in c.get_segments()
-        ]
-        return pd.DataFrame({"lines": lines})
+        geometry, _ = self._get_line_geometry()
+        return pd.DataFrame({"lines": geometry.to_tuples()})
 
     def get_lines_by_collection(self):
         """Returns a sorted list of list where each list contains line segments
@@ -335,12 +1021,15 @@ class VectorTester(PlotTester):
         sorted list where each list represents all lines from the same
         collection
         """
-        lines_grouped = [
-            [[tuple(coords) for coords in seg] for seg in c.get_segments()]
-            for c in self.ax.collections
-            if type(c) == matplotlib.collections.LineCollection
-        ]
-        return sorted([sorted(lines) for lines in lines_grouped])
+        geometry, collections = self._get_line_geometry()
+        lines = geometry.to_tuples()
+        ends = np.cumsum([n for _, n in collections]).tolist()
+        return sorted(
+            [
+                sorted(lines[start:end])
+                for start, end in zip([0] + ends[:-1], ends)
+            ]
+        )
 
     def get_lines_by_attributes(self):
         """Returns a sorted list of lists where each list contains line
@@ -352,47 +1041,78 @@ class VectorTester(PlotTester):
         sorted list where each list represents all lines with the same
         attributes
         """
-        lines_dataframe = pd.DataFrame(
-            columns=["seg", "color", "lwidth", "lstyle"]
-        )
-        for c in (
-            coll
-            for coll in self.ax.collections
-            if type(coll) == matplotlib.collections.LineCollection
-        ):
-            segs = [[tuple(coords) for coords in s] for s in c.get_segments()]
-            colors, widths, styles = (
-                [tuple(color) for color in c.get_colors()],
-                c.get_linewidth(),
-                [self._convert_linestyle(ls) for ls in c.get_linestyle()],
-            )
-            n = len(segs)
-            colors, widths, styles = (
-                self._convert_length(colors, n),
-                self._convert_length(widths, n),
-                self._convert_length(styles, n),
-            )
-            lines_dataframe = lines_dataframe.append(
-                pd.DataFrame(
-                    {
-                        "seg": segs,
-                        "color": colors,
-                        "lwidth": widths,
-                        "lstyle": styles,
-                    }
-                ),
-                ignore_index=True,
-            )
+        geometry, collections = self._get_line_geometry()
+        labels = self._get_line_attribute_labels(collections)
+        lines = geometry.to_tuples()
+        groups = {}
+        for line, label in zip(lines, labels.tolist()):
+            groups.setdefault(label, []).append(line)
+        return sorted([sorted(group) for group in groups.values()])
 
-        lines_grouped = [
-            [data["seg"][i] for i in data.index]
-            for c, data in lines_dataframe.groupby(
-                ["color", "lwidth", "lstyle"], sort=False
-            )
-        ]
-        return sorted([sorted(lines) for lines in lines_grouped])
+    def match_lines(self, lines_expected, tolerance):
+        """Pairs each line segment on Axes ax with an expected line that lies
+        within `tolerance` of it.
+
+        The distance between two lines is the discrete Hausdorff distance:
+        the largest distance from a vertex of either line to the segments of
+        the other. Lines can only be that close if their bounding boxes are
+        within `tolerance` of each other on every side, so candidate pairs
+        are first found with a KD-tree over the bounding boxes, and
+        distances are only computed for those. Each expected line is paired
+        with at most one plotted line.
+
+        Parameters
+        ----------
+        lines_expected: Geopandas Dataframe with a geometry column consisting
+            of MultilineString and LineString objects
+        tolerance: float
+            Largest distance allowed between matching lines.
 
-    def assert_lines(self, lines_expected, m="Incorrect Line Data"):
+        Returns
+        -------
+        matches: numpy array
+            One entry per plotted line segment, in the order of
+            ``get_lines()``, holding the position of the matching expected
+            line among the parts of `lines_expected` (MultiLineStrings
+            exploded), or -1 if no expected line matches.
+        """
+        lines, _ = self._get_line_geometry()
+        lines_exp = self._get_expected_geometry(lines_expected)
+        return self._match_line_geometry(lines, lines_exp, tolerance)
+
+    def _match_line_geometry(self, lines, lines_exp, tolerance):
+        """Helper function for 'match_lines' and 'assert_lines', taking both
+        sets of lines as ragged geometries."""
+        matches = np.full(len(lines), -1, dtype=np.int64)
+        bounds, bounds_exp = lines.bounds(), lines_exp.bounds()
+        valid = ~np.isnan(bounds[:, 0])
+        valid_exp = np.flatnonzero(~np.isnan(bounds_exp[:, 0]))
+        if not valid.any() or not len(valid_exp):
+            return matches
+
+        tree = cKDTree(bounds_exp[valid_exp])
+        candidates = tree.query_ball_point(
+            bounds[valid], r=tolerance, p=np.inf
+        )
+        rings, rings_exp = lines.rings(), lines_exp.rings()
+        rows, cols = [], []
+        for i, near in zip(np.flatnonzero(valid), candidates):
+            for j in valid_exp[near]:
+                if _line_hausdorff(rings[i], rings_exp[j]) <= tolerance:
+                    rows.append(i)
+                    cols.append(j)
+        pairs = csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(lines), len(lines_exp)),
+        )
+        return np.asarray(
+            maximum_bipartite_matching(pairs, perm_type="column"),
+            dtype=np.int64,
+        )
+
+    def assert_lines(
+        self, lines_expected, m="Incorrect Line Data", tolerance=None
+    ):
         """Asserts the line data in Axes ax is equal to lines_expected with
         error message m.
         If line_expected is None or an empty list, assertion is passed
@@ -402,18 +1122,31 @@ class VectorTester(PlotTester):
         lines_expected: Geopandas Dataframe with a geometry column consisting
         of MultilineString and LineString objects
         m: string error message if assertion is not met
+        tolerance: float (Optional)
+            If given, each line only needs to lie within this distance of an
+            expected line, see ``match_lines()``. Lines can then differ by
+            floating point noise or by extra vertices along their segments.
+            If None, lines must be exact.
         """
         if type(lines_expected) == gpd.geodataframe.GeoDataFrame:
-            lines_expected = lines_expected[
-                ~lines_expected["geometry"].is_empty
-            ].reset_index(drop=True)
-            fig, ax_exp = plt.subplots()
-            lines_expected.plot(ax=ax_exp)
-            lines_exp = VectorTester(ax=ax_exp).get_lines()
-            plt.close(fig)
-            np.testing.assert_equal(
-                sorted(self.get_lines().lines), sorted(lines_exp.lines), m
+            lines_exp = self._get_expected_geometry(lines_expected)
+            lines, _ = self._get_line_geometry()
+            _check_stages(
+                lines.coords,
+                lines_exp.coords,
+                len(lines),
+                len(lines_exp),
+                m,
+                vertices=tolerance is None,
+                atol=tolerance,
             )
+            if tolerance is None:
+                assert lines.equals(lines_exp), m
+            else:
+                matches = self._match_line_geometry(
+                    lines, lines_exp, tolerance
+                )
+                assert (matches >= 0).all(), m
         elif not lines_expected:
             pass
         else:
@@ -440,21 +1173,17 @@ class VectorTester(PlotTester):
         m: string error message if assertion is not met
         """
         if type(lines_expected) == gpd.geodataframe.GeoDataFrame:
-            groups = self.get_lines_by_attributes()
-            lines_expected = lines_expected[
-                ~lines_expected["geometry"].is_empty
-            ].reset_index(drop=True)
-            fig, ax_exp = plt.subplots()
-            for typ, data in lines_expected.groupby(sort_column):
-                data.plot(ax=ax_exp)
-            grouped_exp = [
-                [[tuple(coords) for coords in seg] for seg in c.get_segments()]
-                for c in ax_exp.collections
-                if type(c) == matplotlib.collections.LineCollection
-            ]
-            grouped_exp = sorted([sorted(lines) for lines in grouped_exp])
-            plt.close(fig)
-            np.testing.assert_equal(groups, grouped_exp, m)
+            lines, collections = self._get_line_geometry()
+            groups = lines.group_keys(
+                self._get_line_attribute_labels(collections)
+            )
+            lines_exp = self._get_expected_geometry(lines_expected)
+            labels, _ = pd.factorize(lines_expected[sort_column])
+            labels = labels[lines_exp.part_rows]
+            # Lines without a type are not part of any group
+            keep = np.flatnonzero(labels >= 0)
+            grouped_exp = lines_exp.take(keep).group_keys(labels[keep])
+            assert groups == grouped_exp, m
         elif lines_expected is None:
             pass
         else:
@@ -464,6 +1193,19 @@ class VectorTester(PlotTester):
 
     """ Check Polygons """
 
+    def _get_polygon_geometry(self):
+        """Returns the polygons on Axes ax as one ragged geometry with one
+        part per path, in plotting order. Paths are split into exterior and
+        interior rings by their path codes."""
+        return _RaggedGeometry.from_paths(
+            [
+                path
+                for c in self.get_artist_index()["collections"]
+                if type(c) == matplotlib.collections.PatchCollection
+                for path in c.get_paths()
+            ]
+        )
+
     def get_polygons(self):
         """Returns all polygons on Axes ax as a sorted list of polygons where
         each polygon is a list of coord tuples
@@ -473,37 +1215,7 @@ class VectorTester(PlotTester):
         output: sorted list of polygons. Each polygon is a list tuples. Each
         tuple is a coordinate.
         """
-        output = [
-            [tuple(coords) for coords in path.vertices]
-            for c in self.ax.collections
-            if type(c) == matplotlib.collections.PatchCollection
-            for path in c.get_paths()
-        ]
-        return sorted(output)
-
-    def _convert_multipolygons(self, series):
-        """Helper function for assert_polygons
-        converts a pandas series of Polygon and MultiPolygon objects to a list
-        of lines,
-        where each line is a list of coord tuples for the exterior
-
-        Parameters
-        ----------
-        series: series where each entry is a Polygon or MultiPolygon
-
-        Returns
-        -------
-        list of lines where each line is a list of coord tuples for the
-        exterior polygon
-        """
-        output = []
-        for entry in series:
-            if type(entry) == shapely.geometry.multipolygon.MultiPolygon:
-                for poly in entry:
-                    output += [list(poly.exterior.coords)]
-            if type(entry) == shapely.geometry.polygon.Polygon:
-                output += [list(entry.exterior.coords)]
-        return output
+        return sorted(self._get_polygon_geometry().to_tuples())
 
     def assert_polygons(
         self, polygons_expected, dec=None, m="Incorrect Polygon Data"
@@ -522,6 +1234,12 @@ class VectorTester(PlotTester):
             be exact.
         m : string (default = "Incorrect Polygon Data")
             String error message if assertion is not met.
+
+        Notes
+        -----
+        Interior rings (holes) of the polygons are compared along with
+        their exterior rings. The start vertex and direction of each ring
+        do not matter, nor does the order of the holes of a polygon.
         """
         if len(polygons_expected) != 0:
             if isinstance(polygons_expected, list):
@@ -531,22 +1249,42 @@ class VectorTester(PlotTester):
                         "polygons."
                     )
             if isinstance(polygons_expected, gpd.geodataframe.GeoDataFrame):
-                polygons_expected = self._convert_multipolygons(
-                    polygons_expected["geometry"]
+                polygons_expected = self._get_expected_geometry(
+                    polygons_expected
+                )
+            else:
+                polygons_expected = _RaggedGeometry.from_parts(
+                    [[poly] for poly in polygons_expected]
                 )
-            polygons = self.get_polygons()
+            polygons_expected = polygons_expected.normalized(dec)
+            polygons = self._get_polygon_geometry().normalized(dec)
+            _check_stages(
+                polygons.coords,
+                polygons_expected.coords,
+                len(polygons),
+                len(polygons_expected),
+                m,
+                atol=1.5 * 10.0**-dec if dec else None,
+            )
             if dec:
-                assert len(polygons_expected) == len(polygons), m
-                polygons_expected = sorted(polygons_expected)
-                for i in range(len(polygons)):
-                    np.testing.assert_almost_equal(
-                        polygons[i],
-                        polygons_expected[i],
-                        decimal=dec,
-                        err_msg=m,
+                polygons = polygons.take(polygons.sort_order(dec))
+                polygons_expected = polygons_expected.take(
+                    polygons_expected.sort_order(dec)
+                )
+                for offsets in ["part_offsets", "ring_offsets"]:
+                    np.testing.assert_equal(
+                        getattr(polygons, offsets),
+                        getattr(polygons_expected, offsets),
+                        m,
                     )
+                np.testing.assert_almost_equal(
+                    polygons.coords,
+                    polygons_expected.coords,
+                    decimal=dec,
+                    err_msg=m,
+                )
             else:
-                np.testing.assert_equal(polygons, sorted(polygons_expected), m)
+                assert polygons.equals(polygons_expected), m
         else:
             raise ValueError(
                 "Empty list or GeoDataFrame passed into assert_polygons."